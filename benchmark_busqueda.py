@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark del índice de búsqueda de texto completo (IndiceBusqueda).
+
+Indexa ideas sintéticas con guiones completos y mide el tiempo de consultas
+con y sin filtros de nicho y red social. El vocabulario sintético es muy
+pequeño, así que las consultas de palabras comunes coinciden con casi todas
+las ideas: es el peor caso para ordenar por relevancia.
+
+Uso:
+    python benchmark_busqueda.py [--ideas 100000] [--repeticiones 20]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_exportador import generar_ideas_exportables
+from core.exportador.indice_busqueda import IndiceBusqueda
+from core.exportador.tabla_ideas import TablaIdeas
+
+CONSULTAS = [
+    ("selectiva (número de título)", "4242", {}),
+    ("prefijo + nicho", "estrateg", {"nicho": "Finanzas"}),
+    ("2 palabras + red", "dinero secreto", {"red_social": "TikTok"}),
+    ("2 palabras + nicho + red", "dinero secreto", {"nicho": "Finanzas", "red_social": "TikTok"}),
+    ("palabra común, sin filtros", "dinero", {})
+]
+
+
+def main():
+    """Función principal del benchmark de búsqueda"""
+    parser = argparse.ArgumentParser(description="Benchmark del índice de búsqueda")
+    parser.add_argument("--ideas", type=int, default=100000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"🧪 Generando {args.ideas} ideas sintéticas...")
+    tabla = TablaIdeas(generar_ideas_exportables(args.ideas))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        indice = IndiceBusqueda(Path(directorio))
+
+        inicio = time.perf_counter()
+        with indice._conexion:
+            indice.indexar_tabla(tabla, "sinteticas.jsonl", "2025-01-01T00:00:00")
+        segundos_indexado = time.perf_counter() - inicio
+
+        resultados = []
+        for nombre, consulta, filtros in CONSULTAS:
+            tiempos = []
+            for _ in range(args.repeticiones):
+                inicio = time.perf_counter()
+                encontrados = indice.buscar(consulta, limite=20, **filtros)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            resultados.append((nombre, len(encontrados), statistics.median(tiempos), max(tiempos)))
+
+        estadisticas = indice.estadisticas()
+        indice.cerrar()
+
+    print(f"\n📊 RESULTADOS ({estadisticas['ideas']} ideas indexadas en {segundos_indexado:.1f}s, "
+          f"{estadisticas['ideas'] / segundos_indexado:,.0f} ideas/s)")
+    for nombre, encontrados, mediana, maximo in resultados:
+        print(f"   {nombre:30} | {encontrados:>3} resultados | mediana {mediana:7.1f} ms | máx {maximo:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
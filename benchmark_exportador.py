@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de la exportación a Excel de ExportadorIdeas.
+
+Compara el cálculo de anchos por columna sobre los DataFrames con el recorrido
+anterior de todas las celdas de openpyxl (comprobando que los anchos son
+idénticos), el aplanado de las ideas para las hojas y los exportadores
+(diccionarios por fila frente a la tabla columnar TablaIdeas, en filas/s), y
+el tiempo y el pico de memoria de los dos motores de escritura: openpyxl con
+DataFrames completos y xlsxwriter en streaming (constant_memory).
+
+Uso:
+    python benchmark_exportador.py [--filas 1000 10000]
+"""
+
+import argparse
+import gc
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from benchmark_formatos import generar_ideas_sinteticas, PALABRAS
+from core.exportador.exportador import ExportadorIdeas
+from core.exportador.formatos_tabulares import aplanar_idea, aplanar_columnas
+from core.exportador.tabla_ideas import TablaIdeas
+from core.formatos.generador_formatos import GeneradorFormatos
+
+REDES = ["TikTok", "YouTube", "Instagram", "YouTube Shorts"]
+DURACIONES = ["15s", "30s", "60s", "3min", "5-8min"]
+
+
+def generar_ideas_exportables(cantidad, semilla=42):
+    """Ideas sintéticas con los campos que lee el exportador y sus formatos"""
+    aleatorio = random.Random(semilla)
+    formateador = GeneradorFormatos()
+    ideas = generar_ideas_sinteticas(cantidad, semilla)
+    for idea in ideas:
+        idea["red_social"] = aleatorio.choice(REDES)
+        idea["duracion"] = aleatorio.choice(DURACIONES)
+        idea["hashtags"] = [f"#{aleatorio.choice(PALABRAS)}" for _ in range(aleatorio.randint(3, 8))]
+        idea["elementos_visuales"] = [" ".join(aleatorio.sample(PALABRAS, 3)) for _ in range(3)]
+        idea["metadata"] = {
+            "palabras_clave": aleatorio.sample(PALABRAS, 5),
+            "subtemas": [" ".join(aleatorio.sample(PALABRAS, 2)) for _ in range(3)]
+        }
+        idea["formatos_ia"] = formateador.generar_formatos_ia_especificos(idea, formatos=("elevenlabs",))
+    return ideas
+
+
+def anchos_recorriendo_celdas(worksheet):
+    """Implementación anterior: recorrer cada celda de openpyxl y medir str(valor)"""
+    anchos = []
+    for column in worksheet.columns:
+        max_length = 0
+        for cell in column:
+            try:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except:
+                pass
+
+        if "GUIÓN" in str(column[0].value):
+            anchos.append(min(max_length + 10, 150))
+        else:
+            anchos.append(min(max_length + 5, 50))
+    return anchos
+
+
+def aplanar_con_diccionarios(ideas):
+    """Implementación anterior: una lista de diccionarios por hoja con cadenas de .get()
+    (y los joins repetidos), convertida a DataFrame, más un registro por idea para
+    los exportadores"""
+    principales, guiones, hashtags = [], [], []
+    for i, idea in enumerate(ideas, 1):
+        principales.append({
+            "ID": i,
+            "TÍTULO": idea.get("titulo", ""),
+            "RED SOCIAL": idea.get("red_social", ""),
+            "TEMA": idea.get("tema", ""),
+            "NICHO": idea.get("nicho", ""),
+            "DURACIÓN": idea.get("duracion", ""),
+            "HOOK INICIAL": idea.get("hook_inicial", ""),
+            "PALABRAS CLAVE": " | ".join(idea.get("metadata", {}).get("palabras_clave", [])),
+            "ESCENAS RECOMENDADAS": " | ".join(idea.get("elementos_visuales", [])),
+            "DESCRIPCIÓN": idea.get("descripcion", "")
+        })
+        elevenlabs_config = idea.get("formatos_ia", {}).get("elevenlabs", {})
+        guiones.append({
+            "ID": i,
+            "TÍTULO": idea.get("titulo", ""),
+            "GUIÓN COMPLETO": elevenlabs_config.get("texto_completo", ""),
+            "VERSIÓN CORTA (15s)": elevenlabs_config.get("versiones_cortas", {}).get("15s", ""),
+            "VERSIÓN CORTA (30s)": elevenlabs_config.get("versiones_cortas", {}).get("30s", ""),
+            "ESTILO VOZ": elevenlabs_config.get("instrucciones_voz", {}).get("tono", ""),
+            "EMOCIÓN": elevenlabs_config.get("instrucciones_voz", {}).get("emoción", ""),
+            "NOTAS ADICIONALES": elevenlabs_config.get("instrucciones_voz", {}).get("notas", "")
+        })
+        hashtags.append({
+            "ID": i,
+            "TÍTULO": idea.get("titulo", ""),
+            "HASHTAGS": " ".join(idea.get("hashtags", [])),
+            "PALABRAS CLAVE": " | ".join(idea.get("metadata", {}).get("palabras_clave", [])),
+            "TEMA PRINCIPAL": idea.get("tema", ""),
+            "SUBTEMAS": " | ".join(idea.get("metadata", {}).get("subtemas", []))
+        })
+    hojas = [pd.DataFrame(filas) for filas in (principales, guiones, hashtags)]
+    
+    registros = [aplanar_idea(idea, i) for i, idea in enumerate(ideas, 1)]
+    filas_csv = [aplanar_columnas(registro) for registro in registros]
+    return hojas, registros, filas_csv
+
+
+def aplanar_en_columnas(ideas):
+    """Implementación actual: un recorrido por idea a la tabla columnar compartida"""
+    tabla = TablaIdeas(ideas)
+    hojas = tabla.hojas()
+    # ExportadorJSONL consume los registros de uno en uno, sin guardarlos
+    for registro in tabla.registros():
+        pass
+    return hojas, tabla.columnas_planas()
+
+
+def medir_aplanado(ideas, repeticiones=3):
+    """Devuelve las filas/s de ambas implementaciones del aplanado (mejor de varias pasadas)"""
+    resultados = []
+    for aplanar in (aplanar_con_diccionarios, aplanar_en_columnas):
+        mejor = float("inf")
+        for _ in range(repeticiones):
+            gc.collect()
+            inicio = time.perf_counter()
+            aplanar(ideas)
+            mejor = min(mejor, time.perf_counter() - inicio)
+        resultados.append(len(ideas) / mejor)
+    return resultados
+
+
+def medir_anchos(ideas, directorio):
+    """Mide el cálculo de anchos con ambas implementaciones"""
+    filas = len(ideas)
+    exportador = ExportadorIdeas(directorio)
+    hojas = exportador.preparar_hojas(ideas)
+
+    tiempo_celdas = 0.0
+    tiempo_vectorizado = 0.0
+    iguales = True
+    with pd.ExcelWriter(directorio / f"anchos_{filas}.xlsx", engine="openpyxl") as writer:
+        for nombre, df in hojas.items():
+            df.to_excel(writer, sheet_name=nombre, index=False)
+
+            inicio = time.perf_counter()
+            anteriores = anchos_recorriendo_celdas(writer.sheets[nombre])
+            tiempo_celdas += time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            nuevos = exportador.calcular_anchos_columnas(df)
+            tiempo_vectorizado += time.perf_counter() - inicio
+
+            iguales = iguales and anteriores == nuevos
+
+    return tiempo_celdas, tiempo_vectorizado, iguales
+
+
+def medir_motor(ideas, directorio, motor):
+    """Devuelve (segundos, pico de memoria en MB) de una exportación completa"""
+    exportador = ExportadorIdeas(directorio)
+
+    # Tiempo sin trazar memoria (tracemalloc ralentiza mucho la escritura)
+    inicio = time.perf_counter()
+    exportador.exportar_a_excel_avanzado(ideas, f"{motor}_{len(ideas)}.xlsx", motor=motor)
+    segundos = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    exportador.exportar_a_excel_avanzado(ideas, f"{motor}_{len(ideas)}.xlsx", motor=motor)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return segundos, pico / 1024 / 1024
+
+
+def main():
+    """Función principal del benchmark del exportador"""
+    parser = argparse.ArgumentParser(description="Benchmark de anchos de columna del exportador")
+    parser.add_argument("--filas", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    anchos = []
+    aplanados = []
+    motores = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for filas in args.filas:
+            ideas = generar_ideas_exportables(filas)
+            anchos.append((filas, *medir_anchos(ideas, Path(directorio))))
+            aplanados.append((filas, *medir_aplanado(ideas)))
+            motores.append((filas, *medir_motor(ideas, Path(directorio), "openpyxl"),
+                            *medir_motor(ideas, Path(directorio), "xlsxwriter")))
+
+    print("\n📊 RESULTADOS (cálculo de anchos de las 3 hojas)")
+    for filas, celdas, vectorizado, iguales in anchos:
+        print(f"   {filas:>6} filas | recorriendo celdas: {celdas:7.3f}s | sobre DataFrame: {vectorizado:7.3f}s "
+              f"| {celdas / vectorizado:5.1f}x | anchos idénticos: {'sí' if iguales else 'NO'}")
+
+    print("\n📊 RESULTADOS (aplanado para las 3 hojas, JSONL/Parquet y CSV)")
+    for filas, diccionarios, columnas in aplanados:
+        print(f"   {filas:>6} filas | diccionarios por fila: {diccionarios:9,.0f} filas/s "
+              f"| tabla columnar: {columnas:9,.0f} filas/s | {columnas / diccionarios:4.1f}x")
+    
+    print("\n📊 RESULTADOS (exportación completa por motor)")
+    for filas, t_openpyxl, m_openpyxl, t_streaming, m_streaming in motores:
+        print(f"   {filas:>6} filas | openpyxl: {t_openpyxl:6.2f}s, pico {m_openpyxl:7.1f} MB "
+              f"| xlsxwriter streaming: {t_streaming:6.2f}s, pico {m_streaming:7.1f} MB "
+              f"| {t_openpyxl / t_streaming:4.1f}x tiempo, {m_openpyxl / m_streaming:5.1f}x memoria")
+
+
+if __name__ == "__main__":
+    main()
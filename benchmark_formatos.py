@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmark de los guiones de GeneradorFormatos.
+
+Mide tiempo y memoria por idea de generar_guiones y comprueba que cada guión
+contiene, en orden, las marcas de sus secciones (plantillas_guion), de las que
+dependen dividir_guion_secciones y calidad_guiones.
+
+Mide también, sobre los mismos puntos clave, las heurísticas de palabras clave
+(_generar_razon_impacto, _generar_beneficio...) con el índice de palabras
+frente a la implementación anterior con una lista por heurística. No hay
+caché por punto, así que cada pasada es una ejecución en frío (puntos nuevos).
+
+Uso:
+    python benchmark_formatos.py [--ideas 2000] [--repeticiones 5]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from core.formatos.generador_formatos import GeneradorFormatos
+from core.formatos.plantillas_guion import GUION_EDUCATIVO, GUION_NARRATIVO
+
+NICHOS = ["Tecnología", "Crecimiento Personal", "Marketing", "Finanzas", "Inteligencia Artificial", "Historias Reddit"]
+PALABRAS = [
+    "evitar", "error", "secreto", "estrategia", "rápido", "único", "tiempo", "dinero", "calidad",
+    "aprender", "éxito", "problema", "nunca", "siempre", "optimizar", "comenzar", "fácil", "beneficio"
+]
+
+# Palabras corrientes (no clave) para puntos parecidos a los que escribe la IA
+RELLENO = [
+    "cómo", "organizar", "tus", "gastos", "con", "una", "hoja", "de", "cálculo", "para", "el", "mes",
+    "herramientas", "gratuitas", "que", "usan", "los", "expertos", "en", "su", "día", "a", "la", "rutina"
+]
+
+
+def generar_ideas_sinteticas(cantidad, semilla=42):
+    """Genera ideas con la misma forma que las de GeneradorIdeas"""
+    aleatorio = random.Random(semilla)
+    ideas = []
+    for i in range(cantidad):
+        nicho = aleatorio.choice(NICHOS)
+        puntos = [
+            " ".join(aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(3, 9)))
+            for _ in range(aleatorio.randint(0, 6))
+        ]
+        idea = {
+            "titulo": f"Idea {i}: " + " ".join(aleatorio.choice(PALABRAS) for _ in range(6)),
+            "descripcion": " ".join(aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(0, 60))),
+            "puntos_clave": puntos,
+            "tipo_contenido": "narrativo" if nicho == "Historias Reddit" else aleatorio.choice(["educativo", "narrativo"]),
+            "nicho": nicho,
+            "tema": f"tema {i}"
+        }
+        if aleatorio.random() < 0.9:
+            idea["hook_inicial"] = "¿Sabías que " + " ".join(aleatorio.choice(PALABRAS) for _ in range(8)) + "?"
+        ideas.append(idea)
+    return ideas
+
+
+def marcas_en_orden(idea, guion):
+    """Indica si el guión contiene en orden las marcas de todas sus secciones"""
+    puntos_clave = idea.get("puntos_clave", [])
+    if idea.get("tipo_contenido", "educativo") == "narrativo" or idea.get("nicho", "") == "Historias Reddit":
+        plantilla = GUION_NARRATIVO
+    else:
+        plantilla = GUION_EDUCATIVO
+    posicion = 0
+    for marca in plantilla.marcas_secciones(len(puntos_clave)):
+        posicion = guion.find(marca, posicion)
+        if posicion < 0:
+            return False
+        posicion += len(marca)
+    return True
+
+
+class HeuristicasAnteriores(GeneradorFormatos):
+    """Implementación anterior de las heurísticas: cada una divide el punto y recorre sus listas"""
+
+    def _generar_razon_impacto(self, punto):
+        if not punto or len(punto) < 3:
+            return "rompe con todas las expectativas del público"
+        if "problema" in punto.lower() or "error" in punto.lower():
+            return "la mayoría de personas comete este error sin darse cuenta y les cuesta miles de euros al año"
+        elif "secreto" in punto.lower() or "truco" in punto.lower():
+            return "las grandes empresas y expertos no quieren que esta información se difunda masivamente"
+        elif "descubrimiento" in punto.lower() or "hallazgo" in punto.lower():
+            return "contradice lo que se creía establecido hasta ahora en la industria"
+        else:
+            return "menos del 2% de las personas conoce esta información crucial"
+
+    def _generar_consecuencia(self, punto):
+        if not punto or len(punto) < 3:
+            return "cambia completamente nuestra perspectiva sobre el tema"
+        if "beneficio" in punto.lower() or "ventaja" in punto.lower():
+            return "puede multiplicar tus resultados en tiempo récord si lo aplicas correctamente"
+        elif "estrategia" in punto.lower() or "técnica" in punto.lower():
+            return "los que lo dominan tienen una ventaja competitiva inmensa sobre el resto"
+        elif "evitar" in punto.lower() or "prevenir" in punto.lower():
+            return "te ahorrará problemas graves que la mayoría enfrenta por ignorancia"
+        else:
+            return "te posiciona automáticamente en el top 5% de tu industria o nicho"
+
+    def _generar_detalle_especifico(self, punto):
+        if not punto or len(punto) < 3:
+            return "revela una faceta completamente inesperada de la situación"
+        palabras = punto.lower().split()
+        if any(palabra in ["nunca", "jamás", "imposible"] for palabra in palabras):
+            return "desafía todas las expectativas previas que teníamos sobre el tema"
+        elif any(palabra in ["siempre", "todos", "cada"] for palabra in palabras):
+            return "establece un patrón que se repite constantemente y que ahora podemos reconocer"
+        else:
+            return "introduce un elemento que reconfigura completamente nuestra comprensión"
+
+    def _generar_leccion(self, descripcion, puntos_clave):
+        if not puntos_clave:
+            return "debemos estar atentos a los detalles inesperados que pueden cambiar todo"
+        palabras_clave = []
+        for punto in puntos_clave:
+            palabras_clave.extend(punto.lower().split())
+        if any(palabra in palabras_clave for palabra in ["aprender", "estudiar", "conocer", "saber"]):
+            return "el conocimiento y la preparación siempre nos dan ventaja ante situaciones imprevistas"
+        elif any(palabra in palabras_clave for palabra in ["éxito", "logro", "conseguir", "alcanzar"]):
+            return "la perseverancia y actitud correcta son fundamentales para alcanzar resultados extraordinarios"
+        elif any(palabra in palabras_clave for palabra in ["problema", "error", "fracaso", "dificultad"]):
+            return "los obstáculos son oportunidades disfrazadas que nos permiten crecer y evolucionar"
+        else:
+            return "las decisiones pequeñas pueden tener un impacto enorme en nuestros resultados finales"
+
+    def _generar_explicacion_practica(self, punto):
+        if not punto or len(punto) < 3:
+            return "establece la base fundamental para todo lo que viene después"
+        palabras = punto.lower().split()
+        if any(palabra in ["inicio", "comenzar", "empezar", "primer"] for palabra in palabras):
+            return "te permite partir de una base sólida, evitando los errores comunes que comete el 90% de principiantes"
+        elif any(palabra in ["optimizar", "mejorar", "aumentar", "incrementar"] for palabra in palabras):
+            return "puede multiplicar tus resultados actuales entre un 30% y 70% sin necesidad de herramientas costosas"
+        elif any(palabra in ["evitar", "prevenir", "reducir", "minimizar"] for palabra in palabras):
+            return "te ahorra tiempo, dinero y frustración al identificar y corregir problemas desde el principio"
+        else:
+            return "establece un diferencial competitivo que menos del 5% de personas implementa correctamente"
+
+    def _generar_diferenciador(self, punto):
+        if not punto or len(punto) < 3:
+            return "este es el factor que realmente marca la diferencia entre resultados mediocres y extraordinarios"
+        palabras = punto.lower().split()
+        if any(palabra in ["único", "especial", "diferente", "exclusivo"] for palabra in palabras):
+            return "este enfoque personalizado genera resultados superiores al método estandarizado que todos conocen"
+        elif any(palabra in ["rápido", "veloz", "inmediato", "instantáneo"] for palabra in palabras):
+            return "puedes obtener resultados en días o semanas, no meses o años como enseñan tradicionalmente"
+        elif any(palabra in ["fácil", "simple", "sencillo", "accesible"] for palabra in palabras):
+            return "no necesitas herramientas complejas o conocimientos avanzados para implementarlo efectivamente"
+        else:
+            return "este enfoque sistemático garantiza resultados consistentes, no dependes de suerte o talento innato"
+
+    def _generar_beneficio(self, punto):
+        if not punto or len(punto) < 3:
+            return "impacta directamente en tus resultados finales y te diferencia de la competencia"
+        palabras = punto.lower().split()
+        if any(palabra in ["tiempo", "rápido", "veloz", "inmediato"] for palabra in palabras):
+            return "te permite optimizar tu tiempo, logrando más resultados con menos esfuerzo"
+        elif any(palabra in ["dinero", "costo", "inversión", "precio"] for palabra in palabras):
+            return "mejora significativamente el retorno sobre tu inversión, maximizando cada recurso"
+        elif any(palabra in ["calidad", "valor", "premium", "excelencia"] for palabra in palabras):
+            return "eleva el nivel de calidad de tu trabajo a estándares profesionales de primer nivel"
+        else:
+            return "te proporciona una ventaja competitiva sostenible a largo plazo"
+
+
+def con_texto_corriente(ideas, semilla=7, proporcion_clave=0.1):
+    """Copia de las ideas con puntos de texto corriente (cerca de un 10% de palabras clave)"""
+    aleatorio = random.Random(semilla)
+    copias = []
+    for idea in ideas:
+        puntos = [
+            " ".join(aleatorio.choice(PALABRAS if aleatorio.random() < proporcion_clave else RELLENO)
+                     for _ in range(aleatorio.randint(6, 14)))
+            for _ in idea["puntos_clave"]
+        ]
+        copias.append({**idea, "puntos_clave": puntos})
+    return copias
+
+
+def heuristicas_idea(formateador, idea):
+    """Aplica todas las heurísticas de palabras clave a los puntos de una idea"""
+    puntos_clave = idea.get("puntos_clave", [])
+    resultados = [formateador._generar_leccion(idea.get("descripcion", ""), puntos_clave)]
+    for punto in puntos_clave:
+        resultados += (
+            formateador._generar_razon_impacto(punto),
+            formateador._generar_consecuencia(punto),
+            formateador._generar_detalle_especifico(punto),
+            formateador._generar_explicacion_practica(punto),
+            formateador._generar_diferenciador(punto),
+            formateador._generar_beneficio(punto)
+        )
+    return resultados
+
+
+def medir(funcion, formateador, ideas, repeticiones):
+    """Devuelve (microsegundos por idea, pico de memoria por idea en bytes)"""
+    return medir_tiempos([funcion], formateador, ideas, repeticiones)[0], medir_memoria(funcion, formateador, ideas)
+
+
+def medir_tiempos(funciones, formateador, ideas, repeticiones):
+    """Mejor tiempo por idea (µs) de cada función, alternándolas en cada repetición
+
+    Alternar evita que los cambios de frecuencia de la CPU durante la medición
+    favorezcan a la que se mide primero.
+    """
+    mejores = [float("inf")] * len(funciones)
+    for _ in range(repeticiones):
+        for indice, funcion in enumerate(funciones):
+            inicio = time.perf_counter()
+            for idea in ideas:
+                funcion(formateador, idea)
+            mejores[indice] = min(mejores[indice], time.perf_counter() - inicio)
+    return [mejor / len(ideas) * 1e6 for mejor in mejores]
+
+
+def medir_memoria(funcion, formateador, ideas):
+    """Pico de memoria por idea (bytes) al ejecutar la función con cada idea por separado"""
+    picos = 0
+    for idea in ideas:
+        tracemalloc.start()
+        funcion(formateador, idea)
+        picos += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return picos / len(ideas)
+
+
+def main():
+    """Función principal del microbenchmark"""
+    parser = argparse.ArgumentParser(description="Microbenchmark de guiones de GeneradorFormatos")
+    parser.add_argument("--ideas", type=int, default=2000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    formateador = GeneradorFormatos()
+    ideas = generar_ideas_sinteticas(args.ideas)
+
+    # Comprobar que cada guión contiene las marcas de sus secciones
+    sin_marcas = sum(not marcas_en_orden(idea, formateador.generar_guiones(idea)[0]) for idea in ideas)
+    print(f"🔍 Secciones en orden: {'sí' if not sin_marcas else f'NO ({sin_marcas} ideas sin marcas)'}")
+
+    tiempo, memoria = medir(GeneradorFormatos.generar_guiones, formateador, ideas, args.repeticiones)
+
+    print(f"\n📊 RESULTADOS ({args.ideas} ideas, mejor de {args.repeticiones})")
+    print(f"   generar_guiones       : {tiempo:7.2f} µs/idea | pico {memoria:8.0f} B/idea")
+
+    # Heurísticas de palabras clave (en frío: no hay caché por punto)
+    anteriores = HeuristicasAnteriores()
+    for descripcion, conjunto in (("puntos solo con palabras clave", ideas),
+                                  ("puntos de texto corriente", con_texto_corriente(ideas))):
+        diferentes = sum(heuristicas_idea(formateador, idea) != heuristicas_idea(anteriores, idea) for idea in conjunto)
+        tiempo_listas, _ = medir(heuristicas_idea, anteriores, conjunto, args.repeticiones)
+        tiempo_indice, _ = medir(heuristicas_idea, formateador, conjunto, args.repeticiones)
+
+        print(f"\n📊 HEURÍSTICAS EN FRÍO, {descripcion} "
+              f"({sum(len(idea['puntos_clave']) for idea in conjunto)} puntos sin caché)")
+        print(f"   🔍 Salida idéntica: {'sí' if not diferentes else f'NO ({diferentes} ideas difieren)'}")
+        print(f"   listas por heurística : {tiempo_listas:7.2f} µs/idea")
+        print(f"   índice de palabras    : {tiempo_indice:7.2f} µs/idea")
+        print(f"   Mejora: {tiempo_listas / tiempo_indice:.2f}x tiempo")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de memoria de la representación de las ideas.
+
+Construye ideas sintéticas con la forma de las de GeneradorIdeas (metadata del
+nicho y formato de ElevenLabs ya calculado, como al exportar) y compara la
+memoria (tracemalloc) de las ideas compactas (Idea, metadata compartida por
+nicho y bloques de voz internados) con la de los diccionarios anidados de
+antes. Comprueba además que el exportador obtiene los mismos valores de las
+dos y mide el tiempo de aplanarlas.
+
+Uso:
+    python benchmark_ideas.py [--ideas 20000]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from collections.abc import Mapping
+from datetime import datetime
+
+from benchmark_formatos import generar_ideas_sinteticas
+from core.config.configuracion_contenido import ConfiguracionContenido
+from core.exportador.formatos_tabulares import valores_idea
+from core.formatos.generador_formatos import GeneradorFormatos
+from core.generador.idea import Idea, MetadataIdea, metadata_nicho
+
+REDES = ["TikTok", "YouTube", "Instagram", "YouTube Shorts"]
+
+
+def generar_ideas_compactas(cantidad, semilla=42):
+    """Ideas compactas como las que devuelve GeneradorIdeas, con el formato de ElevenLabs calculado"""
+    aleatorio = random.Random(semilla)
+    nichos = ConfiguracionContenido().nichos
+    formateador = GeneradorFormatos()
+    ideas = []
+    for datos in generar_ideas_sinteticas(cantidad, semilla):
+        nicho = datos["nicho"]
+        idea = Idea(datos)
+        idea["red_social"] = aleatorio.choice(REDES)
+        idea["hashtags"] = [f"#{palabra}" for palabra in datos["titulo"].split()[2:6]]
+        idea["metadata"] = MetadataIdea(
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            metadata_nicho(nicho, nichos[nicho] if nicho in nichos else None)
+        )
+        idea["score_calidad"] = aleatorio.randint(50, 100)
+        idea["formatos_ia"] = formateador.generar_formatos_ia_especificos(idea, formatos=("elevenlabs",))
+        ideas.append(idea)
+    return ideas
+
+
+def copia_anidada(valor):
+    """Copia con diccionarios y listas normales (sin Idea ni bloques compartidos)"""
+    if isinstance(valor, Mapping):
+        return {clave: copia_anidada(elemento) for clave, elemento in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [copia_anidada(elemento) for elemento in valor]
+    return valor
+
+
+def a_diccionarios_anidados(ideas):
+    """Representación anterior: un diccionario anidado por idea, sin bloques compartidos"""
+    anidadas = []
+    for idea in ideas:
+        anidada = copia_anidada({campo: valor for campo, valor in idea.items() if campo != "formatos_ia"})
+        anidada["formatos_ia"] = {"elevenlabs": copia_anidada(idea["formatos_ia"]["elevenlabs"])}
+        anidadas.append(anidada)
+    return anidadas
+
+
+def medir_memoria(construir):
+    """Memoria (bytes) que sigue ocupando el resultado de construir() y el propio resultado"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = construir()
+        gc.collect()
+        memoria = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return memoria, resultado
+
+
+def main():
+    """Función principal del benchmark de ideas"""
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de las ideas")
+    parser.add_argument("--ideas", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"🧪 Construyendo {args.ideas} ideas sintéticas...")
+    memoria_compactas, compactas = medir_memoria(lambda: generar_ideas_compactas(args.ideas))
+    # Las anidadas se construyen igual y se convierten, para medir solo lo que queda de ellas
+    memoria_anidadas, anidadas = medir_memoria(lambda: a_diccionarios_anidados(generar_ideas_compactas(args.ideas)))
+
+    # Mejor de 3 pasadas sin el recolector de basura, que recorre todas las ideas vivas
+    tiempos = {}
+    valores = {}
+    gc.disable()
+    try:
+        for nombre, ideas in (("anidadas", anidadas), ("compactas", compactas)) * 3:
+            inicio = time.perf_counter()
+            valores[nombre] = [valores_idea(idea, i) for i, idea in enumerate(ideas, 1)]
+            tiempos[nombre] = min(tiempos.get(nombre, float("inf")), time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+
+    # Las fechas pueden diferir en un segundo entre las dos construcciones
+    columna_fecha = 1 + 9 + 1 + 3
+    sin_fecha = {
+        nombre: [fila[:columna_fecha] + fila[columna_fecha + 1:] for fila in filas] for nombre, filas in valores.items()
+    }
+    iguales = sin_fecha["anidadas"] == sin_fecha["compactas"]
+
+    print(f"\n📊 RESULTADOS ({args.ideas} ideas con guión de ElevenLabs)")
+    for nombre, memoria in (("Diccionarios anidados", memoria_anidadas), ("Ideas compactas", memoria_compactas)):
+        print(f"   {nombre:22} {memoria / 1024 ** 2:8.1f} MB | {memoria / args.ideas:7.0f} bytes/idea")
+    print(f"   💾 Ahorro: {1 - memoria_compactas / memoria_anidadas:.1%} "
+          f"({(memoria_anidadas - memoria_compactas) / args.ideas:.0f} bytes por idea; el resto son los textos)")
+    print(f"   ⏱️ Aplanado para exportar: anidadas {tiempos['anidadas']:.2f}s | compactas {tiempos['compactas']:.2f}s")
+    print(f"   {'✅' if iguales else '❌'} El exportador obtiene los mismos valores de las dos representaciones")
+
+
+if __name__ == "__main__":
+    main()
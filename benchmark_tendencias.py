@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Script para grabar los feeds de tendencias y medir la recopilación sin conexión.
+
+Uso:
+    python benchmark_tendencias.py grabar fixtures/tendencias
+    python benchmark_tendencias.py reproducir fixtures/tendencias [--latencia 0.5] [--repeticiones 5]
+"""
+
+import argparse
+import time
+
+from core.tendencias.recopilador_tendencias import RecopiladorTendencias
+from core.tendencias.transporte import TransporteGrabador, TransporteReproduccion
+
+
+def ejecutar_recopilacion(transporte):
+    """Ejecuta una recopilación completa y devuelve (segundos, tendencias)"""
+    recopilador = RecopiladorTendencias(transporte=transporte)
+    inicio = time.perf_counter()
+    tendencias = recopilador.obtener_todas_las_tendencias()
+    return time.perf_counter() - inicio, tendencias
+
+
+def main():
+    """Función principal del benchmark de tendencias"""
+    parser = argparse.ArgumentParser(description="Grabar y reproducir feeds de tendencias")
+    parser.add_argument("modo", choices=["grabar", "reproducir"])
+    parser.add_argument("directorio", help="Carpeta de fixtures")
+    parser.add_argument("--latencia", type=float, default=None,
+                        help="Latencia sintética en segundos (por defecto la grabada)")
+    parser.add_argument("--escala-latencia", type=float, default=1.0,
+                        help="Factor aplicado a la latencia (0 la desactiva)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.modo == "grabar":
+        segundos, tendencias = ejecutar_recopilacion(TransporteGrabador(args.directorio))
+        print(f"\n📼 Grabadas las respuestas en {args.directorio}")
+        print(f"   ⏱️ {segundos:.2f}s, {len(tendencias)} tendencias")
+        return
+
+    tiempos = []
+    for _ in range(args.repeticiones):
+        transporte = TransporteReproduccion(
+            args.directorio, latencia=args.latencia, escala_latencia=args.escala_latencia
+        )
+        segundos, tendencias = ejecutar_recopilacion(transporte)
+        tiempos.append(segundos)
+
+    print(f"\n📊 RESULTADOS ({args.repeticiones} repeticiones)")
+    print(f"   ⏱️ Mínimo: {min(tiempos):.3f}s | Medio: {sum(tiempos) / len(tiempos):.3f}s | Máximo: {max(tiempos):.3f}s")
+    print(f"   📈 {len(tendencias)} tendencias")
+
+
+if __name__ == "__main__":
+    main()
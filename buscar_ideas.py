@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Búsqueda de texto completo en todas las ideas y guiones exportados.
+
+Antes de cada búsqueda se indexan los archivos del catálogo de exportaciones
+nuevos o modificados (el resto ya está en el índice).
+
+Uso:
+    python buscar_ideas.py "presupuesto mensual" --red TikTok --nicho Finanzas
+    python buscar_ideas.py "ahorro" --desde 2025-01-01 --limite 50
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from core.exportador.indice_busqueda import IndiceBusqueda
+
+
+def main():
+    """Función principal de la búsqueda"""
+    parser = argparse.ArgumentParser(description="Buscar en las ideas y guiones exportados")
+    parser.add_argument("consulta", help="Palabras a buscar (todas deben aparecer; se admiten prefijos)")
+    parser.add_argument("--nicho", help="Filtrar por nicho")
+    parser.add_argument("--red", help="Filtrar por red social")
+    parser.add_argument("--desde", help="Fecha mínima de exportación (AAAA-MM-DD)")
+    parser.add_argument("--hasta", help="Fecha máxima de exportación (AAAA-MM-DD)")
+    parser.add_argument("--limite", type=int, default=20, help="Número máximo de resultados")
+    parser.add_argument("--fts", action="store_true", help="Usar la consulta tal cual con la sintaxis de FTS5")
+    parser.add_argument("--carpeta", default="ideas_generadas", help="Carpeta de salida de las exportaciones")
+    args = parser.parse_args()
+
+    indice = IndiceBusqueda(Path(args.carpeta))
+    try:
+        inicio = time.perf_counter()
+        leidos = indice.actualizar()
+        if leidos:
+            print(f"🗂️ {leidos} archivos nuevos indexados en {time.perf_counter() - inicio:.2f}s")
+
+        inicio = time.perf_counter()
+        resultados = indice.buscar(
+            args.consulta, nicho=args.nicho, red_social=args.red, desde=args.desde, hasta=args.hasta,
+            limite=args.limite, sintaxis_fts=args.fts
+        )
+        milisegundos = (time.perf_counter() - inicio) * 1000
+
+        estadisticas = indice.estadisticas()
+        print(f"\n🔎 {len(resultados)} resultados en {milisegundos:.1f} ms "
+              f"({estadisticas['ideas']} ideas de {estadisticas['archivos']} archivos)\n")
+        for posicion, resultado in enumerate(resultados, 1):
+            print(f"{posicion:>3}. {resultado['titulo']}")
+            print(f"     🎯 {resultado['nicho']} | 📱 {resultado['red_social']} | 📅 {resultado['fecha'][:10]} "
+                  f"| 📁 {resultado['archivo']} #{resultado['id']}")
+            print(f"     {resultado['fragmento']}")
+    finally:
+        indice.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,22 +6,50 @@ Gestiona la carga de API keys y configuraciones comunes.
 import os
 from pathlib import Path
 
-def cargar_api_key():
-    """Cargar API key de Gemini desde variables de entorno o archivo .env"""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key and os.path.exists(".env"):
+def _variables_env():
+    """Variables del archivo .env (vacío si no existe)"""
+    variables = {}
+    if os.path.exists(".env"):
         try:
             with open(".env") as f:
                 for line in f:
-                    if line.startswith("GEMINI_API_KEY"):
-                        api_key = line.strip().split("=", 1)[1].strip().strip('"\'')
+                    if "=" in line and not line.lstrip().startswith("#"):
+                        nombre, valor = line.strip().split("=", 1)
+                        variables[nombre.strip()] = valor.strip().strip('"\'')
         except:
             pass
+    return variables
+
+def cargar_api_keys():
+    """Cargar el pool de API keys de Gemini desde variables de entorno o archivo .env
+    
+    Se admiten GEMINI_API_KEYS (claves separadas por comas), GEMINI_API_KEY y
+    GEMINI_API_KEY_2, GEMINI_API_KEY_3... Las variables de entorno tienen
+    prioridad sobre el archivo .env.
+    """
+    variables = {**_variables_env(), **os.environ}
+    claves = [clave.strip() for clave in variables.get("GEMINI_API_KEYS", "").split(",")]
+    claves.append(variables.get("GEMINI_API_KEY", ""))
+    numeradas = [nombre for nombre in variables if nombre.startswith("GEMINI_API_KEY_") and nombre[15:].isdigit()]
+    claves.extend(variables[nombre] for nombre in sorted(numeradas, key=lambda nombre: int(nombre[15:])))
     
-    if not api_key:
+    claves = list(dict.fromkeys(clave for clave in claves if clave))
+    if not claves:
         raise ValueError("❌ No se encontró GEMINI_API_KEY. Ponla en .env o como variable de entorno.")
     
-    return api_key
+    return claves
+
+def cargar_api_key():
+    """Cargar API key de Gemini desde variables de entorno o archivo .env (la primera del pool)"""
+    return cargar_api_keys()[0]
+
+def cargar_cuota_api():
+    """Cuota por clave (peticiones y tokens por minuto) de GEMINI_RPM y GEMINI_TPM"""
+    variables = {**_variables_env(), **os.environ}
+    return {
+        "peticiones_por_minuto": int(variables.get("GEMINI_RPM", 15)),
+        "tokens_por_minuto": int(variables.get("GEMINI_TPM", 1000000))
+    }
 
 def obtener_ruta_salida():
     """Obtiene y crea si es necesario la carpeta de salida para las ideas generadas"""
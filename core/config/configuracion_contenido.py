@@ -1,184 +1,304 @@
 """
 Módulo que define las configuraciones de redes sociales y nichos.
+
+Las redes sociales, los nichos y los templates se leen de un archivo JSON o
+YAML externo (por defecto contenido.json, junto a este módulo), se validan y
+se compilan una sola vez a una forma inmutable: tuplas para random.choice,
+conjuntos congelados para buscar palabras clave y rangos de duración ya
+convertidos a números. La forma compilada se guarda en la carpeta de salida
+(ideas_generadas/cache_configuracion) bajo el hash del archivo, y
+ConfiguracionContenido la vuelve a cargar si el archivo cambia mientras el
+proceso sigue en marcha.
 """
 
+import hashlib
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+from core.config.config import obtener_ruta_salida
+
+# Archivo de configuración por defecto (se puede cambiar con CONFIGURACION_CONTENIDO)
+RUTA_CONFIGURACION = Path(__file__).with_name("contenido.json")
+
+# Cambiar al modificar compilar_configuracion: invalida las compilaciones guardadas en disco
+VERSION_COMPILACION = 2
+
+# Campos obligatorios de cada red social y de cada nicho, con su tipo
+CAMPOS_RED = {"duraciones": list, "formatos": list, "algoritmo": dict, "tipos_contenido": list}
+CAMPOS_NICHO = {"subtemas": list, "palabras_clave": list, "audiencia": str, "enfoque_educativo": bool, "estilo": str}
+
+
+def segundos_duracion(duracion):
+    """Convierte una duración ("15s", "3min", "1-3min") a segundos
+
+    Un rango de minutos se convierte en su punto medio.
+    """
+    if "min" in duracion:
+        if "-" in duracion:
+            # Rango como "1-3min", tomar el promedio
+            nums = duracion.replace("min", "").split("-")
+            return (int(nums[0]) + int(nums[1])) * 30  # Promedio en segundos
+        return int(duracion.replace("min", "")) * 60
+    return int(duracion.replace("s", ""))
+
+
+def rango_duracion(duracion):
+    """Rango en segundos (mínimo, máximo) de una duración ("15s" -> (15, 15), "1-3min" -> (60, 180))"""
+    unidad = 60 if "min" in duracion else 1
+    partes = duracion.replace("min", "").replace("s", "").split("-")
+    return int(partes[0]) * unidad, int(partes[-1]) * unidad
+
+
+def rango_numerico(valor):
+    """Rango (mínimo, máximo) de un valor como "3-5" o un número suelto"""
+    if isinstance(valor, int):
+        return valor, valor
+    partes = str(valor).split("-")
+    return int(partes[0]), int(partes[-1])
+
+
+def leer_archivo_configuracion(ruta):
+    """Lee un archivo de configuración JSON o YAML (.yaml/.yml, requiere PyYAML)"""
+    ruta = Path(ruta)
+    texto = ruta.read_text(encoding="utf-8")
+    if ruta.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("❌ Para leer la configuración en YAML instala PyYAML (pip install pyyaml)")
+        try:
+            return yaml.safe_load(texto)
+        except yaml.YAMLError as e:
+            raise ValueError(f"❌ YAML no válido en {ruta}: {e}")
+    return json.loads(texto)
+
+
+def validar_configuracion(datos):
+    """Comprueba la estructura de la configuración
+
+    Raises:
+        ValueError: Con la lista de todos los problemas encontrados
+    """
+    errores = []
+    if not isinstance(datos, dict):
+        raise ValueError("❌ La configuración debe ser un objeto con redes_sociales, nichos y templates")
+
+    for seccion in ("redes_sociales", "nichos", "templates"):
+        if not isinstance(datos.get(seccion), dict) or not datos.get(seccion):
+            errores.append(f"falta la sección '{seccion}' o está vacía")
+
+    for nombre, red in (datos.get("redes_sociales") or {}).items():
+        if not isinstance(red, dict):
+            errores.append(f"redes_sociales.{nombre} debe ser un objeto")
+            continue
+        for campo, tipo in CAMPOS_RED.items():
+            if not isinstance(red.get(campo), tipo):
+                errores.append(f"redes_sociales.{nombre}.{campo} debe ser {tipo.__name__}")
+        for duracion in red.get("duraciones") or []:
+            try:
+                rango_duracion(duracion)
+            except (TypeError, ValueError, AttributeError):
+                errores.append(f"redes_sociales.{nombre}: duración no válida {duracion!r}")
+        if isinstance(red.get("algoritmo"), dict) and "hashtags_optimos" in red["algoritmo"]:
+            try:
+                rango_numerico(red["algoritmo"]["hashtags_optimos"])
+            except ValueError:
+                errores.append(f"redes_sociales.{nombre}.algoritmo.hashtags_optimos debe ser un rango como \"3-5\"")
+
+    for nombre, nicho in (datos.get("nichos") or {}).items():
+        if not isinstance(nicho, dict):
+            errores.append(f"nichos.{nombre} debe ser un objeto")
+            continue
+        for campo, tipo in CAMPOS_NICHO.items():
+            if not isinstance(nicho.get(campo), tipo):
+                errores.append(f"nichos.{nombre}.{campo} debe ser {tipo.__name__}")
+        for campo in ("subtemas", "palabras_clave"):
+            if isinstance(nicho.get(campo), list) and not nicho[campo]:
+                errores.append(f"nichos.{nombre}.{campo} no puede estar vacío (se elige uno al azar)")
+
+    for nombre, templates in (datos.get("templates") or {}).items():
+        if not isinstance(templates, list) or not all(isinstance(template, str) for template in templates):
+            errores.append(f"templates.{nombre} debe ser una lista de textos")
+
+    if errores:
+        raise ValueError("❌ Configuración de contenido no válida:\n   - " + "\n   - ".join(errores))
+
+
+def _inmutable(valor):
+    """Copia con las listas convertidas en tuplas (a cualquier profundidad)"""
+    if isinstance(valor, dict):
+        return {clave: _inmutable(elemento) for clave, elemento in valor.items()}
+    if isinstance(valor, list):
+        return tuple(_inmutable(elemento) for elemento in valor)
+    return valor
+
+
+def _congelar(valor):
+    """Envuelve los diccionarios en vistas de solo lectura (MappingProxyType)"""
+    if isinstance(valor, dict):
+        return MappingProxyType({clave: _congelar(elemento) for clave, elemento in valor.items()})
+    return valor
+
+
+def compilar_configuracion(datos):
+    """Valida la configuración y la compila a su forma inmutable
+
+    Además de convertir las listas en tuplas, añade a cada red social
+    "rangos_duraciones" (segundos mínimo y máximo de cada duración) y
+    convierte algoritmo.hashtags_optimos en un rango (mínimo, máximo); a cada
+    nicho le añade "palabras_clave_conjunto" (frozenset en minúsculas).
+
+    Returns:
+        Diccionario con redes_sociales, nichos y templates (sin congelar, para
+        poder guardarlo con pickle)
+    """
+    validar_configuracion(datos)
+    compilada = _inmutable(datos)
+
+    for red in compilada["redes_sociales"].values():
+        red["rangos_duraciones"] = tuple(rango_duracion(duracion) for duracion in red["duraciones"])
+        if "hashtags_optimos" in red["algoritmo"]:
+            red["algoritmo"]["hashtags_optimos"] = rango_numerico(red["algoritmo"]["hashtags_optimos"])
+
+    for nicho in compilada["nichos"].values():
+        nicho["palabras_clave_conjunto"] = frozenset(palabra.lower() for palabra in nicho["palabras_clave"])
+
+    return {seccion: compilada[seccion] for seccion in ("redes_sociales", "nichos", "templates")}
+
+
+def cargar_configuracion(ruta=RUTA_CONFIGURACION, directorio_cache=None):
+    """Carga la configuración compilada, desde la caché en disco si el archivo no cambió
+
+    Args:
+        ruta: Archivo JSON o YAML de la configuración
+        directorio_cache: Carpeta de las compilaciones guardadas (por defecto,
+            cache_configuracion en la carpeta de salida)
+
+    Returns:
+        Tupla (configuración congelada, huella del archivo)
+    """
+    ruta = Path(ruta)
+    contenido = ruta.read_bytes()
+    huella = hashlib.sha1(f"{VERSION_COMPILACION}:".encode("utf-8") + contenido).hexdigest()[:16]
+    cache = Path(directorio_cache or obtener_ruta_salida() / "cache_configuracion") / f"{ruta.stem}.{huella}.pickle"
+
+    try:
+        compilada = pickle.loads(cache.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        compilada = compilar_configuracion(leer_archivo_configuracion(ruta))
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            temporal = cache.with_suffix(f".{os.getpid()}.tmp")
+            temporal.write_bytes(pickle.dumps(compilada, protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(temporal, cache)
+            # Las compilaciones de versiones anteriores del archivo ya no se usarán
+            for anterior in cache.parent.glob(f"{ruta.stem}.*.pickle"):
+                if anterior != cache:
+                    anterior.unlink()
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la configuración compilada: {e}")
+
+    return _congelar(compilada), huella
+
+
 class ConfiguracionContenido:
-    """Clase para gestionar las configuraciones de redes sociales y nichos."""
-    
-    def __init__(self):
-        """Constructor de la clase ConfiguracionContenido."""
-        self.redes_sociales = self.configurar_redes_sociales()
-        self.nichos = self.configurar_nichos()
-        self.templates = self.configurar_templates()
-    
+    """Clase para gestionar las configuraciones de redes sociales y nichos.
+
+    Las configuraciones son de solo lectura (vistas de diccionario y tuplas).
+    Al acceder a ellas se comprueba, como mucho cada intervalo_recarga
+    segundos, si el archivo cambió; si cambió y es válido se recarga, y si no
+    es válido se mantiene la configuración anterior.
+    """
+
+    def __init__(self, ruta=None, intervalo_recarga=2.0, directorio_cache=None):
+        """Constructor de la clase ConfiguracionContenido.
+
+        Args:
+            ruta: Archivo JSON o YAML de la configuración (por defecto, la
+                variable de entorno CONFIGURACION_CONTENIDO o contenido.json)
+            intervalo_recarga: Segundos entre comprobaciones del archivo (None
+                desactiva la recarga automática)
+            directorio_cache: Carpeta de las compilaciones guardadas (por
+                defecto, cache_configuracion en la carpeta de salida)
+        """
+        self.ruta = Path(ruta or os.getenv("CONFIGURACION_CONTENIDO") or RUTA_CONFIGURACION)
+        self.intervalo_recarga = intervalo_recarga
+        self.directorio_cache = directorio_cache
+        self._estado_archivo = self._estado()
+        self._configuracion, self.huella = cargar_configuracion(self.ruta, directorio_cache)
+        self._ultima_comprobacion = time.monotonic()
+
+    def _estado(self):
+        """Tamaño y fecha de modificación del archivo (None si no se puede leer)"""
+        try:
+            estado = self.ruta.stat()
+            return estado.st_size, estado.st_mtime_ns
+        except OSError:
+            return None
+
+    def recargar(self, forzar=False):
+        """Vuelve a cargar la configuración si el archivo cambió
+
+        Args:
+            forzar: Recargar aunque el archivo no haya cambiado
+
+        Returns:
+            True si se cargó una configuración nueva
+        """
+        self._ultima_comprobacion = time.monotonic()
+        estado = self._estado()
+        if not forzar and estado == self._estado_archivo:
+            return False
+
+        try:
+            configuracion, huella = cargar_configuracion(self.ruta, self.directorio_cache)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ No se recargó la configuración de contenido, se mantiene la anterior: {e}")
+            self._estado_archivo = estado
+            return False
+
+        self._estado_archivo = estado
+        if huella == self.huella:
+            return False
+        # Sustituir la configuración de una vez: los lectores ven la anterior o la nueva
+        self._configuracion, self.huella = configuracion, huella
+        print(f"🔄 Configuración de contenido recargada desde {self.ruta}")
+        return True
+
+    def _actual(self):
+        """Configuración vigente, comprobando antes si hay que recargarla"""
+        if self.intervalo_recarga is not None and time.monotonic() - self._ultima_comprobacion >= self.intervalo_recarga:
+            self.recargar()
+        return self._configuracion
+
+    @property
+    def redes_sociales(self):
+        """Configuración de redes sociales (solo lectura)"""
+        return self._actual()["redes_sociales"]
+
+    @property
+    def nichos(self):
+        """Configuración de nichos (solo lectura)"""
+        return self._actual()["nichos"]
+
+    @property
+    def templates(self):
+        """Templates por tipo de contenido (solo lectura)"""
+        return self._actual()["templates"]
+
     def obtener_redes_sociales(self):
         """Devuelve la configuración de redes sociales."""
         return self.redes_sociales
-        
+
     def obtener_nichos(self):
         """Devuelve la configuración de nichos."""
         return self.nichos
-        
+
     def obtener_templates(self):
         """Devuelve la configuración de templates."""
         return self.templates
-        
-    def configurar_redes_sociales(self):
-        """Configuración avanzada de redes sociales con métricas y algoritmos"""
-        return {
-            "TikTok": {
-                "duraciones": ["15s", "30s", "60s", "3min"],
-                "formatos": ["Vertical 9:16", "Cuadrado 1:1"],
-                "algoritmo": {
-                    "factores_clave": ["engagement temprano", "tiempo de visualización", "shares", "comentarios"],
-                    "picos_actividad": ["18:00-22:00", "12:00-14:00"],
-                    "hashtags_optimos": 3-5,
-                    "hook_tiempo": "3 segundos"
-                },
-                "tipos_contenido": ["Trends", "Educativo", "Entretenimiento", "Lifestyle", "Comedy", "Challenges"],
-                "audiencia_principal": "16-24 años",
-                "ctr_promedio": "6-10%"
-            },
-            "YouTube": {
-                "duraciones": ["1-3min", "5-8min", "10-15min", "20-30min"],
-                "formatos": ["Horizontal 16:9", "Vertical 9:16 (Shorts)"],
-                "algoritmo": {
-                    "factores_clave": ["tiempo de visualización", "CTR del thumbnail", "retención", "engagement"],
-                    "picos_actividad": ["14:00-16:00", "19:00-21:00"],
-                    "hashtags_optimos": 5-8,
-                    "hook_tiempo": "15 segundos"
-                },
-                "tipos_contenido": ["Tutorial", "Review", "Vlog", "Educational", "Entertainment", "Gaming"],
-                "audiencia_principal": "25-34 años",
-                "ctr_promedio": "4-6%"
-            },
-            "Instagram": {
-                "duraciones": ["15s", "30s", "60s", "90s"],
-                "formatos": ["Cuadrado 1:1", "Vertical 9:16", "Horizontal 16:9"],
-                "algoritmo": {
-                    "factores_clave": ["saves", "shares", "comentarios", "tiempo en pantalla"],
-                    "picos_actividad": ["11:00-13:00", "19:00-21:00"],
-                    "hashtags_optimos": 8-15,
-                    "hook_tiempo": "3 segundos"
-                },
-                "tipos_contenido": ["Lifestyle", "Fashion", "Food", "Travel", "Motivational", "Behind-the-scenes"],
-                "audiencia_principal": "25-34 años",
-                "ctr_promedio": "5-7%"
-            },
-            "YouTube Shorts": {
-                "duraciones": ["15s", "30s", "60s"],
-                "formatos": ["Vertical 9:16"],
-                "algoritmo": {
-                    "factores_clave": ["loops", "engagement inmediato", "shares", "suscripciones"],
-                    "picos_actividad": ["16:00-18:00", "20:00-22:00"],
-                    "hashtags_optimos": 3-5,
-                    "hook_tiempo": "2 segundos"
-                },
-                "tipos_contenido": ["Quick Tips", "Viral Trends", "Mini Tutorials", "Funny Moments"],
-                "audiencia_principal": "16-24 años",
-                "ctr_promedio": "7-12%"
-            }
-        }
-    
-    def configurar_nichos(self):
-        """Configurar nichos específicos con sus características y enfoque educativo"""
-        return {
-            "Tecnología": {
-                "subtemas": ["Inteligencia Artificial", "Programación", "Ciberseguridad", "Nuevas Tecnologías", "Apps y Software", "Hardware", "Tecnologías Emergentes"],
-                "palabras_clave": ["tutorial", "explicación", "guía paso a paso", "análisis técnico", "novedades tech", "aprende"],
-                "audiencia": "18-35 años, interesados en tecnología",
-                "engagement_promedio": "alto",
-                "enfoque_educativo": True,
-                "estilo": "técnico-didáctico"
-            },
-            "Crecimiento Personal": {
-                "subtemas": ["Productividad", "Desarrollo Personal", "Hábitos", "Mindfulness", "Gestión del Tiempo", "Inteligencia Emocional"],
-                "palabras_clave": ["desarrollo", "crecimiento", "mejora continua", "hábitos", "mindset", "productividad"],
-                "audiencia": "25-45 años, profesionales en desarrollo",
-                "engagement_promedio": "muy alto",
-                "enfoque_educativo": True,
-                "estilo": "motivacional-educativo"
-            },
-            "Marketing": {
-                "subtemas": ["Marketing Digital", "Redes Sociales", "SEO", "Branding", "Email Marketing", "Estrategias de Contenido"],
-                "palabras_clave": ["estrategia", "marketing digital", "ventas", "publicidad", "growth hacking"],
-                "audiencia": "20-40 años, emprendedores y marketers",
-                "engagement_promedio": "alto",
-                "enfoque_educativo": True,
-                "estilo": "práctico-profesional"
-            },
-            "Finanzas": {
-                "subtemas": ["Inversiones", "Ahorro", "Presupuesto Personal", "Mercados Financieros", "Criptomonedas", "Educación Financiera"],
-                "palabras_clave": ["finanzas personales", "inversión", "ahorro", "tips financieros", "economía"],
-                "audiencia": "25-50 años, interesados en finanzas",
-                "engagement_promedio": "medio-alto",
-                "enfoque_educativo": True,
-                "estilo": "informativo-educativo"
-            },
-            "Inteligencia Artificial": {
-                "subtemas": ["Machine Learning", "Deep Learning", "NLP", "IA Generativa", "Ética en IA", "Aplicaciones de IA"],
-                "palabras_clave": ["inteligencia artificial", "AI", "machine learning", "futuro", "innovación"],
-                "audiencia": "20-40 años, tech-savvy",
-                "engagement_promedio": "alto",
-                "enfoque_educativo": True,
-                "estilo": "técnico-divulgativo"
-            },
-            "Historias Reddit": {
-                "subtemas": ["Confesiones", "Experiencias", "AITA", "Relaciones", "Historias Virales", "Momentos Épicos"],
-                "palabras_clave": ["historia real", "reddit", "confesión", "experiencia", "drama"],
-                "audiencia": "16-35 años, amantes de historias",
-                "engagement_promedio": "muy alto",
-                "enfoque_educativo": False,
-                "estilo": "narrativo-informal"
-            }
-        }
-    
-    def configurar_templates(self):
-        """Templates específicos para diferentes tipos de contenido"""
-        templates = {
-            "educativo": [
-                "Aprende {tema} en {tiempo} minutos",
-                "Las bases fundamentales de {tema}",
-                "{numero} conceptos clave para entender {tema}",
-                "Guía completa: {tema} explicado paso a paso",
-                "Todo lo que debes saber sobre {tema} en {año}"
-            ],
-            "tecnologia": [
-                "Cómo {tema} está cambiando el futuro",
-                "Tutorial detallado: {tema} para principiantes",
-                "Las últimas novedades en {tema}",
-                "Análisis profundo de {tema}",
-                "Pros y contras de {tema} en {año}"
-            ],
-            "crecimiento_personal": [
-                "Transforma tu vida con {tema}",
-                "Método comprobado para {tema}",
-                "Desarrolla {tema} en {tiempo}",
-                "El secreto detrás de {tema}",
-                "Cómo mejoré mi {tema} en {tiempo}"
-            ],
-            "finanzas": [
-                "Estrategia de {tema} que debes conocer",
-                "Guía de inversión en {tema}",
-                "Errores comunes en {tema}",
-                "Cómo optimizar tu {tema}",
-                "El ABC de {tema} para principiantes"
-            ],
-            "historias_reddit": [
-                "La increíble historia de {tema} en Reddit",
-                "No creerás lo que pasó en r/{subreddit}",
-                "Historia viral: {tema}",
-                "Confesiones de Reddit: {tema}",
-                "La historia más {adjetivo} de Reddit"
-            ]
-        }
-        
-        # Mantener los templates existentes
-        templates.update({
-            "viral_hook": templates.get("viral_hook", []),
-            "educational": templates.get("educational", []),
-            "comparison": templates.get("comparison", []),
-            "trending": templates.get("trending", [])
-        })
-        
-        return templates
+
@@ -0,0 +1,315 @@
+"""
+Módulo con el control de calidad de los guiones de las exportaciones.
+
+Revisa los guiones de cualquier número de exportaciones del catálogo: número de
+palabras, duración estimada al ritmo de validar_y_mejorar_guion
+(GeneradorFormatos.PALABRAS_POR_SEGUNDO) frente a la duración más cercana de
+las de su red social, secciones del guión que faltan y guiones duplicados
+entre exportaciones. Cada archivo se lee en un proceso del pool y solo se leen las
+columnas (y, en los Excel, las hojas) que se necesitan; las métricas se
+calculan después en bloque con NumPy y pandas.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.config.configuracion_contenido import ConfiguracionContenido, rango_duracion
+from core.exportador.catalogo_exportaciones import CatalogoExportaciones
+from core.exportador.indice_busqueda import PRIORIDAD_FORMATOS
+from core.formatos.generador_formatos import GeneradorFormatos
+from core.formatos.plantillas_guion import GUION_EDUCATIVO, GUION_NARRATIVO
+from core.formatos.subtitulos import SECCIONES_GUION
+
+# Texto fijo con el que empieza cada sección de guion_completo_voz en cada plantilla:
+# introducción, primer punto, último punto y cierre (ver dividir_guion_secciones)
+MARCAS_SECCIONES = {
+    plantilla: tuple(plantilla.marcas_secciones(2))
+    for plantilla in (GUION_NARRATIVO, GUION_EDUCATIVO)
+}
+
+# Columnas del informe, en orden
+COLUMNAS_INFORME = (
+    "archivo", "id", "titulo", "nicho", "red_social", "duracion", "palabras", "segundos_estimados",
+    "segundos_objetivo", "desviacion", "duracion_en_red", "secciones_faltantes", "duplicados",
+    "duplicado_de", "problemas"
+)
+
+_CAMPOS_CSV = ("id", "titulo", "nicho", "red_social", "duracion", "tipo_contenido",
+               "formatos_ia.elevenlabs.texto_completo")
+
+
+def _columnas_jsonl(ruta):
+    """Columnas (id, título, nicho, red, duración, tipo, guión) de un JSONL"""
+    filas = []
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                continue
+            filas.append((
+                registro.get("id"), registro.get("titulo", ""), registro.get("nicho", ""),
+                registro.get("red_social", ""), registro.get("duracion", ""), registro.get("tipo_contenido", ""),
+                registro.get("formatos_ia", {}).get("elevenlabs", {}).get("texto_completo", "")
+            ))
+    return filas
+
+
+def _columnas_csv(ruta):
+    """Columnas de un CSV de formatos_tabulares"""
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        return [
+            (int(registro["id"]) if registro.get("id") else None, *(registro.get(campo, "") for campo in _CAMPOS_CSV[1:]))
+            for registro in csv.DictReader(archivo)
+        ]
+
+
+def _columnas_parquet(ruta):
+    """Columnas de un Parquet de formatos_tabulares (requiere pyarrow); no se leen las demás"""
+    import pyarrow.parquet as pq
+
+    # Del struct formatos_ia solo se lee la columna del guión completo
+    tabla = pq.ParquetFile(str(ruta)).read(columns=list(_CAMPOS_CSV)).flatten().flatten()
+    return list(zip(*(tabla.column(campo).to_pylist() for campo in _CAMPOS_CSV)))
+
+
+def _columnas_excel(ruta):
+    """Columnas de un Excel de ExportadorIdeas: solo las hojas Ideas y Guiones, hasta la última columna necesaria"""
+    catalogo = CatalogoExportaciones(Path(ruta).parent)
+    ideas = catalogo.leer_hoja(ruta, "Ideas", columnas=("ID", "TÍTULO", "RED SOCIAL", "NICHO", "DURACIÓN"))
+    guiones = catalogo.leer_hoja(ruta, "Guiones", columnas=("GUIÓN COMPLETO",))
+    return [
+        (
+            idea.get("ID"), idea.get("TÍTULO") or "", idea.get("NICHO") or "", idea.get("RED SOCIAL") or "",
+            idea.get("DURACIÓN") or "", "", guion.get("GUIÓN COMPLETO") or ""
+        )
+        for idea, guion in zip(ideas, guiones)
+    ]
+
+
+LECTORES = {
+    "jsonl": _columnas_jsonl,
+    "csv": _columnas_csv,
+    "parquet": _columnas_parquet,
+    "excel": _columnas_excel
+}
+
+
+def _huella_guion(guion):
+    """Huella del guión sin distinguir mayúsculas ni espacios ("" si está vacío)"""
+    normalizado = " ".join(guion.lower().split())
+    return hashlib.sha1(normalizado.encode("utf-8")).hexdigest() if normalizado else ""
+
+
+def medir_archivo(archivo, ruta, formato):
+    """Lee un archivo exportado y mide sus guiones (se ejecuta en los procesos del pool)
+
+    Solo las mediciones que necesitan el texto se hacen aquí (palabras,
+    secciones presentes y huella); el texto de los guiones no se devuelve.
+
+    Args:
+        archivo: Nombre del archivo dentro del catálogo
+        ruta: Ruta del archivo
+        formato: Formato de la exportación ("excel", "jsonl", "csv", "parquet")
+
+    Returns:
+        Diccionario columna -> lista o array con una posición por guión
+    """
+    filas = LECTORES[formato](ruta)
+    cantidad = len(filas)
+    identificadores, titulos, nichos, redes, duraciones, tipos, guiones = (
+        zip(*filas) if filas else ((),) * 7
+    )
+    guiones = [guion or "" for guion in guiones]
+
+    palabras = np.fromiter(map(len, map(str.split, guiones)), dtype=np.int32, count=cantidad)
+
+    # Plantilla de cada guión: la narrativa si la idea lo es o si el guión empieza como tal
+    intro_narrativa = MARCAS_SECCIONES[GUION_NARRATIVO][0]
+    narrativo = np.fromiter(
+        (tipo == "narrativo" or nicho == "Historias Reddit" or guion.startswith(intro_narrativa)
+         for tipo, nicho, guion in zip(tipos, nichos, guiones)),
+        dtype=bool, count=cantidad
+    )
+    presentes = np.zeros((cantidad, len(SECCIONES_GUION)), dtype=bool)
+    for plantilla, filas_plantilla in ((GUION_NARRATIVO, narrativo), (GUION_EDUCATIVO, ~narrativo)):
+        indices = np.flatnonzero(filas_plantilla)
+        for columna, marca in enumerate(MARCAS_SECCIONES[plantilla]):
+            presentes[indices, columna] = np.fromiter(
+                (marca in guiones[i] for i in indices), dtype=bool, count=len(indices)
+            )
+
+    return {
+        "archivo": [archivo] * cantidad,
+        "id": list(identificadores),
+        "titulo": list(titulos),
+        "nicho": list(nichos),
+        "red_social": list(redes),
+        "duracion": list(duraciones),
+        "palabras": palabras,
+        "presentes": presentes,
+        "huella": [_huella_guion(guion) for guion in guiones]
+    }
+
+
+class CalidadGuiones:
+    """Control de calidad en bloque de los guiones de las exportaciones del catálogo."""
+
+    def __init__(self, carpeta, redes_sociales=None, tolerancia=0.25):
+        """Constructor de la clase CalidadGuiones.
+
+        Args:
+            carpeta: Carpeta de salida de las exportaciones (la del catálogo)
+            redes_sociales: Configuración de redes sociales (por defecto, la de
+                ConfiguracionContenido)
+            tolerancia: Desviación relativa máxima entre la duración estimada y
+                la duración más cercana de su red social (0.25 = ±25%)
+        """
+        self.catalogo = CatalogoExportaciones(carpeta)
+        self.redes_sociales = redes_sociales or ConfiguracionContenido().obtener_redes_sociales()
+        self.tolerancia = tolerancia
+
+    def seleccionar(self, archivos=None, formato=None):
+        """Entradas del catálogo a revisar, de la más antigua a la más reciente
+
+        Si una misma exportación se guardó en varios formatos, se lee solo el
+        más rápido de leer (son las mismas ideas).
+
+        Args:
+            archivos: Nombres de archivo a revisar (por defecto, todos)
+            formato: Si se indica, solo las exportaciones de ese formato
+        """
+        entradas = self.catalogo.entradas(formato)
+        if archivos:
+            archivos = set(archivos)
+            return [entrada for entrada in reversed(entradas) if entrada["archivo"] in archivos]
+
+        por_exportacion = {}
+        for entrada in reversed(entradas):
+            base = entrada["archivo"].rsplit(".", 1)[0]
+            actual = por_exportacion.get(base)
+            if actual is None or (PRIORIDAD_FORMATOS.get(entrada.get("formato"), 9)
+                                  < PRIORIDAD_FORMATOS.get(actual.get("formato"), 9)):
+                por_exportacion[base] = entrada
+        return list(por_exportacion.values())
+
+    def medir(self, entradas, procesos=None):
+        """Lee y mide los guiones de varias exportaciones en paralelo
+
+        Args:
+            entradas: Entradas del catálogo (ver seleccionar)
+            procesos: Número de procesos (por defecto, uno por CPU; 1 fuerza la
+                lectura en serie)
+
+        Returns:
+            Lista de mediciones de medir_archivo (las de los archivos que no se
+            pudieron leer se omiten)
+        """
+        argumentos = [
+            (entrada["archivo"], str(self.catalogo.ruta_archivo(entrada)), entrada.get("formato", "excel"))
+            for entrada in entradas if entrada.get("formato", "excel") in LECTORES
+        ]
+        procesos = min(procesos or os.cpu_count() or 1, len(argumentos) or 1)
+
+        mediciones = []
+        if procesos == 1:
+            # Con un solo proceso el pool solo añade el coste de enviar los resultados
+            for archivo, ruta, formato in argumentos:
+                try:
+                    mediciones.append(medir_archivo(archivo, ruta, formato))
+                except Exception as e:
+                    print(f"⚠️ No se pudo revisar {archivo}: {e}")
+            return mediciones
+
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            futuros = [executor.submit(medir_archivo, *argumento) for argumento in argumentos]
+            for (archivo, _, _), futuro in zip(argumentos, futuros):
+                try:
+                    mediciones.append(futuro.result())
+                except Exception as e:
+                    print(f"⚠️ No se pudo revisar {archivo}: {e}")
+        return mediciones
+
+    def _rangos_red(self, red_social):
+        """Rangos (mínimo, máximo) en segundos de las duraciones de una red social
+
+        Vacío si la red no está configurada.
+        """
+        red = self.redes_sociales.get(red_social, {})
+        if "rangos_duraciones" in red:
+            return red["rangos_duraciones"]
+        return tuple(rango_duracion(duracion) for duracion in red.get("duraciones", ()))
+
+    def informe(self, mediciones):
+        """Calcula las métricas de todos los guiones medidos
+
+        Args:
+            mediciones: Lista de mediciones de medir_archivo
+
+        Returns:
+            DataFrame con una fila por guión y las columnas de COLUMNAS_INFORME
+        """
+        if not mediciones:
+            return pd.DataFrame(columns=COLUMNAS_INFORME)
+
+        columnas = {
+            nombre: np.concatenate([medicion[nombre] for medicion in mediciones])
+            for nombre in ("palabras", "presentes")
+        }
+        for nombre in ("archivo", "id", "titulo", "nicho", "red_social", "duracion", "huella"):
+            columnas[nombre] = [valor for medicion in mediciones for valor in medicion[nombre]]
+        informe = pd.DataFrame({nombre: columnas[nombre] for nombre in (
+            "archivo", "id", "titulo", "nicho", "red_social", "duracion", "palabras"
+        )})
+
+        # Duración estimada frente a la más cercana de las de su red social
+        # (dentro de un rango como "1-3min" la distancia es cero)
+        estimados = columnas["palabras"] / GeneradorFormatos.PALABRAS_POR_SEGUNDO
+        objetivos = np.full(len(informe), np.nan)
+        for red, indices in informe.groupby("red_social").indices.items():
+            rangos = np.asarray(self._rangos_red(red), dtype=float).reshape(-1, 2)
+            if not len(rangos):
+                continue
+            cercanos = np.clip(estimados[indices, None], rangos[:, 0], rangos[:, 1])
+            distancias = np.abs(cercanos - estimados[indices, None])
+            objetivos[indices] = cercanos[np.arange(len(indices)), distancias.argmin(axis=1)]
+        informe["segundos_estimados"] = estimados
+        informe["segundos_objetivo"] = objetivos
+        informe["desviacion"] = (estimados / objetivos - 1).round(3)
+        informe["duracion_en_red"] = informe["desviacion"].abs() <= self.tolerancia
+
+        # Secciones que faltan, como texto "intro_hook, momento_climax"
+        faltantes = ~columnas["presentes"]
+        nombres = np.array(SECCIONES_GUION, dtype=object)
+        informe["secciones_faltantes"] = [", ".join(nombres[fila]) for fila in faltantes]
+
+        # Guiones repetidos (dentro de una exportación o entre exportaciones)
+        huellas = pd.Series(columnas["huella"])
+        con_texto = huellas != ""
+        referencias = informe["archivo"] + "#" + informe["id"].astype(str)
+        informe["duplicados"] = np.where(con_texto, huellas.groupby(huellas).transform("size") - 1, 0)
+        primera = referencias.groupby(huellas).transform("first")
+        informe["duplicado_de"] = np.where(con_texto & huellas.duplicated(), primera, "")
+
+        informe["problemas"] = (
+            (columnas["palabras"] == 0).astype(int)
+            + (~informe["duracion_en_red"]).astype(int)
+            + faltantes.any(axis=1).astype(int)
+            + (informe["duplicado_de"] != "").astype(int)
+        )
+        return informe[list(COLUMNAS_INFORME)]
+
+    def revisar(self, archivos=None, formato=None, procesos=None):
+        """Revisa las exportaciones del catálogo (ver seleccionar, medir e informe)
+
+        Returns:
+            DataFrame del informe
+        """
+        return self.informe(self.medir(self.seleccionar(archivos, formato), procesos))
@@ -0,0 +1,178 @@
+"""
+Módulo con el catálogo de exportaciones.
+
+Cada exportación añade una línea a un archivo JSON Lines de la carpeta de
+salida con la ruta, la fecha, el número de filas, los nichos y redes y una
+vista previa de los primeros guiones. Las herramientas pueden listar, elegir y
+previsualizar exportaciones leyendo solo el catálogo, y abrir el archivo (en
+modo de solo lectura y fila a fila) únicamente cuando necesiten el contenido
+completo.
+"""
+
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from core.exportador.tabla_ideas import TablaIdeas
+
+NOMBRE_CATALOGO = "catalogo_exportaciones.jsonl"
+
+
+def resumir_ideas(ideas, max_vista_previa=3, longitud_vista_previa=500):
+    """Resumen de una exportación para el catálogo
+
+    Args:
+        ideas: Lista de ideas o TablaIdeas ya construida
+        max_vista_previa: Guiones que se incluyen en la vista previa
+        longitud_vista_previa: Caracteres de cada guión en la vista previa
+
+    Returns:
+        Diccionario con filas, nichos, redes y vista_previa
+    """
+    if isinstance(ideas, TablaIdeas):
+        filas = ideas.filas
+        nichos = Counter(ideas.columnas["nicho"])
+        redes = Counter(ideas.columnas["red_social"])
+        primeras = ideas.fragmento(0, max_vista_previa)
+    else:
+        filas = len(ideas)
+        nichos = Counter(idea.get("nicho", "") for idea in ideas)
+        redes = Counter(idea.get("red_social", "") for idea in ideas)
+        primeras = TablaIdeas(ideas[:max_vista_previa])
+
+    columnas = primeras.columnas
+    vista_previa = [
+        {
+            "id": identificador,
+            "titulo": titulo,
+            "nicho": nicho,
+            "red_social": red,
+            "guion": guion[:longitud_vista_previa]
+        }
+        for identificador, titulo, nicho, red, guion in zip(
+            columnas["id"], columnas["titulo"], columnas["nicho"], columnas["red_social"],
+            columnas["formatos_ia.elevenlabs.texto_completo"]
+        )
+    ]
+
+    return {
+        "filas": filas,
+        "nichos": dict(nichos.most_common()),
+        "redes": dict(redes.most_common()),
+        "vista_previa": vista_previa
+    }
+
+
+class CatalogoExportaciones:
+    """Catálogo (JSON Lines) con una entrada por exportación de la carpeta de salida."""
+
+    def __init__(self, carpeta):
+        """Constructor de la clase CatalogoExportaciones.
+
+        Args:
+            carpeta: Carpeta de salida de las exportaciones
+        """
+        self.carpeta = Path(carpeta)
+        self.ruta = self.carpeta / NOMBRE_CATALOGO
+
+    def registrar(self, ruta_archivo, formato, resumen, **datos):
+        """Añade una exportación al catálogo
+
+        Args:
+            ruta_archivo: Archivo exportado
+            formato: "excel" o el formato tabular del archivo
+            resumen: Resumen de resumir_ideas
+            **datos: Campos adicionales de la entrada (hojas, manifiesto...)
+
+        Returns:
+            Entrada añadida
+        """
+        entrada = {
+            "archivo": Path(os.path.relpath(ruta_archivo, self.carpeta)).as_posix(),
+            "formato": formato,
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            **resumen,
+            **datos
+        }
+        try:
+            with open(self.ruta, "a", encoding="utf-8") as archivo:
+                archivo.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ No se pudo actualizar el catálogo de exportaciones: {e}")
+        return entrada
+
+    def entradas(self, formato=None, solo_existentes=True):
+        """Entradas del catálogo, de la más reciente a la más antigua
+
+        Args:
+            formato: Si se indica, solo las exportaciones de ese formato
+            solo_existentes: Si es True, omite los archivos que ya no existen
+
+        Returns:
+            Lista de entradas (una por archivo; si se reexportó, la última)
+        """
+        if not self.ruta.exists():
+            return []
+
+        por_archivo = {}
+        with open(self.ruta, encoding="utf-8") as archivo:
+            for linea in archivo:
+                try:
+                    entrada = json.loads(linea)
+                except ValueError:
+                    # Línea incompleta (p. ej. una escritura interrumpida)
+                    continue
+                por_archivo.pop(entrada.get("archivo"), None)
+                por_archivo[entrada.get("archivo")] = entrada
+
+        entradas = [
+            entrada for entrada in reversed(list(por_archivo.values()))
+            if (formato is None or entrada.get("formato") == formato)
+            and (not solo_existentes or self.ruta_archivo(entrada).exists())
+        ]
+        return entradas
+
+    def ultima(self, formato="excel"):
+        """Entrada de la exportación más reciente (None si no hay ninguna)"""
+        entradas = self.entradas(formato)
+        return entradas[0] if entradas else None
+
+    def ruta_archivo(self, entrada):
+        """Ruta completa del archivo de una entrada"""
+        return self.carpeta / entrada["archivo"]
+
+    def leer_hoja(self, entrada, hoja="Guiones", limite=None, columnas=None):
+        """Lee las filas de una hoja del Excel de una entrada, en solo lectura y bajo demanda
+
+        Args:
+            entrada: Entrada del catálogo (o ruta del archivo)
+            hoja: Nombre de la hoja
+            limite: Número máximo de filas a leer
+            columnas: Cabeceras a leer (por defecto, todas); las columnas
+                posteriores a la última indicada no se leen
+
+        Yields:
+            Diccionario cabecera -> valor por fila
+        """
+        from openpyxl import load_workbook
+
+        ruta = entrada if isinstance(entrada, (str, Path)) else self.ruta_archivo(entrada)
+        libro = load_workbook(ruta, read_only=True)
+        try:
+            hoja_libro = libro[hoja]
+            cabeceras = next(hoja_libro.iter_rows(values_only=True, max_row=1), None)
+            if cabeceras is None:
+                return
+            max_col = None
+            if columnas is not None:
+                max_col = max(cabeceras.index(columna) for columna in columnas) + 1
+                cabeceras = cabeceras[:max_col]
+            filas = hoja_libro.iter_rows(
+                values_only=True, min_row=2, max_col=max_col, max_row=None if limite is None else limite + 1
+            )
+            for fila in filas:
+                yield dict(zip(cabeceras, fila))
+        finally:
+            libro.close()
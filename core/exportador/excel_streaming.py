@@ -0,0 +1,69 @@
+"""
+Módulo con el escritor de Excel en streaming (xlsxwriter en modo constant_memory).
+
+Escribe las filas de cada hoja según llegan, sin guardar el libro en memoria;
+los anchos de columna se calculan sobre la marcha y se aplican al cerrar.
+"""
+
+
+class EscritorExcelStreaming:
+    """Escribe un libro de Excel fila a fila con memoria constante."""
+
+    def __init__(self, archivo, nombres_hojas, ajustar_ancho):
+        """Constructor de la clase EscritorExcelStreaming.
+
+        Args:
+            archivo: Ruta del archivo .xlsx
+            nombres_hojas: Nombres de las hojas, en orden
+            ajustar_ancho: Función (columna, longitud máxima) -> ancho de la columna
+        """
+        import xlsxwriter
+
+        self.archivo = archivo
+        self.ajustar_ancho = ajustar_ancho
+        self._libro = xlsxwriter.Workbook(str(archivo), {"constant_memory": True, "strings_to_urls": False})
+        # Mismo estilo de cabecera que usa pandas
+        self._formato_cabecera = self._libro.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        self._hojas = [self._libro.add_worksheet(nombre) for nombre in nombres_hojas]
+        self._columnas = [None] * len(self._hojas)
+        self._maximos = [None] * len(self._hojas)
+        self.filas = 0
+
+    def escribir_fila(self, filas_hojas):
+        """Escribe una fila en cada hoja
+
+        Args:
+            filas_hojas: Un diccionario columna -> valor por hoja, en el orden de las hojas
+        """
+        self.filas += 1
+        fila = self.filas
+        for indice, (hoja, datos) in enumerate(zip(self._hojas, filas_hojas)):
+            if self._columnas[indice] is None:
+                # La cabecera sale de las claves de la primera fila
+                self._columnas[indice] = list(datos)
+                self._maximos[indice] = [len(columna) for columna in datos]
+                for posicion, columna in enumerate(datos):
+                    hoja.write_string(0, posicion, columna, self._formato_cabecera)
+
+            anchos = self._maximos[indice]
+            for posicion, valor in enumerate(datos.values()):
+                if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+                    hoja.write_number(fila, posicion, valor)
+                elif valor != "":
+                    # Las celdas vacías se dejan en blanco, como hace pandas
+                    hoja.write_string(fila, posicion, str(valor))
+                longitud = len(str(valor))
+                if longitud > anchos[posicion]:
+                    anchos[posicion] = longitud
+
+    def cerrar(self):
+        """Aplica los anchos de columna y cierra el libro"""
+        if self._libro is None:
+            return
+        try:
+            for hoja, nombres, anchos in zip(self._hojas, self._columnas, self._maximos):
+                for posicion, (columna, max_length) in enumerate(zip(nombres or [], anchos or [])):
+                    hoja.set_column(posicion, posicion, self.ajustar_ancho(columna, max_length))
+        finally:
+            self._libro.close()
+            self._libro = None
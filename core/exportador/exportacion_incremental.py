@@ -0,0 +1,193 @@
+"""
+Módulo para exportar ideas de forma incremental según se aceptan.
+
+Cada idea se añade en el momento a los archivos auxiliares (JSONL/CSV), que
+se llevan a disco tras cada fila, y se encola para el Excel, que escribe un
+hilo en segundo plano en modo streaming. La cola está acotada, así que la
+memoria no crece con el tamaño del lote. Los archivos se crean con la primera
+idea: si no se acepta ninguna no queda ningún archivo vacío.
+"""
+
+import queue
+import threading
+from collections import Counter
+from datetime import datetime
+
+from core.exportador.catalogo_exportaciones import resumir_ideas
+from core.exportador.excel_streaming import EscritorExcelStreaming
+from core.exportador.formatos_tabulares import anidar_valores, valores_idea, EXPORTADORES_TABULARES
+from core.exportador.tabla_ideas import HOJAS_EXCEL, filas_hojas
+from core.monitorizacion.metricas import COLA, IDEAS_EXPORTADAS, TIEMPO_EXPORTACION
+from core.monitorizacion.perfilador import perfilado
+
+_FIN = object()
+
+
+class ExportacionIncremental:
+    """Recibe ideas aceptadas y las va escribiendo en los archivos de salida."""
+
+    def __init__(self, exportador, formateador=None, nombre_base=None, auxiliares=("jsonl",), excel=True,
+                 max_pendientes=256):
+        """Constructor de la clase ExportacionIncremental.
+
+        Args:
+            exportador: ExportadorIdeas con la carpeta de salida y el formato de las hojas
+            formateador: GeneradorFormatos para generar los formatos de las ideas
+                que lleguen sin ellos
+            nombre_base: Nombre de los archivos sin extensión
+            auxiliares: Formatos de los archivos auxiliares ("jsonl", "csv")
+            excel: Si es True, escribe también el Excel
+            max_pendientes: Ideas que pueden esperar en cola al hilo del Excel
+        """
+        if not nombre_base:
+            nombre_base = f"ideas_videos_pro_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        self.exportador = exportador
+        self.formateador = formateador
+        self.nombre_base = nombre_base
+        self.ideas_exportadas = 0
+        self.archivos = {}
+        self._finalizada = False
+
+        # Datos para la entrada del catálogo
+        self._nichos = Counter()
+        self._redes = Counter()
+        self._primeras = []
+
+        # Archivos auxiliares (escritos en el hilo que acepta las ideas) y Excel
+        # (escrito en segundo plano), creados con la primera idea
+        self._formatos_auxiliares = tuple(auxiliares)
+        self._con_excel = excel
+        self._max_pendientes = max_pendientes
+        self._auxiliares = []
+        self._cola = None
+        self._hilo = None
+        self._error_excel = None
+
+    def _abrir(self):
+        """Crea los archivos de salida (al llegar la primera idea)"""
+        for formato in self._formatos_auxiliares:
+            clase = EXPORTADORES_TABULARES[formato]
+            ruta = self.exportador.salida_path / f"{self.nombre_base}{clase.extension}"
+            self._auxiliares.append(clase.escritor(ruta))
+            self.archivos[formato] = str(ruta)
+
+        if not self._con_excel:
+            return
+        ruta = self.exportador.salida_path / f"{self.nombre_base}.xlsx"
+        try:
+            self._excel = EscritorExcelStreaming(ruta, HOJAS_EXCEL, self.exportador.ajustar_ancho_columna)
+        except ImportError:
+            # Sin xlsxwriter el Excel se exporta completo al final
+            print("⚠️ xlsxwriter no está instalado, el Excel se exportará al terminar")
+            return
+        self._cola = queue.Queue(maxsize=self._max_pendientes)
+        self._hilo = threading.Thread(target=self._escribir_excel, name="exportacion-excel", daemon=True)
+        self._hilo.start()
+        self.archivos["excel"] = str(ruta)
+
+    @perfilado("exportar.incremental", "exportar")
+    def agregar(self, idea):
+        """Exporta una idea aceptada"""
+        if self.formateador is not None and "formatos_ia" not in idea:
+            idea["formatos_ia"] = self.formateador.generar_formatos_ia_especificos(
+                idea, formatos=self.exportador.FORMATOS_REQUERIDOS
+            )
+
+        if not self.ideas_exportadas:
+            self._abrir()
+        self.ideas_exportadas += 1
+        identificador = self.ideas_exportadas
+        self._nichos[idea.get("nicho", "")] += 1
+        self._redes[idea.get("red_social", "")] += 1
+        if len(self._primeras) < 3:
+            self._primeras.append(idea)
+
+        # Un solo recorrido de la idea para los archivos auxiliares y el Excel
+        valores = valores_idea(idea, identificador)
+
+        if self._auxiliares:
+            registro = anidar_valores(valores)
+            for escritor in self._auxiliares:
+                escritor.escribir(registro)
+                escritor.vaciar()
+            for formato in self.archivos:
+                if formato != "excel":
+                    IDEAS_EXPORTADAS.incrementar(formato=formato)
+
+        if self._cola is not None:
+            # Las filas se preparan aquí para que el hilo no lea ideas que pueden cambiar
+            self._cola.put(filas_hojas(valores))
+            COLA.fijar(self._cola.qsize(), cola="excel")
+
+    def _escribir_excel(self):
+        """Hilo que escribe en el Excel las filas encoladas"""
+        while True:
+            filas = self._cola.get()
+            COLA.fijar(self._cola.qsize(), cola="excel")
+            if filas is _FIN:
+                break
+            if self._error_excel is not None:
+                continue
+            try:
+                self._excel.escribir_fila(filas)
+                IDEAS_EXPORTADAS.incrementar(formato="excel")
+            except Exception as e:
+                self._error_excel = e
+
+    @perfilado("exportar.incremental_finalizar")
+    def finalizar(self):
+        """Cierra los archivos auxiliares y espera a que termine el Excel
+
+        Returns:
+            Diccionario formato -> ruta de los archivos generados
+        """
+        if self._finalizada:
+            return self.archivos
+        self._finalizada = True
+
+        # Tiempo que la exportación añade al terminar la generación
+        with TIEMPO_EXPORTACION.medir(formato="incremental_cierre"):
+            for escritor in self._auxiliares:
+                escritor.cerrar()
+            self._auxiliares = []
+
+            if self._hilo is not None:
+                self._cola.put(_FIN)
+                self._hilo.join()
+                self._hilo = None
+                try:
+                    self._excel.cerrar()
+                except Exception as e:
+                    self._error_excel = self._error_excel or e
+
+        if self._error_excel is not None and "excel" in self.archivos:
+            print(f"⚠️ Error escribiendo el Excel incremental: {self._error_excel}")
+            self.archivos.pop("excel", None)
+
+        if not self.ideas_exportadas:
+            print("\n📊 EXPORTACIÓN INCREMENTAL: ninguna idea aceptada, no se creó ningún archivo")
+            return self.archivos
+
+        resumen = resumir_ideas(self._primeras)
+        resumen.update(
+            filas=self.ideas_exportadas,
+            nichos=dict(self._nichos.most_common()),
+            redes=dict(self._redes.most_common())
+        )
+        for formato, ruta in self.archivos.items():
+            datos = {"hojas": list(HOJAS_EXCEL)} if formato == "excel" else {}
+            self.exportador.catalogo.registrar(ruta, formato, resumen, **datos)
+
+        print(f"\n📊 EXPORTACIÓN INCREMENTAL COMPLETADA ({self.ideas_exportadas} ideas)")
+        for formato, ruta in self.archivos.items():
+            print(f"   📁 {formato.upper()}: {ruta}")
+
+        return self.archivos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Incluso si la generación falla, se cierran los archivos con lo exportado
+        self.finalizar()
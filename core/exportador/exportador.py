@@ -2,13 +2,56 @@
 Módulo para exportar ideas a diferentes formatos.
 """
 
+import hashlib
+import json
+import os
+import re
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from openpyxl.utils import get_column_letter
+
+from core.exportador.catalogo_exportaciones import CatalogoExportaciones, resumir_ideas
+from core.exportador.excel_streaming import EscritorExcelStreaming
+from core.exportador.formatos_tabulares import valores_idea, EXPORTADORES_TABULARES
+from core.exportador.tabla_ideas import HOJAS_EXCEL, TablaIdeas, filas_hojas
+from core.formatos.subtitulos import formatear_srt, formatear_lrc
+from core.monitorizacion.metricas import IDEAS_EXPORTADAS, TIEMPO_EXPORTACION
+from core.monitorizacion.perfilador import perfilado, tramo
+
+
+def _sha256_archivo(ruta):
+    """Suma SHA-256 de un archivo, leído por bloques"""
+    suma = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            suma.update(bloque)
+    return suma.hexdigest()
+
+
+def _exportar_fragmento(carpeta, nombre_archivo, formato, tabla):
+    """Escribe un fragmento de la exportación (se ejecuta en los procesos del pool)
+    
+    Returns:
+        Entrada del manifiesto con el archivo, sus filas, su tamaño y su suma SHA-256
+    """
+    ruta = Path(carpeta) / nombre_archivo
+    filas = ExportadorIdeas(Path(carpeta)).escribir_archivo(tabla, ruta, formato)
+    return {
+        "archivo": nombre_archivo,
+        "filas": filas,
+        "bytes": ruta.stat().st_size,
+        "sha256": _sha256_archivo(ruta)
+    }
+
 
 class ExportadorIdeas:
     """Clase para exportar ideas a diferentes formatos."""
     
+    # Formatos de idea["formatos_ia"] que lee la exportación
+    FORMATOS_REQUERIDOS = ("elevenlabs",)
+    
     def __init__(self, salida_path=None):
         """Constructor de la clase ExportadorIdeas.
         
@@ -18,104 +61,335 @@ class ExportadorIdeas:
         # Crear carpeta de salida si no se proporciona
         self.salida_path = salida_path or Path("ideas_generadas")
         self.salida_path.mkdir(exist_ok=True)
+        # Una entrada por exportación para listar y previsualizar sin abrir archivos
+        self.catalogo = CatalogoExportaciones(self.salida_path)
     
-    def exportar_a_excel_avanzado(self, ideas, nombre_archivo=None):
-        """Exportar ideas a Excel con formato profesional y guiones de voz"""
+    @perfilado("exportar.autoajuste", "exportar")
+    def calcular_anchos_columnas(self, df):
+        """Calcula el ancho de cada columna de un DataFrame a partir de su texto más largo
+        
+        Returns:
+            Lista con el ancho de cada columna, en orden
+        """
+        anchos = []
+        for columna in df.columns:
+            # Una pasada por columna en C (map), más rápida que el accesor .str de pandas
+            max_length = max(len(str(columna)), max(map(len, map(str, df[columna].tolist())), default=0))
+            anchos.append(self.ajustar_ancho_columna(columna, max_length))
+        
+        return anchos
+    
+    def ajustar_ancho_columna(self, columna, max_length):
+        """Ancho final de una columna según su tipo y su texto más largo"""
+        # Ajustes específicos por tipo de columna
+        if "GUIÓN" in str(columna):
+            return min(max_length + 10, 150)  # Más ancho para guiones
+        return min(max_length + 5, 50)  # Más compacto para otros campos
+    
+    @perfilado("exportar.excel")
+    def exportar_a_excel_avanzado(self, ideas, nombre_archivo=None, motor=None):
+        """Exportar ideas a Excel con formato profesional y guiones de voz
+        
+        Args:
+            ideas: Lista (o iterador) de ideas, o TablaIdeas ya construida
+            nombre_archivo: Nombre del archivo de salida
+            motor: "xlsxwriter" (escritura en streaming con memoria constante) u
+                "openpyxl" (DataFrames completos en memoria); por defecto
+                xlsxwriter si está instalado
+        """
         
         if not nombre_archivo:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             nombre_archivo = f"ideas_videos_pro_{timestamp}.xlsx"
         
+        # El catálogo necesita recorrer las ideas otra vez
+        if not isinstance(ideas, (list, TablaIdeas)):
+            ideas = list(ideas)
+        
         archivo_completo = self.salida_path / nombre_archivo
+        with TIEMPO_EXPORTACION.medir(formato="excel"):
+            total = self.escribir_archivo(ideas, archivo_completo, "excel", motor)
+        IDEAS_EXPORTADAS.incrementar(total, formato="excel")
+        self.catalogo.registrar(archivo_completo, "excel", resumir_ideas(ideas), hojas=list(HOJAS_EXCEL))
         
-        # Preparar datos para las hojas
-        datos_principales = []
-        datos_guiones = []
-        datos_hashtags = []
-        
-        for i, idea in enumerate(ideas, 1):
-            # Hoja principal - Ideas y Detalles
-            principales = {
-                "ID": i,
-                "TÍTULO": idea.get("titulo", ""),
-                "RED SOCIAL": idea.get("red_social", ""),
-                "TEMA": idea.get("tema", ""),
-                "NICHO": idea.get("nicho", ""),
-                "DURACIÓN": idea.get("duracion", ""),
-                "HOOK INICIAL": idea.get("hook_inicial", ""),
-                "PALABRAS CLAVE": " | ".join(idea.get("metadata", {}).get("palabras_clave", [])),
-                "ESCENAS RECOMENDADAS": " | ".join(idea.get("elementos_visuales", [])),
-                "DESCRIPCIÓN": idea.get("descripcion", "")
-            }
-            datos_principales.append(principales)
-            
-            # Extraer configuración de guiones
-            formatos = idea.get("formatos_ia", {})
-            elevenlabs_config = formatos.get("elevenlabs", {})
-            
-            # Hoja de guiones
-            guiones = {
-                "ID": i,
-                "TÍTULO": idea.get("titulo", ""),
-                "GUIÓN COMPLETO": elevenlabs_config.get("texto_completo", ""),
-                "VERSIÓN CORTA (15s)": elevenlabs_config.get("versiones_cortas", {}).get("15s", ""),
-                "VERSIÓN CORTA (30s)": elevenlabs_config.get("versiones_cortas", {}).get("30s", ""),
-                "ESTILO VOZ": elevenlabs_config.get("instrucciones_voz", {}).get("tono", ""),
-                "EMOCIÓN": elevenlabs_config.get("instrucciones_voz", {}).get("emoción", ""),
-                "NOTAS ADICIONALES": elevenlabs_config.get("instrucciones_voz", {}).get("notas", "")
-            }
-            datos_guiones.append(guiones)
+        print(f"\n📊 EXPORTACIÓN COMPLETADA")
+        print(f"   📁 Archivo: {archivo_completo}")
+        print(f"   📋 3 hojas: Ideas, Guiones, Hashtags y Keywords")
+        print(f"   🎤 {total} ideas completas con guiones")
+        
+        return str(archivo_completo)
+    
+    def escribir_archivo(self, ideas, ruta, formato="excel", motor=None):
+        """Escribe las ideas en un archivo, sin mensajes (lo usan la exportación normal y la fragmentada)
+        
+        Args:
+            ideas: Lista de ideas o TablaIdeas ya construida
+            ruta: Ruta completa del archivo
+            formato: "excel" o un formato de EXPORTADORES_TABULARES
+            motor: Motor del Excel ("xlsxwriter" u "openpyxl"); por defecto
+                xlsxwriter si está instalado
             
-            # Hoja de hashtags y keywords
-            hashtags_data = {
-                "ID": i,
-                "TÍTULO": idea.get("titulo", ""),
-                "HASHTAGS": " ".join(idea.get("hashtags", [])),
-                "PALABRAS CLAVE": " | ".join(idea.get("metadata", {}).get("palabras_clave", [])),
-                "TEMA PRINCIPAL": idea.get("tema", ""),
-                "SUBTEMAS": " | ".join(idea.get("metadata", {}).get("subtemas", []))
-            }
-            datos_hashtags.append(hashtags_data)
-        
-        # Crear Excel con las hojas simplificadas
+        Returns:
+            Número de ideas escritas
+        """
+        if formato != "excel":
+            tabla = ideas if isinstance(ideas, TablaIdeas) else TablaIdeas(ideas)
+            EXPORTADORES_TABULARES[formato]().escribir(tabla, ruta)
+            return tabla.filas
+        
+        if motor is None:
+            try:
+                import xlsxwriter
+                motor = "xlsxwriter"
+            except ImportError:
+                motor = "openpyxl"
+        
+        if motor == "xlsxwriter":
+            return self._exportar_excel_streaming(ideas, ruta)
+        return self._exportar_excel_openpyxl(ideas, ruta)
+    
+    def _exportar_excel_openpyxl(self, ideas, archivo_completo):
+        """Escribe el Excel a partir de DataFrames completos con openpyxl
+        
+        Returns:
+            Número de ideas exportadas
+        """
+        hojas = self.preparar_hojas(ideas)
         with pd.ExcelWriter(archivo_completo, engine='openpyxl') as writer:
-            # Hoja de ideas principales
-            df_principal = pd.DataFrame(datos_principales)
-            df_principal.to_excel(writer, sheet_name='Ideas', index=False)
+            for sheet_name, df in hojas.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+                
+                # Ajustar anchos de columnas (calculados sobre el DataFrame, sin recorrer celdas)
+                worksheet = writer.sheets[sheet_name]
+                for posicion, ancho in enumerate(self.calcular_anchos_columnas(df), 1):
+                    worksheet.column_dimensions[get_column_letter(posicion)].width = ancho
+        
+        return len(hojas[HOJAS_EXCEL[0]])
+    
+    def _exportar_excel_streaming(self, ideas, archivo_completo):
+        """Escribe el Excel fila a fila con xlsxwriter en modo constant_memory
+        
+        Las filas se escriben según se recorren las ideas, sin DataFrames
+        intermedios; los anchos se calculan sobre la marcha y se aplican al final.
+        
+        Returns:
+            Número de ideas exportadas
+        """
+        escritor = EscritorExcelStreaming(archivo_completo, HOJAS_EXCEL, self.ajustar_ancho_columna)
+        try:
+            for filas_idea in self.filas_hojas(ideas):
+                escritor.escribir_fila(filas_idea)
+        finally:
+            escritor.cerrar()
+        
+        return escritor.filas
+    
+    def filas_hojas(self, ideas, primer_id=1):
+        """Genera, para cada idea, su fila en cada hoja del Excel
+        
+        Args:
+            ideas: Lista (o iterador) de ideas, o TablaIdeas ya construida
+            primer_id: ID de la primera idea (si se pasan ideas)
+        
+        Yields:
+            Tupla (fila de Ideas, fila de Guiones, fila de Hashtags y Keywords)
+        """
+        if isinstance(ideas, TablaIdeas):
+            yield from ideas.filas_hojas()
+            return
+        
+        for i, idea in enumerate(ideas, primer_id):
+            yield filas_hojas(valores_idea(idea, i))
+    
+    def preparar_hojas(self, ideas):
+        """Prepara los DataFrames de las hojas del Excel
+        
+        Args:
+            ideas: Lista de ideas o TablaIdeas ya construida
+        
+        Returns:
+            Diccionario nombre de hoja -> DataFrame
+        """
+        tabla = ideas if isinstance(ideas, TablaIdeas) else TablaIdeas(ideas)
+        return tabla.hojas()
+    
+    def exportar_formatos(self, ideas, formatos=("csv", "jsonl"), nombre_base=None):
+        """Exportar ideas a formatos tabulares (csv, jsonl, parquet) con una sola pasada de aplanado
+        
+        Args:
+            ideas: Lista (o iterador) de ideas, o TablaIdeas ya construida
+            formatos: Nombres de formato de EXPORTADORES_TABULARES
+            nombre_base: Nombre de los archivos sin extensión
             
-            # Hoja de guiones
-            df_guiones = pd.DataFrame(datos_guiones)
-            df_guiones.to_excel(writer, sheet_name='Guiones', index=False)
+        Returns:
+            Diccionario formato -> ruta del archivo generado
+        """
+        if not nombre_base:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre_base = f"ideas_videos_pro_{timestamp}"
+        
+        # Aplanar una sola vez y reutilizar las columnas en todos los formatos
+        tabla = ideas if isinstance(ideas, TablaIdeas) else TablaIdeas(ideas)
+        
+        archivos = {}
+        resumen = None
+        for formato in formatos:
+            if formato not in EXPORTADORES_TABULARES:
+                print(f"⚠️ Formato de exportación desconocido: {formato}")
+                continue
             
-            # Hoja de hashtags y keywords
-            df_hashtags = pd.DataFrame(datos_hashtags)
-            df_hashtags.to_excel(writer, sheet_name='Hashtags y Keywords', index=False)
+            exportador = EXPORTADORES_TABULARES[formato]()
+            ruta = self.salida_path / f"{nombre_base}{exportador.extension}"
+            try:
+                with tramo(f"exportar.{formato}"), TIEMPO_EXPORTACION.medir(formato=formato):
+                    exportador.escribir(tabla, ruta)
+                IDEAS_EXPORTADAS.incrementar(tabla.filas, formato=formato)
+                archivos[formato] = str(ruta)
+                resumen = resumen or resumir_ideas(tabla)
+                self.catalogo.registrar(ruta, formato, resumen)
+                print(f"   📄 {formato.upper()}: {ruta}")
+            except ImportError as e:
+                print(f"⚠️ No se pudo exportar a {formato} (falta una dependencia: {e})")
+        
+        return archivos
+    
+    @perfilado("exportar.fragmentado")
+    def exportar_fragmentado(self, ideas, nombre_base=None, filas_por_fragmento=10000, por_nicho=False,
+                             formato="excel", procesos=None):
+        """Exportar un lote muy grande en varios archivos escritos en paralelo, con un manifiesto
+        
+        Las ideas se aplanan una vez y se reparten en fragmentos de como mucho
+        filas_por_fragmento filas (y, con por_nicho, un nicho por fragmento);
+        cada fragmento se escribe en un proceso del pool. El manifiesto JSON
+        lista cada archivo con su rango de IDs, sus nichos y su suma SHA-256
+        para que otras herramientas carguen solo los fragmentos que necesiten.
+        
+        Args:
+            ideas: Lista de ideas
+            nombre_base: Nombre de la carpeta y prefijo de los archivos
+            filas_por_fragmento: Máximo de ideas por archivo
+            por_nicho: Si es True, agrupa las ideas por nicho (los IDs siguen el
+                orden agrupado)
+            formato: "excel" o un formato de EXPORTADORES_TABULARES
+            procesos: Número de procesos (por defecto, uno por CPU; 1 fuerza la
+                escritura en serie)
             
-            # Ajustar anchos de columnas
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
-                    # Ajustes específicos por tipo de columna
-                    if "GUIÓN" in str(column[0].value):
-                        adjusted_width = min(max_length + 10, 150)  # Más ancho para guiones
-                    else:
-                        adjusted_width = min(max_length + 5, 50)  # Más compacto para otros campos
-                    
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+        Returns:
+            Ruta del manifiesto, o None si no se pudo exportar
+        """
+        if formato != "excel" and formato not in EXPORTADORES_TABULARES:
+            print(f"⚠️ Formato de exportación desconocido: {formato}")
+            return None
         
-        print(f"\n📊 EXPORTACIÓN COMPLETADA")
-        print(f"   📁 Archivo: {archivo_completo}")
-        print(f"   📋 3 hojas: Ideas, Guiones, Hashtags y Keywords")
-        print(f"   🎤 {len(ideas)} ideas completas con guiones")
+        if not nombre_base:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre_base = f"ideas_videos_pro_{timestamp}"
         
-        return str(archivo_completo)
+        ideas = list(ideas)
+        if por_nicho:
+            ideas.sort(key=lambda idea: "" if idea.get("nicho") is None else str(idea.get("nicho")))
+        tabla = TablaIdeas(ideas)
+        
+        # Rangos de filas de cada fragmento
+        filas_por_fragmento = max(1, filas_por_fragmento)
+        nichos = tabla.columnas["nicho"]
+        rangos = []
+        inicio = 0
+        while inicio < tabla.filas:
+            fin = min(inicio + filas_por_fragmento, tabla.filas)
+            if por_nicho:
+                # Cortar en el primer cambio de nicho dentro del rango
+                fin = next((fila for fila in range(inicio + 1, fin) if nichos[fila] != nichos[inicio]), fin)
+            rangos.append((inicio, fin))
+            inicio = fin
+        
+        carpeta = self.salida_path / nombre_base
+        carpeta.mkdir(parents=True, exist_ok=True)
+        extension = ".xlsx" if formato == "excel" else EXPORTADORES_TABULARES[formato].extension
+        
+        nombres = []
+        for numero, (inicio, fin) in enumerate(rangos, 1):
+            sufijo = ""
+            if por_nicho:
+                sufijo = "_" + (re.sub(r"[^\w]+", "_", nichos[inicio].lower()).strip("_")[:40] or "sin_nicho")
+            nombres.append(f"{nombre_base}_{numero:03d}{sufijo}{extension}")
+        fragmentos = [tabla.fragmento(inicio, fin) for inicio, fin in rangos]
+        
+        print(f"📦 Exportando {tabla.filas} ideas en {len(rangos)} fragmentos ({formato})...")
+        argumentos = ([carpeta] * len(rangos), nombres, [formato] * len(rangos), fragmentos)
+        procesos = procesos or os.cpu_count() or 1
+        try:
+            # Con un solo proceso el pool solo añade el coste de enviar los fragmentos
+            with TIEMPO_EXPORTACION.medir(formato=f"{formato}_fragmentado"):
+                if procesos == 1 or len(rangos) <= 1:
+                    entradas = list(map(_exportar_fragmento, *argumentos))
+                else:
+                    with ProcessPoolExecutor(max_workers=procesos) as executor:
+                        entradas = list(executor.map(_exportar_fragmento, *argumentos))
+        except ImportError as e:
+            print(f"⚠️ No se pudo exportar a {formato} (falta una dependencia: {e})")
+            return None
+        IDEAS_EXPORTADAS.incrementar(tabla.filas, formato=f"{formato}_fragmentado")
+        
+        ids = tabla.columnas["id"]
+        for entrada, (inicio, fin) in zip(entradas, rangos):
+            entrada["id_inicial"] = ids[inicio]
+            entrada["id_final"] = ids[fin - 1]
+            entrada["nichos"] = sorted(set(nichos[inicio:fin]))
+        
+        manifiesto = {
+            "version": 1,
+            "creado": datetime.now().isoformat(timespec="seconds"),
+            "formato": formato,
+            "particion": "nicho" if por_nicho else "filas",
+            "filas_por_fragmento": filas_por_fragmento,
+            "total_filas": tabla.filas,
+            "fragmentos": entradas
+        }
+        ruta_manifiesto = carpeta / "manifiesto.json"
+        with open(ruta_manifiesto, "w", encoding="utf-8") as archivo:
+            json.dump(manifiesto, archivo, ensure_ascii=False, indent=2)
+        
+        manifiesto_relativo = Path(os.path.relpath(ruta_manifiesto, self.salida_path)).as_posix()
+        for entrada, fragmento in zip(entradas, fragmentos):
+            self.catalogo.registrar(
+                carpeta / entrada["archivo"], formato, resumir_ideas(fragmento), manifiesto=manifiesto_relativo
+            )
+        
+        print(f"\n📊 EXPORTACIÓN FRAGMENTADA COMPLETADA")
+        print(f"   📁 Carpeta: {carpeta}")
+        print(f"   📦 {len(entradas)} fragmentos, {tabla.filas} ideas")
+        print(f"   🧾 Manifiesto: {ruta_manifiesto}")
+        
+        return str(ruta_manifiesto)
+    
+    @perfilado("exportar.subtitulos")
+    def exportar_subtitulos(self, ideas, timelines, nombre_carpeta=None):
+        """Exportar los timelines de subtítulos de cada idea como archivos SRT y LRC
+        
+        Args:
+            ideas: Lista de ideas
+            timelines: Timeline de cada idea (GeneradorFormatos.generar_timelines_lote)
+            nombre_carpeta: Carpeta de salida dentro de salida_path
+            
+        Returns:
+            Ruta de la carpeta con los subtítulos
+        """
+        if not nombre_carpeta:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nombre_carpeta = f"subtitulos_{timestamp}"
+        
+        carpeta = self.salida_path / nombre_carpeta
+        carpeta.mkdir(parents=True, exist_ok=True)
+        
+        with TIEMPO_EXPORTACION.medir(formato="subtitulos"):
+            for i, (idea, timeline) in enumerate(zip(ideas, timelines), 1):
+                titulo = idea.get("titulo", "")
+                nombre = re.sub(r"[^\w]+", "_", titulo.lower()).strip("_")[:50] or "idea"
+                base = carpeta / f"{i:03d}_{nombre}"
+                base.with_suffix(".srt").write_text(formatear_srt(timeline), encoding="utf-8")
+                base.with_suffix(".lrc").write_text(formatear_lrc(timeline, titulo), encoding="utf-8")
+        
+        print(f"   🎞️ Subtítulos SRT/LRC de {len(timelines)} ideas en: {carpeta}")
+        
+        return str(carpeta)
@@ -0,0 +1,292 @@
+"""
+Módulo con los exportadores tabulares (CSV, JSONL y Parquet).
+
+Las ideas se aplanan una sola vez a valores con tipos estables (valores_idea);
+cada exportador escribe esos mismos valores, leídos de la tabla columnar
+(TablaIdeas), en su formato.
+"""
+
+import csv
+import json
+
+# Campos de texto de primer nivel de cada registro
+CAMPOS_TEXTO = (
+    "titulo", "red_social", "tema", "nicho", "duracion", "tipo_contenido", "hook_inicial", "descripcion",
+    "tendencia_origen"
+)
+# Campos de lista de textos de primer nivel
+CAMPOS_LISTA = ("puntos_clave", "hashtags", "elementos_visuales")
+CAMPOS_METADATA_TEXTO = ("fecha_generacion", "categoria", "estilo", "audiencia")
+CAMPOS_METADATA_LISTA = ("palabras_clave", "subtemas")
+
+
+def _texto(valor):
+    """Convierte un valor a texto ("" si falta)"""
+    return "" if valor is None else str(valor)
+
+
+def _lista_textos(valor):
+    """Convierte un valor a lista de textos"""
+    return [str(elemento) for elemento in valor] if valor else []
+
+
+# Campos de las instrucciones de voz de ElevenLabs
+CAMPOS_INSTRUCCIONES_VOZ = ("tono", "velocidad", "emoción", "notas")
+CAMPOS_CONFIGURACION_VOZ = (
+    "stability", "similarity_boost", "style", "use_speaker_boost", "optimize_streaming_latency"
+)
+
+# Columnas planas ("bloque.campo") de un registro, en el orden de valores_idea
+COLUMNAS = (
+    ("id",)
+    + CAMPOS_TEXTO
+    + ("score_calidad",)
+    + CAMPOS_LISTA
+    + tuple(f"metadata.{campo}" for campo in CAMPOS_METADATA_TEXTO + CAMPOS_METADATA_LISTA)
+    + (
+        "formatos_ia.elevenlabs.texto_completo",
+        "formatos_ia.elevenlabs.versiones_cortas.15s",
+        "formatos_ia.elevenlabs.versiones_cortas.30s"
+    )
+    + tuple(f"formatos_ia.elevenlabs.configuracion.{campo}" for campo in CAMPOS_CONFIGURACION_VOZ)
+    + tuple(f"formatos_ia.elevenlabs.instrucciones_voz.{campo}" for campo in CAMPOS_INSTRUCCIONES_VOZ)
+)
+# Columnas cuyos valores son listas de textos
+COLUMNAS_LISTA = frozenset(CAMPOS_LISTA + tuple(f"metadata.{campo}" for campo in CAMPOS_METADATA_LISTA))
+# Posición de cada columna en la tupla de valores
+INDICES_COLUMNAS = {columna: indice for indice, columna in enumerate(COLUMNAS)}
+
+# Tramos de la tupla de valores que forman cada bloque del registro anidado
+_FIN_PRIMER_NIVEL = 1 + len(CAMPOS_TEXTO) + 1 + len(CAMPOS_LISTA)
+_FIN_METADATA = _FIN_PRIMER_NIVEL + len(CAMPOS_METADATA_TEXTO) + len(CAMPOS_METADATA_LISTA)
+_FIN_CONFIGURACION = _FIN_METADATA + 3 + len(CAMPOS_CONFIGURACION_VOZ)
+_CAMPOS_PRIMER_NIVEL = COLUMNAS[:_FIN_PRIMER_NIVEL]
+_CAMPOS_METADATA = CAMPOS_METADATA_TEXTO + CAMPOS_METADATA_LISTA
+
+
+def valores_idea(idea, identificador):
+    """Recorre una idea una sola vez y devuelve sus valores planos con tipos estables
+
+    Args:
+        idea: Idea generada (con formatos_ia si ya se generaron)
+        identificador: ID de la idea en la exportación
+
+    Returns:
+        Tupla con un valor por columna de COLUMNAS (textos, listas de textos
+        y los valores numéricos de score y configuración de voz)
+    """
+    obtener = idea.get
+    metadata = obtener("metadata", {})
+    elevenlabs = obtener("formatos_ia", {}).get("elevenlabs", {})
+    versiones = elevenlabs.get("versiones_cortas", {})
+    configuracion = elevenlabs.get("configuracion", {})
+    instrucciones = elevenlabs.get("instrucciones_voz", {})
+    score = obtener("score_calidad")
+
+    return (
+        identificador,
+        *map(_texto, map(obtener, CAMPOS_TEXTO)),
+        float(score) if score is not None else None,
+        *map(_lista_textos, map(obtener, CAMPOS_LISTA)),
+        *map(_texto, map(metadata.get, CAMPOS_METADATA_TEXTO)),
+        *map(_lista_textos, map(metadata.get, CAMPOS_METADATA_LISTA)),
+        _texto(elevenlabs.get("texto_completo")),
+        _texto(versiones.get("15s")),
+        _texto(versiones.get("30s")),
+        *map(configuracion.get, CAMPOS_CONFIGURACION_VOZ),
+        *map(_texto, map(instrucciones.get, CAMPOS_INSTRUCCIONES_VOZ))
+    )
+
+
+def anidar_valores(valores):
+    """Convierte los valores planos de valores_idea en un registro anidado"""
+    registro = dict(zip(_CAMPOS_PRIMER_NIVEL, valores))
+    registro["metadata"] = dict(zip(_CAMPOS_METADATA, valores[_FIN_PRIMER_NIVEL:_FIN_METADATA]))
+    registro["formatos_ia"] = {
+        "elevenlabs": {
+            "texto_completo": valores[_FIN_METADATA],
+            "versiones_cortas": {"15s": valores[_FIN_METADATA + 1], "30s": valores[_FIN_METADATA + 2]},
+            "configuracion": dict(zip(CAMPOS_CONFIGURACION_VOZ, valores[_FIN_METADATA + 3:_FIN_CONFIGURACION])),
+            "instrucciones_voz": dict(zip(CAMPOS_INSTRUCCIONES_VOZ, valores[_FIN_CONFIGURACION:]))
+        }
+    }
+    return registro
+
+
+def aplanar_idea(idea, identificador):
+    """Convierte una idea en un registro con tipos estables para exportar
+
+    Args:
+        idea: Idea generada (con formatos_ia si ya se generaron)
+        identificador: ID de la idea en la exportación
+
+    Returns:
+        Diccionario con campos de texto, listas y los bloques anidados
+        metadata y formatos_ia.elevenlabs
+    """
+    return anidar_valores(valores_idea(idea, identificador))
+
+
+def aplanar_columnas(registro, prefijo=""):
+    """Aplana un registro anidado a columnas "bloque.campo" con valores escalares"""
+    columnas = {}
+    for campo, valor in registro.items():
+        nombre = f"{prefijo}{campo}"
+        if isinstance(valor, dict):
+            columnas.update(aplanar_columnas(valor, f"{nombre}."))
+        elif isinstance(valor, list):
+            columnas[nombre] = " | ".join(valor)
+        else:
+            columnas[nombre] = valor
+    return columnas
+
+
+class EscritorCSV:
+    """Añade registros a un CSV de uno en uno (la cabecera sale del primer registro)."""
+
+    def __init__(self, ruta):
+        """Constructor de la clase EscritorCSV.
+
+        Args:
+            ruta: Archivo CSV a crear
+        """
+        self._archivo = open(ruta, "w", encoding="utf-8", newline="")
+        self._escritor = None
+
+    def escribir(self, registro):
+        """Añade un registro como una fila"""
+        columnas = aplanar_columnas(registro)
+        if self._escritor is None:
+            self._escritor = csv.DictWriter(self._archivo, fieldnames=list(columnas))
+            self._escritor.writeheader()
+        self._escritor.writerow(columnas)
+
+    def vaciar(self):
+        """Lleva a disco las filas escritas"""
+        self._archivo.flush()
+
+    def cerrar(self):
+        """Cierra el archivo"""
+        self._archivo.close()
+
+
+class EscritorJSONL:
+    """Añade registros a un archivo JSON Lines de uno en uno."""
+
+    def __init__(self, ruta):
+        """Constructor de la clase EscritorJSONL.
+
+        Args:
+            ruta: Archivo JSONL a crear
+        """
+        self._archivo = open(ruta, "w", encoding="utf-8")
+
+    def escribir(self, registro):
+        """Añade un registro como una línea"""
+        self._archivo.write(json.dumps(registro, ensure_ascii=False))
+        self._archivo.write("\n")
+
+    def vaciar(self):
+        """Lleva a disco las líneas escritas"""
+        self._archivo.flush()
+
+    def cerrar(self):
+        """Cierra el archivo"""
+        self._archivo.close()
+
+
+class ExportadorCSV:
+    """Exporta la tabla de ideas a CSV (una columna por campo, listas unidas con " | ")."""
+
+    extension = ".csv"
+    escritor = EscritorCSV
+
+    def escribir(self, tabla, ruta):
+        """Escribe la tabla de ideas (TablaIdeas) en la ruta indicada"""
+        columnas = tabla.columnas_planas()
+        with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(columnas)
+            escritor.writerows(zip(*columnas.values()))
+
+
+class ExportadorJSONL:
+    """Exporta la tabla de ideas a JSON Lines (un objeto anidado por línea)."""
+
+    extension = ".jsonl"
+    escritor = EscritorJSONL
+
+    def escribir(self, tabla, ruta):
+        """Escribe la tabla de ideas (TablaIdeas) en la ruta indicada"""
+        escritor = self.escritor(ruta)
+        try:
+            for registro in tabla.registros():
+                escritor.escribir(registro)
+        finally:
+            escritor.cerrar()
+
+
+class ExportadorParquet:
+    """Exporta la tabla de ideas a Parquet con metadata y formatos_ia como columnas tipadas (struct/list).
+
+    Requiere pyarrow.
+    """
+
+    extension = ".parquet"
+
+    def esquema(self):
+        """Esquema de pyarrow de los registros de aplanar_idea"""
+        import pyarrow as pa
+
+        textos = pa.list_(pa.string())
+        return pa.schema(
+            [("id", pa.int64())]
+            + [(campo, pa.string()) for campo in CAMPOS_TEXTO]
+            + [("score_calidad", pa.float64())]
+            + [(campo, textos) for campo in CAMPOS_LISTA]
+            + [("metadata", pa.struct(
+                [(campo, pa.string()) for campo in CAMPOS_METADATA_TEXTO]
+                + [(campo, textos) for campo in CAMPOS_METADATA_LISTA]
+            ))]
+            + [("formatos_ia", pa.struct([("elevenlabs", pa.struct([
+                ("texto_completo", pa.string()),
+                ("versiones_cortas", pa.struct([("15s", pa.string()), ("30s", pa.string())])),
+                ("configuracion", pa.struct([
+                    ("stability", pa.float64()),
+                    ("similarity_boost", pa.float64()),
+                    ("style", pa.float64()),
+                    ("use_speaker_boost", pa.bool_()),
+                    ("optimize_streaming_latency", pa.int64())
+                ])),
+                ("instrucciones_voz", pa.struct(
+                    [(campo, pa.string()) for campo in CAMPOS_INSTRUCCIONES_VOZ]
+                ))
+            ]))]))]
+        )
+
+    def _arreglo(self, tabla, nombre, tipo):
+        """Arreglo de pyarrow de una columna; los struct se montan con las columnas de sus campos"""
+        import pyarrow as pa
+
+        if pa.types.is_struct(tipo):
+            campos = [tipo.field(indice) for indice in range(tipo.num_fields)]
+            hijos = [self._arreglo(tabla, f"{nombre}.{campo.name}", campo.type) for campo in campos]
+            return pa.StructArray.from_arrays(hijos, fields=campos)
+        return pa.array(tabla.columnas[nombre], type=tipo)
+
+    def escribir(self, tabla, ruta):
+        """Escribe la tabla de ideas (TablaIdeas) en la ruta indicada, columna a columna"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        esquema = self.esquema()
+        arreglos = [self._arreglo(tabla, campo.name, campo.type) for campo in esquema]
+        pq.write_table(pa.Table.from_arrays(arreglos, schema=esquema), str(ruta))
+
+
+# Exportadores disponibles por nombre de formato
+EXPORTADORES_TABULARES = {
+    "csv": ExportadorCSV,
+    "jsonl": ExportadorJSONL,
+    "parquet": ExportadorParquet
+}
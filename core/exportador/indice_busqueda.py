@@ -0,0 +1,352 @@
+"""
+Módulo con el índice de búsqueda de texto completo sobre las exportaciones.
+
+Las ideas de cada archivo del catálogo de exportaciones se guardan en una base
+SQLite con un índice FTS5 (títulos, hooks, descripciones, hashtags y guiones).
+El índice se actualiza de forma incremental: solo se leen los archivos nuevos
+o modificados desde la última actualización, y una misma idea exportada en
+varios archivos o formatos se indexa una sola vez.
+"""
+
+import csv
+import hashlib
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+from core.exportador.catalogo_exportaciones import CatalogoExportaciones
+
+NOMBRE_INDICE = "indice_busqueda.sqlite"
+
+# Orden en que se leen los formatos de una misma exportación (los más rápidos primero)
+PRIORIDAD_FORMATOS = {"jsonl": 0, "csv": 1, "parquet": 2, "excel": 3}
+
+# Peso de cada columna del índice en la relevancia (bm25)
+PESOS_COLUMNAS = (10.0, 5.0, 2.0, 3.0, 1.0)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ideas (
+    rowid INTEGER PRIMARY KEY,
+    huella TEXT UNIQUE,
+    archivo TEXT,
+    id_idea INTEGER,
+    titulo TEXT,
+    hook_inicial TEXT,
+    descripcion TEXT,
+    hashtags TEXT,
+    guion TEXT,
+    nicho TEXT COLLATE NOCASE,
+    red_social TEXT COLLATE NOCASE,
+    fecha TEXT
+);
+CREATE INDEX IF NOT EXISTS ideas_archivo ON ideas (archivo);
+CREATE INDEX IF NOT EXISTS ideas_nicho ON ideas (nicho);
+CREATE INDEX IF NOT EXISTS ideas_red_social ON ideas (red_social);
+CREATE INDEX IF NOT EXISTS ideas_fecha ON ideas (fecha);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS ideas_fts USING fts5(
+    titulo, hook_inicial, descripcion, hashtags, guion,
+    content='ideas', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS ideas_ai AFTER INSERT ON ideas BEGIN
+    INSERT INTO ideas_fts (rowid, titulo, hook_inicial, descripcion, hashtags, guion)
+    VALUES (new.rowid, new.titulo, new.hook_inicial, new.descripcion, new.hashtags, new.guion);
+END;
+CREATE TRIGGER IF NOT EXISTS ideas_ad AFTER DELETE ON ideas BEGIN
+    INSERT INTO ideas_fts (ideas_fts, rowid, titulo, hook_inicial, descripcion, hashtags, guion)
+    VALUES ('delete', old.rowid, old.titulo, old.hook_inicial, old.descripcion, old.hashtags, old.guion);
+END;
+
+-- Archivos en los que aparece cada idea (la fila de ideas apunta al primero)
+CREATE TABLE IF NOT EXISTS apariciones (
+    huella TEXT,
+    archivo TEXT,
+    id_idea INTEGER,
+    PRIMARY KEY (huella, archivo)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS apariciones_archivo ON apariciones (archivo);
+
+-- Archivos indexados; "hermano" es el archivo de la misma exportación (en
+-- otro formato) cuyas ideas se reutilizaron sin volver a leerlo
+CREATE TABLE IF NOT EXISTS archivos (
+    archivo TEXT PRIMARY KEY,
+    base TEXT,
+    tamano INTEGER,
+    modificado REAL,
+    filas INTEGER,
+    hermano TEXT
+);
+"""
+
+
+def _filas_jsonl(ruta):
+    """Filas (id, título, hook, descripción, hashtags, guión, nicho, red) de un JSONL"""
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                continue
+            elevenlabs = registro.get("formatos_ia", {}).get("elevenlabs", {})
+            yield (
+                registro.get("id"), registro.get("titulo", ""), registro.get("hook_inicial", ""),
+                registro.get("descripcion", ""), " ".join(registro.get("hashtags", [])),
+                elevenlabs.get("texto_completo", ""), registro.get("nicho", ""), registro.get("red_social", "")
+            )
+
+
+def _filas_csv(ruta):
+    """Filas de un CSV de formatos_tabulares"""
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        for registro in csv.DictReader(archivo):
+            yield (
+                int(registro["id"]) if registro.get("id") else None, registro.get("titulo", ""),
+                registro.get("hook_inicial", ""), registro.get("descripcion", ""),
+                registro.get("hashtags", "").replace(" | ", " "),
+                registro.get("formatos_ia.elevenlabs.texto_completo", ""),
+                registro.get("nicho", ""), registro.get("red_social", "")
+            )
+
+
+def _filas_parquet(ruta):
+    """Filas de un Parquet de formatos_tabulares (requiere pyarrow)"""
+    import pyarrow.parquet as pq
+
+    tabla = pq.read_table(str(ruta), columns=[
+        "id", "titulo", "hook_inicial", "descripcion", "hashtags", "nicho", "red_social", "formatos_ia"
+    ])
+    for registro in tabla.to_pylist():
+        yield (
+            registro["id"], registro["titulo"], registro["hook_inicial"], registro["descripcion"],
+            " ".join(registro["hashtags"] or []), registro["formatos_ia"]["elevenlabs"]["texto_completo"],
+            registro["nicho"], registro["red_social"]
+        )
+
+
+def _filas_excel(catalogo, ruta):
+    """Filas de un Excel de ExportadorIdeas (se leen las tres hojas a la vez, en solo lectura)"""
+    hojas = zip(
+        catalogo.leer_hoja(ruta, "Ideas"),
+        catalogo.leer_hoja(ruta, "Guiones"),
+        catalogo.leer_hoja(ruta, "Hashtags y Keywords")
+    )
+    for idea, guion, hashtags in hojas:
+        yield (
+            idea.get("ID"), idea.get("TÍTULO") or "", idea.get("HOOK INICIAL") or "", idea.get("DESCRIPCIÓN") or "",
+            hashtags.get("HASHTAGS") or "", guion.get("GUIÓN COMPLETO") or "",
+            idea.get("NICHO") or "", idea.get("RED SOCIAL") or ""
+        )
+
+
+def consulta_fts(texto):
+    """Convierte un texto libre en una consulta FTS5 (todas las palabras, con prefijo)"""
+    palabras = re.findall(r"\w+", texto.lower())
+    return " ".join(f'"{palabra}"*' for palabra in palabras)
+
+
+class IndiceBusqueda:
+    """Índice de texto completo (SQLite FTS5) de las ideas de todas las exportaciones."""
+
+    def __init__(self, carpeta, ruta_indice=None):
+        """Constructor de la clase IndiceBusqueda.
+
+        Args:
+            carpeta: Carpeta de salida de las exportaciones (la del catálogo)
+            ruta_indice: Archivo SQLite del índice (por defecto, dentro de la carpeta)
+        """
+        self.catalogo = CatalogoExportaciones(carpeta)
+        self.ruta = Path(ruta_indice) if ruta_indice else Path(carpeta) / NOMBRE_INDICE
+        self._conexion = sqlite3.connect(str(self.ruta))
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.executescript(_ESQUEMA)
+
+    def indexar_filas(self, archivo, filas, fecha=""):
+        """Añade al índice las ideas de un archivo
+
+        Args:
+            archivo: Nombre del archivo (relativo a la carpeta de salida)
+            filas: Iterable de tuplas (id, título, hook, descripción, hashtags,
+                guión, nicho, red social)
+            fecha: Fecha de la exportación (ISO)
+
+        Returns:
+            Número de filas leídas
+        """
+        registros = [
+            (hashlib.sha1(f"{titulo}\x00{guion}".encode("utf-8")).hexdigest(),
+             archivo, id_idea, titulo, hook, descripcion, hashtags, guion, nicho, red, fecha)
+            for id_idea, titulo, hook, descripcion, hashtags, guion, nicho, red in filas
+        ]
+
+        # La misma idea en otro archivo o formato solo se indexa una vez
+        self._conexion.executemany(
+            "INSERT OR IGNORE INTO ideas (huella, archivo, id_idea, titulo, hook_inicial, descripcion, hashtags, "
+            "guion, nicho, red_social, fecha) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            registros
+        )
+        self._conexion.executemany(
+            "INSERT OR IGNORE INTO apariciones (huella, archivo, id_idea) VALUES (?, ?, ?)",
+            (registro[:3] for registro in registros)
+        )
+        return len(registros)
+
+    def indexar_tabla(self, tabla, archivo, fecha=""):
+        """Añade al índice las ideas de una TablaIdeas (sin leer ningún archivo)"""
+        columnas = tabla.columnas
+        return self.indexar_filas(archivo, zip(
+            columnas["id"], columnas["titulo"], columnas["hook_inicial"], columnas["descripcion"],
+            tabla.unida("hashtags", " "), columnas["formatos_ia.elevenlabs.texto_completo"],
+            columnas["nicho"], columnas["red_social"]
+        ), fecha)
+
+    def _filas_archivo(self, entrada, ruta):
+        """Filas de un archivo exportado según su formato"""
+        formato = entrada.get("formato")
+        if formato == "jsonl":
+            return _filas_jsonl(ruta)
+        if formato == "csv":
+            return _filas_csv(ruta)
+        if formato == "parquet":
+            return _filas_parquet(ruta)
+        return _filas_excel(self.catalogo, ruta)
+
+    def actualizar(self):
+        """Indexa los archivos del catálogo nuevos o modificados y quita los que ya no existen
+
+        Returns:
+            Número de archivos leídos
+        """
+        entradas = self.catalogo.entradas()
+        entradas.sort(key=lambda entrada: (entrada.get("fecha", ""), PRIORIDAD_FORMATOS.get(entrada.get("formato"), 9)))
+        vigentes = {entrada["archivo"]: entrada for entrada in entradas}
+        leidos = 0
+
+        with self._conexion:
+            for (archivo,) in self._conexion.execute("SELECT archivo FROM archivos").fetchall():
+                if archivo not in vigentes:
+                    self._eliminar_archivo(archivo)
+
+            for archivo, entrada in vigentes.items():
+                estado = self.catalogo.ruta_archivo(entrada).stat()
+                anterior = self._conexion.execute(
+                    "SELECT tamano, modificado FROM archivos WHERE archivo = ?", (archivo,)
+                ).fetchone()
+                if anterior == (estado.st_size, estado.st_mtime):
+                    continue
+                if anterior:
+                    self._eliminar_archivo(archivo)
+
+                # Otro formato de la misma exportación ya leído: son las mismas ideas
+                base = archivo.rsplit(".", 1)[0]
+                hermano = self._conexion.execute(
+                    "SELECT archivo, filas FROM archivos WHERE base = ? AND filas = ? AND hermano IS NULL",
+                    (base, entrada.get("filas"))
+                ).fetchone()
+
+                if hermano is not None:
+                    hermano, filas = hermano
+                else:
+                    try:
+                        filas = self.indexar_filas(
+                            archivo, self._filas_archivo(entrada, self.catalogo.ruta_archivo(entrada)),
+                            entrada.get("fecha", "")
+                        )
+                        leidos += 1
+                    except Exception as e:
+                        print(f"⚠️ No se pudo indexar {archivo}: {e}")
+                        continue
+
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO archivos (archivo, base, tamano, modificado, filas, hermano) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (archivo, base, estado.st_size, estado.st_mtime, filas, hermano)
+                )
+
+        return leidos
+
+    def _eliminar_archivo(self, archivo):
+        """Quita un archivo del índice
+
+        Las ideas que también aparecen en otros archivos se conservan y pasan a
+        apuntar a uno de ellos; los archivos que reutilizaban sus ideas se
+        marcan para volver a leerse.
+        """
+        ejecutar = self._conexion.execute
+        ejecutar("DELETE FROM apariciones WHERE archivo = ?", (archivo,))
+        ejecutar(
+            "DELETE FROM ideas WHERE archivo = ? AND NOT EXISTS "
+            "(SELECT 1 FROM apariciones a WHERE a.huella = ideas.huella)",
+            (archivo,)
+        )
+        ejecutar(
+            "UPDATE ideas SET (archivo, id_idea) = "
+            "(SELECT a.archivo, a.id_idea FROM apariciones a WHERE a.huella = ideas.huella LIMIT 1) "
+            "WHERE archivo = ?",
+            (archivo,)
+        )
+        ejecutar("DELETE FROM archivos WHERE archivo = ? OR hermano = ?", (archivo, archivo))
+
+    def buscar(self, texto, nicho=None, red_social=None, desde=None, hasta=None, limite=20, sintaxis_fts=False):
+        """Busca ideas por texto, ordenadas por relevancia
+
+        Args:
+            texto: Palabras a buscar (todas deben aparecer; se admiten prefijos)
+            nicho: Filtrar por nicho
+            red_social: Filtrar por red social
+            desde: Fecha mínima de exportación (ISO, p. ej. "2025-01-01")
+            hasta: Fecha máxima de exportación (ISO)
+            limite: Número máximo de resultados
+            sintaxis_fts: Si es True, texto se usa tal cual como consulta FTS5
+
+        Returns:
+            Lista de diccionarios con archivo, id, título, nicho, red social,
+            fecha, relevancia y un fragmento con las coincidencias
+        """
+        consulta = texto if sintaxis_fts else consulta_fts(texto)
+        if not consulta:
+            return []
+
+        condiciones = ["ideas_fts MATCH ?"]
+        parametros = [consulta]
+        for columna, valor in (("i.nicho = ?", nicho), ("i.red_social = ?", red_social)):
+            if valor:
+                condiciones.append(columna)
+                parametros.append(valor)
+        if desde:
+            condiciones.append("i.fecha >= ?")
+            parametros.append(desde)
+        if hasta:
+            # Las fechas son ISO con hora: una fecha sin hora incluye todo ese día
+            condiciones.append("i.fecha <= ?")
+            parametros.append(hasta + "T23:59:59" if len(hasta) == 10 else hasta)
+        parametros.append(limite)
+
+        pesos = ", ".join(str(peso) for peso in PESOS_COLUMNAS)
+        filas = self._conexion.execute(
+            f"SELECT i.archivo, i.id_idea, i.titulo, i.nicho, i.red_social, i.fecha, bm25(ideas_fts, {pesos}), "
+            "snippet(ideas_fts, -1, '[', ']', '…', 12) "
+            "FROM ideas_fts JOIN ideas i ON i.rowid = ideas_fts.rowid "
+            f"WHERE {' AND '.join(condiciones)} ORDER BY bm25(ideas_fts, {pesos}) LIMIT ?",
+            parametros
+        ).fetchall()
+
+        return [
+            {
+                "archivo": archivo, "id": id_idea, "titulo": titulo, "nicho": nicho_idea, "red_social": red,
+                "fecha": fecha, "relevancia": -rango, "fragmento": fragmento
+            }
+            for archivo, id_idea, titulo, nicho_idea, red, fecha, rango, fragmento in filas
+        ]
+
+    def estadisticas(self):
+        """Ideas y archivos indexados"""
+        ideas = self._conexion.execute("SELECT COUNT(*) FROM ideas").fetchone()[0]
+        archivos = self._conexion.execute("SELECT COUNT(*) FROM archivos").fetchone()[0]
+        return {"ideas": ideas, "archivos": archivos}
+
+    def cerrar(self):
+        """Cierra la base de datos del índice"""
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
@@ -0,0 +1,159 @@
+"""
+Módulo con la tabla columnar de ideas que comparten las hojas del Excel y los
+exportadores tabulares.
+
+Cada idea se recorre una sola vez (valores_idea) y sus valores se trasponen a
+una lista por columna; las listas se unen una sola vez por separador y las
+hojas y exportadores leen esas mismas columnas.
+"""
+
+from itertools import count
+
+import pandas as pd
+
+from core.exportador.formatos_tabulares import (
+    COLUMNAS, COLUMNAS_LISTA, INDICES_COLUMNAS, anidar_valores, valores_idea
+)
+
+# Hojas del Excel, en orden
+HOJAS_EXCEL = ('Ideas', 'Guiones', 'Hashtags y Keywords')
+
+# Columnas de cada hoja: (cabecera, columna de la tabla, separador de las listas)
+COLUMNAS_HOJAS = {
+    'Ideas': (
+        ("ID", "id", None),
+        ("TÍTULO", "titulo", None),
+        ("RED SOCIAL", "red_social", None),
+        ("TEMA", "tema", None),
+        ("NICHO", "nicho", None),
+        ("DURACIÓN", "duracion", None),
+        ("HOOK INICIAL", "hook_inicial", None),
+        ("PALABRAS CLAVE", "metadata.palabras_clave", " | "),
+        ("ESCENAS RECOMENDADAS", "elementos_visuales", " | "),
+        ("DESCRIPCIÓN", "descripcion", None)
+    ),
+    'Guiones': (
+        ("ID", "id", None),
+        ("TÍTULO", "titulo", None),
+        ("GUIÓN COMPLETO", "formatos_ia.elevenlabs.texto_completo", None),
+        ("VERSIÓN CORTA (15s)", "formatos_ia.elevenlabs.versiones_cortas.15s", None),
+        ("VERSIÓN CORTA (30s)", "formatos_ia.elevenlabs.versiones_cortas.30s", None),
+        ("ESTILO VOZ", "formatos_ia.elevenlabs.instrucciones_voz.tono", None),
+        ("EMOCIÓN", "formatos_ia.elevenlabs.instrucciones_voz.emoción", None),
+        ("NOTAS ADICIONALES", "formatos_ia.elevenlabs.instrucciones_voz.notas", None)
+    ),
+    'Hashtags y Keywords': (
+        ("ID", "id", None),
+        ("TÍTULO", "titulo", None),
+        ("HASHTAGS", "hashtags", " "),
+        ("PALABRAS CLAVE", "metadata.palabras_clave", " | "),
+        ("TEMA PRINCIPAL", "tema", None),
+        ("SUBTEMAS", "metadata.subtemas", " | ")
+    )
+}
+
+# Las mismas columnas con la posición de cada una en la tupla de valores
+_INDICES_HOJAS = tuple(
+    tuple((cabecera, INDICES_COLUMNAS[columna], separador) for cabecera, columna, separador in COLUMNAS_HOJAS[hoja])
+    for hoja in HOJAS_EXCEL
+)
+
+
+def filas_hojas(valores):
+    """Fila de cada hoja del Excel a partir de los valores de una idea
+
+    Args:
+        valores: Tupla devuelta por valores_idea
+
+    Returns:
+        Tupla con un diccionario cabecera -> valor por hoja, en el orden de HOJAS_EXCEL
+    """
+    unidas = {}
+    filas = []
+    for columnas_hoja in _INDICES_HOJAS:
+        fila = {}
+        for cabecera, indice, separador in columnas_hoja:
+            valor = valores[indice]
+            if separador is not None:
+                # Las listas compartidas entre hojas se unen una sola vez
+                clave = (indice, separador)
+                if clave not in unidas:
+                    unidas[clave] = separador.join(valor)
+                valor = unidas[clave]
+            fila[cabecera] = valor
+        filas.append(fila)
+    return tuple(filas)
+
+
+class TablaIdeas:
+    """Ideas aplanadas en columnas, compartidas por las hojas del Excel y los exportadores."""
+
+    def __init__(self, ideas, primer_id=1):
+        """Constructor de la clase TablaIdeas.
+
+        Args:
+            ideas: Lista (o iterador) de ideas
+            primer_id: ID de la primera idea
+        """
+        # Un recorrido por idea; zip traspone las filas de valores a columnas
+        filas = map(valores_idea, ideas, count(primer_id))
+        columnas = [list(columna) for columna in zip(*filas)] or [[] for _ in COLUMNAS]
+
+        self.filas = len(columnas[0])
+        self.columnas = dict(zip(COLUMNAS, columnas))
+        self._unidas = {}
+
+    @classmethod
+    def desde_columnas(cls, columnas):
+        """Crea una tabla a partir de columnas ya aplanadas (nombre -> lista)"""
+        tabla = cls.__new__(cls)
+        tabla.columnas = dict(columnas)
+        tabla.filas = len(tabla.columnas["id"])
+        tabla._unidas = {}
+        return tabla
+
+    def fragmento(self, inicio, fin):
+        """Tabla con las filas [inicio, fin) de esta tabla (conserva los IDs)"""
+        return self.desde_columnas({nombre: columna[inicio:fin] for nombre, columna in self.columnas.items()})
+
+    def unida(self, nombre, separador=" | "):
+        """Columna de listas unidas en textos (se calcula una vez por separador)"""
+        clave = (nombre, separador)
+        if clave not in self._unidas:
+            self._unidas[clave] = list(map(separador.join, self.columnas[nombre]))
+        return self._unidas[clave]
+
+    def columnas_planas(self):
+        """Columnas con valores escalares (listas unidas con " | "), como las escribe el CSV"""
+        return {
+            nombre: self.unida(nombre) if nombre in COLUMNAS_LISTA else columna
+            for nombre, columna in self.columnas.items()
+        }
+
+    def registros(self):
+        """Genera el registro anidado de cada idea (el de aplanar_idea)"""
+        for valores in zip(*self.columnas.values()):
+            yield anidar_valores(valores)
+
+    def filas_hojas(self):
+        """Genera, para cada idea, su fila en cada hoja del Excel (como filas_hojas)"""
+        hojas = [
+            [
+                (cabecera, self.columnas[columna] if separador is None else self.unida(columna, separador))
+                for cabecera, columna, separador in COLUMNAS_HOJAS[nombre]
+            ]
+            for nombre in HOJAS_EXCEL
+        ]
+        for fila in range(self.filas):
+            yield tuple({cabecera: columna[fila] for cabecera, columna in hoja} for hoja in hojas)
+
+    def hoja(self, nombre):
+        """DataFrame de una hoja del Excel construido sobre las columnas de la tabla"""
+        return pd.DataFrame({
+            cabecera: self.columnas[columna] if separador is None else self.unida(columna, separador)
+            for cabecera, columna, separador in COLUMNAS_HOJAS[nombre]
+        })
+
+    def hojas(self):
+        """Diccionario nombre de hoja -> DataFrame"""
+        return {nombre: self.hoja(nombre) for nombre in HOJAS_EXCEL}
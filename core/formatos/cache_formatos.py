@@ -0,0 +1,158 @@
+"""
+Módulo con la caché de formatos direccionada por contenido.
+
+Los formatos de una idea solo dependen de unos pocos campos (título,
+descripción, puntos clave...), así que se guardan bajo el hash de esos campos
+y de la versión del formateador. Hay un nivel en memoria (LRU) y un nivel
+opcional en disco (un archivo SQLite por versión) que sobrevive entre
+ejecuciones.
+
+Los dos niveles guardan los valores serializados con pickle, así que cada
+lectura devuelve una copia propia (los bloques compartido vuelven a
+internarse) y una idea no puede modificar los formatos de otra. Leer un
+valor así cuesta bastante menos que volver a generar los guiones y los
+timelines, pero no es gratis: en una ejecución única no compensa, y main.py
+solo activa la caché (en disco) con --cache-formatos.
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+
+# Campos de la idea de los que dependen los formatos
+CAMPOS_FORMATOS = (
+    "titulo", "descripcion", "puntos_clave", "tipo_contenido", "nicho", "tema", "hook_inicial", "duracion",
+    "red_social"
+)
+
+# Escrituras en disco agrupadas en cada transacción
+ESCRITURAS_POR_TRANSACCION = 500
+
+
+def huella_archivos(*rutas):
+    """Hash del contenido de varios archivos (para versionar la caché con el código)"""
+    huella = hashlib.sha1()
+    for ruta in rutas:
+        try:
+            huella.update(Path(ruta).read_bytes())
+        except OSError:
+            huella.update(str(ruta).encode("utf-8"))
+    return huella.hexdigest()[:12]
+
+
+class CacheFormatos:
+    """Caché de formatos generados, indexada por el hash de los campos de la idea.
+
+    obtener devuelve siempre una copia nueva del valor guardado, de modo que
+    las ideas con el mismo contenido no comparten (ni se modifican) sus formatos.
+    """
+
+    def __init__(self, version, directorio=None, max_elementos=50000):
+        """Constructor de la clase CacheFormatos.
+
+        Args:
+            version: Versión del formateador; al cambiar, las entradas anteriores
+                dejan de usarse
+            directorio: Carpeta opcional para el nivel en disco
+            max_elementos: Entradas máximas del nivel en memoria
+        """
+        self.version = version
+        self.max_elementos = max_elementos
+        self._memoria = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self._escrituras = 0
+        
+        self._disco = None
+        if directorio:
+            try:
+                Path(directorio).mkdir(parents=True, exist_ok=True)
+                self._disco = sqlite3.connect(
+                    str(Path(directorio) / f"formatos_{version}.sqlite"), check_same_thread=False, isolation_level=None
+                )
+                self._disco.execute("PRAGMA journal_mode=WAL")
+                self._disco.execute("PRAGMA synchronous=OFF")
+                self._disco.execute("CREATE TABLE IF NOT EXISTS formatos_pickle (clave TEXT PRIMARY KEY, valor BLOB)")
+            except sqlite3.Error as e:
+                print(f"⚠️ No se pudo abrir la caché de formatos en disco: {e}")
+                self._disco = None
+
+    def clave(self, nombre, idea):
+        """Clave de un formato de una idea: hash de la versión, el formato y los campos usados"""
+        campos = [[campo, idea[campo]] for campo in CAMPOS_FORMATOS if campo in idea]
+        contenido = json.dumps([self.version, nombre, campos], ensure_ascii=False, default=str)
+        return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+
+    def obtener(self, clave):
+        """Devuelve una copia del valor guardado o None si no está en caché"""
+        datos = self._memoria.get(clave)
+        if datos is not None:
+            self._memoria.move_to_end(clave)
+        elif self._disco is not None:
+            try:
+                fila = self._disco.execute("SELECT valor FROM formatos_pickle WHERE clave = ?", (clave,)).fetchone()
+            except sqlite3.Error:
+                fila = None
+            if fila:
+                datos = fila[0]
+                self._guardar_memoria(clave, datos)
+
+        if datos is not None:
+            try:
+                valor = pickle.loads(datos)
+            except Exception:
+                valor = None
+            if valor is not None:
+                self.aciertos += 1
+                return valor
+
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, valor):
+        """Guarda un valor en memoria y, si está configurado, en disco"""
+        try:
+            datos = pickle.dumps(valor, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"⚠️ No se pudo guardar el formato en caché: {e}")
+            return
+        self._guardar_memoria(clave, datos)
+
+        if self._disco is not None:
+            try:
+                if not self._disco.in_transaction:
+                    self._disco.execute("BEGIN")
+                self._disco.execute("INSERT OR REPLACE INTO formatos_pickle (clave, valor) VALUES (?, ?)", (clave, datos))
+                self._escrituras += 1
+                if self._escrituras % ESCRITURAS_POR_TRANSACCION == 0:
+                    self._disco.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ No se pudo guardar el formato en la caché de disco: {e}")
+
+    def _guardar_memoria(self, clave, datos):
+        """Añade un valor serializado al nivel en memoria descartando el menos usado"""
+        self._memoria[clave] = datos
+        self._memoria.move_to_end(clave)
+        if len(self._memoria) > self.max_elementos:
+            self._memoria.popitem(last=False)
+
+    def limpiar(self):
+        """Vacía el nivel en memoria"""
+        self._memoria.clear()
+
+    def cerrar(self):
+        """Confirma las escrituras pendientes y cierra el nivel en disco"""
+        if self._disco is not None:
+            try:
+                self._disco.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ No se pudo guardar la caché de formatos en disco: {e}")
+            self._disco.close()
+            self._disco = None
+
+    def estadisticas(self):
+        """Aciertos, fallos y entradas en memoria"""
+        return {"aciertos": self.aciertos, "fallos": self.fallos, "en_memoria": len(self._memoria)}
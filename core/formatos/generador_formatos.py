@@ -2,28 +2,249 @@
 Módulo para generar formatos específicos para diferentes servicios de IA.
 """
 
+import inspect
+import os
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from core.config.configuracion_contenido import ConfiguracionContenido, rango_duracion, segundos_duracion
+from core.formatos import indice_palabras, plantillas_guion, subtitulos
+from core.formatos.cache_formatos import CacheFormatos, huella_archivos
+from core.formatos.indice_palabras import (
+    categorias_palabras, categorias_subcadenas, SUBCADENAS_IMPACTO, SUBCADENAS_CONSECUENCIA,
+    DETALLE_ABSOLUTO, DETALLE_PATRON,
+    LECCION_APRENDER, LECCION_EXITO, LECCION_OBSTACULO,
+    EXPLICACION_INICIO, EXPLICACION_OPTIMIZAR, EXPLICACION_EVITAR,
+    DIFERENCIADOR_UNICO, DIFERENCIADOR_RAPIDO, DIFERENCIADOR_FACIL,
+    BENEFICIO_TIEMPO, BENEFICIO_DINERO, BENEFICIO_CALIDAD,
+    IMPACTO_ERROR, IMPACTO_SECRETO, IMPACTO_DESCUBRIMIENTO,
+    CONSECUENCIA_BENEFICIO, CONSECUENCIA_ESTRATEGIA, CONSECUENCIA_EVITAR
+)
+from core.formatos.plantillas_guion import GUION_NARRATIVO, GUION_EDUCATIVO
+from core.formatos.registro_formatos import FormatosIA
+from core.formatos.subtitulos import calcular_timelines
+from core.generador.idea import compartido
+from core.monitorizacion.perfilador import perfilado, tramo
+
+# Formatos que se generan por adelantado en los procesos del pool; el resto
+# se calcula en el proceso principal solo si alguien los lee
+FORMATOS_PRECALCULADOS = ("elevenlabs",)
+
+# Ideas a partir de las cuales compensa el pool de procesos. Medido con ideas
+# sintéticas como las de GeneradorIdeas: en serie cada idea cuesta ~20-35 µs, y con el
+# pool el proceso principal sigue pagando ~10-17 µs por idea en serializar el
+# envío y el resultado, más ~25 ms de arranque; el punto de equilibrio está en
+# ~1.300 ideas aunque haya CPUs libres, y con una sola CPU nunca compensa.
+MIN_IDEAS_POOL = 2000
+
+
+def _usar_pool(procesos, cantidad):
+    """Indica si compensa formatear `cantidad` ideas en un pool de `procesos` procesos"""
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    return procesos > 1 and cantidad >= MIN_IDEAS_POOL
+
+
+def _generar_formatos_chunk(clase_formateador, ideas, formatos=FORMATOS_PRECALCULADOS):
+    """Genera los formatos indicados de un bloque de ideas dentro de un proceso trabajador"""
+    formateador = clase_formateador()
+    return [formateador.generar_formatos_ia_especificos(idea).precalcular(formatos) for idea in ideas]
+
+
+class LoteFormatos:
+    """Genera formatos en un pool de procesos a medida que se aceptan ideas.
+    
+    Las ideas se acumulan hasta reunir MIN_IDEAS_POOL; a partir de ahí se
+    envían al pool en bloques de tamano_chunk según se completan, y finalizar()
+    envía el resto, espera los resultados y asigna idea["formatos_ia"] a cada
+    idea. Los procesos solo generan los formatos indicados; el resto se calcula
+    bajo demanda al leerlos. Si el lote no llega a MIN_IDEAS_POOL ideas (o con
+    procesos=1), no se crea el pool y los formatos se calculan bajo demanda en
+    el proceso actual.
+    """
+    
+    def __init__(self, formateador, procesos=None, tamano_chunk=200, formatos=FORMATOS_PRECALCULADOS):
+        """Constructor de la clase LoteFormatos.
+        
+        Args:
+            formateador: Instancia de GeneradorFormatos cuya clase usan los procesos
+            procesos: Número de procesos del pool (por defecto, uno por CPU;
+                1 fuerza la ejecución en serie)
+            tamano_chunk: Ideas enviadas a cada proceso en un mismo bloque
+            formatos: Nombres de los formatos que generan los procesos
+        """
+        self.formateador = formateador
+        self.procesos = procesos
+        self.tamano_chunk = max(1, tamano_chunk)
+        self.formatos = tuple(formatos)
+        self._executor = None
+        self._pendientes = []
+        self._envios = []
+    
+    def agregar(self, idea):
+        """Añade una idea aceptada al lote"""
+        valores = self.formateador.formatos_en_cache(idea, self.formatos)
+        if valores is not None:
+            # Mismo contenido ya formateado: no hace falta enviarlo al pool
+            idea["formatos_ia"] = FormatosIA(self.formateador, idea, valores)
+            return
+        
+        self._pendientes.append(idea)
+        if self._executor is None and not _usar_pool(self.procesos, len(self._pendientes)):
+            return
+        if len(self._pendientes) >= self.tamano_chunk:
+            self._enviar_pendientes()
+    
+    def _enviar_pendientes(self):
+        """Envía al pool las ideas pendientes en bloques de tamano_chunk"""
+        if not self._pendientes:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.procesos)
+        
+        pendientes = self._pendientes
+        self._pendientes = []
+        for inicio in range(0, len(pendientes), self.tamano_chunk):
+            bloque = pendientes[inicio:inicio + self.tamano_chunk]
+            future = self._executor.submit(_generar_formatos_chunk, type(self.formateador), bloque, self.formatos)
+            self._envios.append((bloque, future))
+    
+    @perfilado("formatos.lote")
+    def finalizar(self):
+        """Espera a todos los bloques y asigna los formatos a cada idea"""
+        try:
+            if self._executor is None:
+                # Lote pequeño (o en serie): no compensa arrancar procesos
+                for idea in self._pendientes:
+                    idea["formatos_ia"] = self.formateador.generar_formatos_ia_especificos(idea)
+                self._pendientes = []
+                return
+            
+            self._enviar_pendientes()
+            for bloque, future in self._envios:
+                for idea, valores in zip(bloque, future.result()):
+                    self.formateador.guardar_en_cache(idea, valores)
+                    idea["formatos_ia"] = FormatosIA(self.formateador, idea, valores)
+            self._envios = []
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finalizar()
+        elif self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
 
 class GeneradorFormatos:
     """Clase para generar formatos específicos para diferentes servicios de IA."""
     
-    def __init__(self):
-        """Constructor de la clase GeneradorFormatos."""
-        pass
+    # Registro de formatos: nombre -> método que lo genera a partir de una idea
+    FORMATOS_IA = {
+        "elevenlabs": "generar_config_elevenlabs",
+        "video_lyrics": "generar_video_lyrics",
+        "runway_ml": "generar_prompt_runway",
+        "capcut": "generar_guia_capcut",
+        "midjourney": "generar_prompt_midjourney"
+    }
+    
+    # Formatos que pasan por la caché: leer de ella los demás (guiones con
+    # plantillas, textos vacíos) cuesta más que generarlos
+    FORMATOS_CACHE = frozenset({"video_lyrics"})
+    
+    # Subir al cambiar la salida sin tocar el código de los módulos de formatos
+    VERSION_FORMATOS = "1"
+    
+    # Ritmo de la locución en palabras por segundo (~150 palabras/min) y
+    # ritmos mínimo y máximo al ajustar el guión a una duración de la red
+    PALABRAS_POR_SEGUNDO = 2.5
+    RITMO_MINIMO = 2.0
+    RITMO_MAXIMO = 3.5
+    
+    def __init__(self, cache=None, redes_sociales=None):
+        """Constructor de la clase GeneradorFormatos.
+        
+        Args:
+            cache: CacheFormatos opcional para no regenerar formatos de ideas
+                con el mismo contenido (ver activar_cache)
+            redes_sociales: Configuración de redes sociales (por defecto, la de
+                ConfiguracionContenido, que se carga la primera vez que se usa)
+        """
+        self.cache = cache
+        self._redes_sociales = redes_sociales
+    
+    @property
+    def redes_sociales(self):
+        """Configuración de redes sociales (duraciones de cada red)"""
+        if self._redes_sociales is None:
+            self._redes_sociales = ConfiguracionContenido().obtener_redes_sociales()
+        return self._redes_sociales
+    
+    def version_formatos(self):
+        """Versión de la salida: VERSION_FORMATOS más el hash del código que la genera"""
+        modulos = [inspect.getsourcefile(clase) for clase in type(self).__mro__[:-1]]
+        modulos += [inspect.getsourcefile(modulo) for modulo in (plantillas_guion, indice_palabras, subtitulos)]
+        return f"{self.VERSION_FORMATOS}-{huella_archivos(*dict.fromkeys(modulos))}"
+    
+    def activar_cache(self, directorio=None, max_elementos=50000):
+        """Activa la caché de formatos en memoria y, si se indica directorio, en disco
+        
+        Solo se guardan los formatos de FORMATOS_CACHE. Compensa en procesos
+        largos que formatean muchas veces las mismas ideas o, con directorio,
+        entre ejecuciones.
+        
+        Returns:
+            La CacheFormatos creada
+        """
+        self.cache = CacheFormatos(self.version_formatos(), directorio, max_elementos)
+        return self.cache
+    
+    def generar_formato(self, nombre, idea):
+        """Genera un formato registrado de una idea, usando la caché si está activa"""
+        metodo = self.FORMATOS_IA[nombre]
+        if self.cache is None or nombre not in self.FORMATOS_CACHE:
+            with tramo(f"formatos.{nombre}", "formatos"):
+                return getattr(self, metodo)(idea)
+        
+        clave = self.cache.clave(f"{nombre}:{metodo}", idea)
+        valor = self.cache.obtener(clave)
+        if valor is None:
+            with tramo(f"formatos.{nombre}", "formatos"):
+                valor = getattr(self, metodo)(idea)
+            self.cache.guardar(clave, valor)
+        return valor
+    
+    def formatos_en_cache(self, idea, nombres):
+        """Devuelve los formatos indicados si están todos en caché, o None"""
+        if self.cache is None or not self.FORMATOS_CACHE.issuperset(nombres):
+            return None
+        
+        valores = {}
+        for nombre in nombres:
+            valor = self.cache.obtener(self.cache.clave(f"{nombre}:{self.FORMATOS_IA[nombre]}", idea))
+            if valor is None:
+                return None
+            valores[nombre] = valor
+        return valores
+    
+    def guardar_en_cache(self, idea, valores):
+        """Guarda en caché formatos generados fuera de generar_formato (por ejemplo, en el pool)"""
+        if self.cache is None:
+            return
+        for nombre, valor in valores.items():
+            if nombre in self.FORMATOS_CACHE:
+                self.cache.guardar(self.cache.clave(f"{nombre}:{self.FORMATOS_IA[nombre]}", idea), valor)
     
     def calcular_timing_guion(self, duracion):
         """Calcular timing detallado para el guión según duración"""
         
         # Convertir duración a segundos
-        if "min" in duracion:
-            if "-" in duracion:
-                # Rango como "1-3min", tomar el promedio
-                nums = duracion.replace("min", "").split("-")
-                segundos = (int(nums[0]) + int(nums[1])) * 30  # Promedio en segundos
-            else:
-                segundos = int(duracion.replace("min", "")) * 60
-        else:
-            segundos = int(duracion.replace("s", ""))
+        segundos = segundos_duracion(duracion)
         
         # Distribución proporcional del tiempo
         if segundos <= 30:
@@ -70,10 +291,32 @@ class GeneradorFormatos:
                 texto = guion[seccion]["texto"]
                 palabras = len(texto.split())
                 guion[seccion]["palabras_estimadas"] = palabras
-                guion[seccion]["duracion_estimada"] = f"{palabras / 2.5:.1f}s"  # ~150 palabras/min
+                guion[seccion]["duracion_estimada"] = f"{palabras / self.PALABRAS_POR_SEGUNDO:.1f}s"
         
         return idea_json
     
+    def segundos_objetivo(self, red_social, palabras):
+        """Duración en segundos de un guión de `palabras` palabras en una red social
+        
+        Parte de la lectura a PALABRAS_POR_SEGUNDO y la ajusta a la duración de
+        la red más cercana (un rango como "1-3min" admite cualquier valor
+        dentro), sin salir de RITMO_MINIMO y RITMO_MAXIMO. Si la red no se
+        conoce se usa la lectura sin ajustar.
+        """
+        estimados = palabras / self.PALABRAS_POR_SEGUNDO
+        red = self.redes_sociales.get(red_social) if red_social else None
+        if not red or not palabras:
+            return estimados
+        
+        # Con la configuración compilada los rangos ya están en segundos
+        rangos = red.get("rangos_duraciones") or [rango_duracion(duracion) for duracion in red.get("duraciones", ())]
+        if not rangos:
+            return estimados
+        
+        objetivo = min((min(max(estimados, minimo), maximo) for minimo, maximo in rangos),
+                       key=lambda segundos: abs(segundos - estimados))
+        return min(max(objetivo, palabras / self.RITMO_MAXIMO), palabras / self.RITMO_MINIMO)
+    
     def crear_guion_basico(self, idea_json, timing_info):
         """Crear guión básico si no se generó correctamente"""
         tema = idea_json.get("tema_original", "este tema")
@@ -151,11 +394,12 @@ class GeneradorFormatos:
         if not punto or len(punto) < 3:
             return "rompe con todas las expectativas del público"
             
-        if "problema" in punto.lower() or "error" in punto.lower():
+        categorias = categorias_subcadenas(punto, SUBCADENAS_IMPACTO)
+        if categorias & IMPACTO_ERROR:
             return "la mayoría de personas comete este error sin darse cuenta y les cuesta miles de euros al año"
-        elif "secreto" in punto.lower() or "truco" in punto.lower():
+        elif categorias & IMPACTO_SECRETO:
             return "las grandes empresas y expertos no quieren que esta información se difunda masivamente"
-        elif "descubrimiento" in punto.lower() or "hallazgo" in punto.lower():
+        elif categorias & IMPACTO_DESCUBRIMIENTO:
             return "contradice lo que se creía establecido hasta ahora en la industria"
         else:
             return "menos del 2% de las personas conoce esta información crucial"
@@ -165,11 +409,12 @@ class GeneradorFormatos:
         if not punto or len(punto) < 3:
             return "cambia completamente nuestra perspectiva sobre el tema"
             
-        if "beneficio" in punto.lower() or "ventaja" in punto.lower():
+        categorias = categorias_subcadenas(punto, SUBCADENAS_CONSECUENCIA)
+        if categorias & CONSECUENCIA_BENEFICIO:
             return "puede multiplicar tus resultados en tiempo récord si lo aplicas correctamente"
-        elif "estrategia" in punto.lower() or "técnica" in punto.lower():
+        elif categorias & CONSECUENCIA_ESTRATEGIA:
             return "los que lo dominan tienen una ventaja competitiva inmensa sobre el resto"
-        elif "evitar" in punto.lower() or "prevenir" in punto.lower():
+        elif categorias & CONSECUENCIA_EVITAR:
             return "te ahorrará problemas graves que la mayoría enfrenta por ignorancia"
         else:
             return "te posiciona automáticamente en el top 5% de tu industria o nicho"
@@ -179,10 +424,10 @@ class GeneradorFormatos:
         if not punto or len(punto) < 3:
             return "revela una faceta completamente inesperada de la situación"
             
-        palabras = punto.lower().split()
-        if any(palabra in ["nunca", "jamás", "imposible"] for palabra in palabras):
+        categorias = categorias_palabras(punto)
+        if categorias & DETALLE_ABSOLUTO:
             return "desafía todas las expectativas previas que teníamos sobre el tema"
-        elif any(palabra in ["siempre", "todos", "cada"] for palabra in palabras):
+        elif categorias & DETALLE_PATRON:
             return "establece un patrón que se repite constantemente y que ahora podemos reconocer"
         else:
             return "introduce un elemento que reconfigura completamente nuestra comprensión"
@@ -192,15 +437,14 @@ class GeneradorFormatos:
         if not puntos_clave:
             return "debemos estar atentos a los detalles inesperados que pueden cambiar todo"
             
-        palabras_clave = []
-        for punto in puntos_clave:
-            palabras_clave.extend(punto.lower().split())
+        # Todas las palabras de todos los puntos en una sola pasada
+        categorias = categorias_palabras(" ".join(puntos_clave))
             
-        if any(palabra in palabras_clave for palabra in ["aprender", "estudiar", "conocer", "saber"]):
+        if categorias & LECCION_APRENDER:
             return "el conocimiento y la preparación siempre nos dan ventaja ante situaciones imprevistas"
-        elif any(palabra in palabras_clave for palabra in ["éxito", "logro", "conseguir", "alcanzar"]):
+        elif categorias & LECCION_EXITO:
             return "la perseverancia y actitud correcta son fundamentales para alcanzar resultados extraordinarios"
-        elif any(palabra in palabras_clave for palabra in ["problema", "error", "fracaso", "dificultad"]):
+        elif categorias & LECCION_OBSTACULO:
             return "los obstáculos son oportunidades disfrazadas que nos permiten crecer y evolucionar"
         else:
             return "las decisiones pequeñas pueden tener un impacto enorme en nuestros resultados finales"
@@ -210,12 +454,12 @@ class GeneradorFormatos:
         if not punto or len(punto) < 3:
             return "establece la base fundamental para todo lo que viene después"
             
-        palabras = punto.lower().split()
-        if any(palabra in ["inicio", "comenzar", "empezar", "primer"] for palabra in palabras):
+        categorias = categorias_palabras(punto)
+        if categorias & EXPLICACION_INICIO:
             return "te permite partir de una base sólida, evitando los errores comunes que comete el 90% de principiantes"
-        elif any(palabra in ["optimizar", "mejorar", "aumentar", "incrementar"] for palabra in palabras):
+        elif categorias & EXPLICACION_OPTIMIZAR:
             return "puede multiplicar tus resultados actuales entre un 30% y 70% sin necesidad de herramientas costosas"
-        elif any(palabra in ["evitar", "prevenir", "reducir", "minimizar"] for palabra in palabras):
+        elif categorias & EXPLICACION_EVITAR:
             return "te ahorra tiempo, dinero y frustración al identificar y corregir problemas desde el principio"
         else:
             return "establece un diferencial competitivo que menos del 5% de personas implementa correctamente"
@@ -237,12 +481,12 @@ class GeneradorFormatos:
         if not punto or len(punto) < 3:
             return "este es el factor que realmente marca la diferencia entre resultados mediocres y extraordinarios"
             
-        palabras = punto.lower().split()
-        if any(palabra in ["único", "especial", "diferente", "exclusivo"] for palabra in palabras):
+        categorias = categorias_palabras(punto)
+        if categorias & DIFERENCIADOR_UNICO:
             return "este enfoque personalizado genera resultados superiores al método estandarizado que todos conocen"
-        elif any(palabra in ["rápido", "veloz", "inmediato", "instantáneo"] for palabra in palabras):
+        elif categorias & DIFERENCIADOR_RAPIDO:
             return "puedes obtener resultados en días o semanas, no meses o años como enseñan tradicionalmente"
-        elif any(palabra in ["fácil", "simple", "sencillo", "accesible"] for palabra in palabras):
+        elif categorias & DIFERENCIADOR_FACIL:
             return "no necesitas herramientas complejas o conocimientos avanzados para implementarlo efectivamente"
         else:
             return "este enfoque sistemático garantiza resultados consistentes, no dependes de suerte o talento innato"
@@ -264,12 +508,12 @@ class GeneradorFormatos:
         if not punto or len(punto) < 3:
             return "impacta directamente en tus resultados finales y te diferencia de la competencia"
             
-        palabras = punto.lower().split()
-        if any(palabra in ["tiempo", "rápido", "veloz", "inmediato"] for palabra in palabras):
+        categorias = categorias_palabras(punto)
+        if categorias & BENEFICIO_TIEMPO:
             return "te permite optimizar tu tiempo, logrando más resultados con menos esfuerzo"
-        elif any(palabra in ["dinero", "costo", "inversión", "precio"] for palabra in palabras):
+        elif categorias & BENEFICIO_DINERO:
             return "mejora significativamente el retorno sobre tu inversión, maximizando cada recurso"
-        elif any(palabra in ["calidad", "valor", "premium", "excelencia"] for palabra in palabras):
+        elif categorias & BENEFICIO_CALIDAD:
             return "eleva el nivel de calidad de tu trabajo a estándares profesionales de primer nivel"
         else:
             return "te proporciona una ventaja competitiva sostenible a largo plazo"
@@ -298,7 +542,8 @@ class GeneradorFormatos:
             
         punto = puntos_clave[indice]
         if indice == 0:
-            return f"Comienza por {punto.lower().split()[0]} {' '.join(punto.lower().split()[1:])} durante al menos 7 días consecutivos"
+            palabras = punto.lower().split()
+            return f"Comienza por {palabras[0]} {' '.join(palabras[1:])} durante al menos 7 días consecutivos"
         elif indice == len(puntos_clave) - 1:
             return f"Integra {punto.lower()} como parte de tu rutina habitual para maximizar resultados"
         else:
@@ -316,9 +561,12 @@ class GeneradorFormatos:
         
         return beneficios_por_nicho.get(nicho, "obtendrás resultados superiores de manera consistente y predecible")
 
-    def generar_formatos_ia_especificos(self, idea):
-        """Generar formatos específicos para diferentes servicios de IA"""
+    def generar_guiones(self, idea):
+        """Generar el guión completo y las versiones de 15s y 30s de una idea
         
+        Returns:
+            Tupla (guion_voz, guion_corto_15s, guion_corto_30s)
+        """
         titulo = idea.get("titulo", "")
         descripcion = idea.get("descripcion", "")
         puntos_clave = idea.get("puntos_clave", [])
@@ -326,13 +574,7 @@ class GeneradorFormatos:
         nicho = idea.get("nicho", "")
         tema = idea.get("tema", "")
         
-        # Configurar estilo de voz según el tipo de contenido
         if tipo_contenido == "narrativo" or nicho == "Historias Reddit":
-            estilo_voz = {
-                "tono": "narrativo y dinámico",
-                "velocidad": "variable según la tensión",
-                "emoción": "expresivo y dramático"
-            }
             # Generar guión narrativo y dramático con detalles específicos
             guion_voz = f"""¡No van a creer esta historia real sobre {titulo}!
 
@@ -368,11 +610,6 @@ Si quieren más historias sobre {tema}, den like y activen la campanita.
 """
 
         else:
-            estilo_voz = {
-                "tono": "profesional y educativo",
-                "velocidad": "clara y pausada",
-                "emoción": "entusiasta y confiado"
-            }
             # Generar guión educativo y profesional con información concreta y útil
             guion_voz = f"""¡Hola! Hoy te traigo {titulo} - información que realmente necesitas saber.
 
@@ -428,43 +665,168 @@ Si este contenido te resultó útil, apóyalo con un like y suscríbete para má
 {puntos_clave[0] if puntos_clave else ""}
 ¡Dale like y sígueme para más contenido increíble!"""
 
-        # Configuración para ElevenLabs
+        return guion_voz, guion_corto_15s, guion_corto_30s
+
+    @classmethod
+    def registrar_formato(cls, nombre, metodo, cache=False):
+        """Registra un nuevo formato generado por el método indicado
+        
+        Args:
+            nombre: Clave del formato en idea["formatos_ia"]
+            metodo: Nombre del método de la clase que recibe la idea y devuelve el formato
+            cache: Si es True, el formato pasa por la caché (solo compensa si
+                generarlo es más lento que leerlo de ella)
+        """
+        cls.FORMATOS_IA = {**cls.FORMATOS_IA, nombre: metodo}
+        if cache:
+            cls.FORMATOS_CACHE = cls.FORMATOS_CACHE | {nombre}
+
+    def generar_formatos_ia_especificos(self, idea, formatos=None):
+        """Generar formatos específicos para diferentes servicios de IA
+        
+        Los formatos se calculan bajo demanda la primera vez que se leen.
+        
+        Args:
+            idea: Idea a partir de la que se generan los formatos
+            formatos: Nombres de formatos a generar ya (por defecto, ninguno)
+            
+        Returns:
+            FormatosIA con los formatos registrados
+        """
+        formatos_ia = FormatosIA(self, idea)
+        if formatos:
+            formatos_ia.precalcular(formatos)
+        return formatos_ia
+
+    def generar_config_elevenlabs(self, idea):
+        """Generar la configuración de voz para ElevenLabs"""
+        
+        tipo_contenido = idea.get("tipo_contenido", "educativo")
+        nicho = idea.get("nicho", "")
+        
+        # Configurar estilo de voz según el tipo de contenido
+        if tipo_contenido == "narrativo" or nicho == "Historias Reddit":
+            estilo_voz = {
+                "tono": "narrativo y dinámico",
+                "velocidad": "variable según la tensión",
+                "emoción": "expresivo y dramático"
+            }
+        else:
+            estilo_voz = {
+                "tono": "profesional y educativo",
+                "velocidad": "clara y pausada",
+                "emoción": "entusiasta y confiado"
+            }
+        
+        guion_voz, guion_corto_15s, guion_corto_30s = self.generar_guiones(idea)
+
+        # Configuración para ElevenLabs (configuración e instrucciones solo
+        # dependen del tipo de contenido: un bloque compartido por combinación)
         elevenlabs_config = {
             "texto_completo": guion_voz,
             "versiones_cortas": {
                 "15s": guion_corto_15s,
                 "30s": guion_corto_30s
             },
-            "configuracion": {
+            "configuracion": compartido({
                 "stability": 0.71,
                 "similarity_boost": 0.75,
                 "style": 0.35 if tipo_contenido == "narrativo" else 0.20,
                 "use_speaker_boost": True,
                 "optimize_streaming_latency": 3
-            },
-            "instrucciones_voz": {
+            }),
+            "instrucciones_voz": compartido({
                 "tono": estilo_voz["tono"],
                 "velocidad": estilo_voz["velocidad"],
                 "emoción": estilo_voz["emoción"],
                 "notas": "Usar entonación natural y pausas según el contenido"
-            }
+            })
         }
 
-        # Mantener el resto de los formatos existentes
-        formatos = {
-            "elevenlabs": elevenlabs_config,
-            "video_lyrics": self.generar_video_lyrics(idea),
-            "runway_ml": self.generar_prompt_runway(idea),
-            "capcut": self.generar_guia_capcut(idea),
-            "midjourney": self.generar_prompt_midjourney(idea)
+        return elevenlabs_config
+
+    def dividir_guion_secciones(self, idea, guion_voz):
+        """Divide un guión generado por generar_guiones en las secciones de guion_completo_voz
+        
+        La introducción es el hook, el último punto clave el clímax, los demás
+        puntos el desarrollo y el cierre la llamada a la acción. La duración
+        total sale del propio guión (segundos_objetivo para la red social de la
+        idea) y se reparte entre las secciones según sus palabras.
+        
+        Returns:
+            Diccionario sección -> {"texto", "timing", "palabras_estimadas", ...}
+        """
+        puntos_clave = idea.get("puntos_clave", [])
+        if idea.get("tipo_contenido", "educativo") == "narrativo" or idea.get("nicho", "") == "Historias Reddit":
+            plantilla = GUION_NARRATIVO
+        else:
+            plantilla = GUION_EDUCATIVO
+        
+        # Localizar el inicio de cada sección por su texto fijo
+        posiciones = []
+        desde = 0
+        for marca in plantilla.marcas_secciones(len(puntos_clave)):
+            posicion = guion_voz.find(marca, desde)
+            if posicion < 0:
+                posicion = desde
+            posiciones.append(posicion)
+            desde = posicion + len(marca)
+        posiciones.append(len(guion_voz))
+        partes = [guion_voz[inicio:fin] for inicio, fin in zip(posiciones, posiciones[1:])]
+        
+        intro, puntos, cierre = partes[0], partes[1:-1], partes[-1]
+        if len(puntos) > 1:
+            desarrollo, climax = "".join(puntos[:-1]), puntos[-1]
+        else:
+            desarrollo, climax = "".join(puntos), ""
+        
+        textos = {"hook": intro, "desarrollo": desarrollo, "climax": climax, "cierre": cierre}
+        conteos = {parte: len(texto.split()) for parte, texto in textos.items()}
+        palabras = sum(conteos.values())
+        segundos = self.segundos_objetivo(idea.get("red_social"), palabras)
+        timing_info = {"segundos": round(segundos, 1)}
+        timing_info.update((parte, round(segundos * n / (palabras or 1), 1)) for parte, n in conteos.items())
+        
+        guion = {
+            "intro_hook": {"texto": intro, "timing": f"{timing_info['hook']}s"},
+            "desarrollo_principal": {"texto": desarrollo, "timing": f"{timing_info['desarrollo']}s"},
+            "momento_climax": {"texto": climax, "timing": f"{timing_info['climax']}s"},
+            "call_to_action": {"texto": cierre, "timing": f"{timing_info['cierre']}s"}
         }
+        return self.validar_y_mejorar_guion({"guion_completo_voz": guion}, timing_info)["guion_completo_voz"]
 
-        return formatos
+    @perfilado("formatos.timelines")
+    def generar_timelines_lote(self, ideas, max_palabras_linea=8):
+        """Generar los timelines de subtítulos de muchas ideas de una vez
+        
+        Usa el guión de idea["formatos_ia"] si ya existe; si no, lo genera.
+        
+        Args:
+            ideas: Lista de ideas
+            max_palabras_linea: Palabras máximas por línea de subtítulo
+            
+        Returns:
+            Lista con el timeline de cada idea (ver generar_video_lyrics)
+        """
+        guiones = []
+        for idea in ideas:
+            formatos = idea.get("formatos_ia")
+            if formatos:
+                guion_voz = formatos["elevenlabs"]["texto_completo"]
+            else:
+                guion_voz = self.generar_guiones(idea)[0]
+            guiones.append(self.dividir_guion_secciones(idea, guion_voz))
+        
+        return calcular_timelines(guiones, max_palabras_linea)
 
     def generar_video_lyrics(self, idea):
-        """Generar timeline para video con letras/karaoke"""
-        # Implementación simple para mantener compatibilidad
-        return []
+        """Generar timeline para video con letras/karaoke
+        
+        Returns:
+            Lista de líneas {"inicio", "fin", "texto", "palabras"} con tiempos en
+            segundos; "palabras" contiene el tiempo de cada palabra de la línea
+        """
+        return self.generar_timelines_lote([idea])[0]
 
     def generar_prompt_runway(self, idea):
         """Generar prompt para Runway ML"""
@@ -480,3 +842,48 @@ Si este contenido te resultó útil, apóyalo con un like y suscríbete para má
         """Generar prompt para Midjourney"""
         # Implementación simple para mantener compatibilidad
         return ""
+
+    def iniciar_lote(self, procesos=None, tamano_chunk=200, formatos=FORMATOS_PRECALCULADOS):
+        """Crea un LoteFormatos para generar formatos a medida que se aceptan ideas"""
+        return LoteFormatos(self, procesos=procesos, tamano_chunk=tamano_chunk, formatos=formatos)
+
+    def generar_formatos_lote(self, ideas, procesos=None, tamano_chunk=200, formatos=FORMATOS_PRECALCULADOS):
+        """Generar los formatos de muchas ideas en un pool de procesos
+        
+        El resultado es idéntico al de llamar a generar_formatos_ia_especificos
+        para cada idea en serie y se devuelve en el mismo orden.
+        
+        Args:
+            ideas: Lista de ideas
+            procesos: Número de procesos (1 fuerza la ejecución en serie; con
+                menos de MIN_IDEAS_POOL ideas sin formatear también es en serie)
+            tamano_chunk: Ideas por bloque enviado a cada proceso
+            formatos: Nombres de los formatos que generan los procesos; el
+                resto se calcula bajo demanda al leerlos
+            
+        Returns:
+            Lista con los formatos (FormatosIA) de cada idea
+        """
+        ideas = list(ideas)
+        tamano_chunk = max(1, tamano_chunk)
+        
+        # Para pocos elementos el coste de arrancar procesos no compensa
+        if not _usar_pool(procesos, len(ideas)):
+            return [self.generar_formatos_ia_especificos(idea) for idea in ideas]
+        
+        # Solo se envían al pool las ideas cuyo contenido no está ya en caché
+        resultados = [FormatosIA(self, idea, self.formatos_en_cache(idea, formatos)) for idea in ideas]
+        pendientes = [i for i, formatos_ia in enumerate(resultados) if not formatos_ia.calculados()]
+        if not _usar_pool(procesos, len(pendientes)):
+            return resultados
+        
+        bloques = [pendientes[i:i + tamano_chunk] for i in range(0, len(pendientes), tamano_chunk)]
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            for bloque, resultado in zip(bloques, executor.map(
+                    _generar_formatos_chunk, [type(self)] * len(bloques),
+                    [[ideas[i] for i in bloque] for bloque in bloques], [tuple(formatos)] * len(bloques))):
+                for i, valores in zip(bloque, resultado):
+                    self.guardar_en_cache(ideas[i], valores)
+                    resultados[i] = FormatosIA(self, ideas[i], valores)
+        
+        return resultados
@@ -0,0 +1,96 @@
+"""
+Módulo con el índice de palabras clave usado por las heurísticas de guiones.
+
+Reúne en un único índice palabra -> categorías todas las listas de palabras
+que consultan los métodos _generar_* de GeneradorFormatos, de modo que cada
+heurística divide el punto clave una sola vez y una única pasada por sus
+palabras devuelve todas sus categorías como una máscara de bits. No se
+guarda nada por punto: los puntos que llegan de la IA casi nunca se repiten,
+así que clasificar es siempre el caso frío.
+"""
+
+# Categorías (un bit por categoría)
+(
+    DETALLE_ABSOLUTO, DETALLE_PATRON,
+    LECCION_APRENDER, LECCION_EXITO, LECCION_OBSTACULO,
+    EXPLICACION_INICIO, EXPLICACION_OPTIMIZAR, EXPLICACION_EVITAR,
+    DIFERENCIADOR_UNICO, DIFERENCIADOR_RAPIDO, DIFERENCIADOR_FACIL,
+    BENEFICIO_TIEMPO, BENEFICIO_DINERO, BENEFICIO_CALIDAD,
+    IMPACTO_ERROR, IMPACTO_SECRETO, IMPACTO_DESCUBRIMIENTO,
+    CONSECUENCIA_BENEFICIO, CONSECUENCIA_ESTRATEGIA, CONSECUENCIA_EVITAR
+) = (1 << bit for bit in range(20))
+
+# Categorías que se activan si la palabra aparece como palabra completa
+CATEGORIAS_PALABRAS = {
+    DETALLE_ABSOLUTO: ("nunca", "jamás", "imposible"),
+    DETALLE_PATRON: ("siempre", "todos", "cada"),
+    LECCION_APRENDER: ("aprender", "estudiar", "conocer", "saber"),
+    LECCION_EXITO: ("éxito", "logro", "conseguir", "alcanzar"),
+    LECCION_OBSTACULO: ("problema", "error", "fracaso", "dificultad"),
+    EXPLICACION_INICIO: ("inicio", "comenzar", "empezar", "primer"),
+    EXPLICACION_OPTIMIZAR: ("optimizar", "mejorar", "aumentar", "incrementar"),
+    EXPLICACION_EVITAR: ("evitar", "prevenir", "reducir", "minimizar"),
+    DIFERENCIADOR_UNICO: ("único", "especial", "diferente", "exclusivo"),
+    DIFERENCIADOR_RAPIDO: ("rápido", "veloz", "inmediato", "instantáneo"),
+    DIFERENCIADOR_FACIL: ("fácil", "simple", "sencillo", "accesible"),
+    BENEFICIO_TIEMPO: ("tiempo", "rápido", "veloz", "inmediato"),
+    BENEFICIO_DINERO: ("dinero", "costo", "inversión", "precio"),
+    BENEFICIO_CALIDAD: ("calidad", "valor", "premium", "excelencia")
+}
+
+# Categorías que se activan si la clave aparece en cualquier parte del texto
+CATEGORIAS_SUBCADENAS = {
+    IMPACTO_ERROR: ("problema", "error"),
+    IMPACTO_SECRETO: ("secreto", "truco"),
+    IMPACTO_DESCUBRIMIENTO: ("descubrimiento", "hallazgo"),
+    CONSECUENCIA_BENEFICIO: ("beneficio", "ventaja"),
+    CONSECUENCIA_ESTRATEGIA: ("estrategia", "técnica"),
+    CONSECUENCIA_EVITAR: ("evitar", "prevenir")
+}
+
+
+def _construir_indice():
+    """Construye el índice palabra -> máscara de categorías"""
+    indice = {}
+    for categoria, palabras in CATEGORIAS_PALABRAS.items():
+        for palabra in palabras:
+            indice[palabra] = indice.get(palabra, 0) | categoria
+    return indice
+
+
+INDICE_PALABRAS = _construir_indice()
+_categorias_palabra = INDICE_PALABRAS.get
+
+
+def _subcadenas(*categorias):
+    """Pares (clave, categoría) de las categorías por subcadena indicadas, en orden"""
+    return tuple((clave, categoria) for categoria in categorias for clave in CATEGORIAS_SUBCADENAS[categoria])
+
+
+# Grupos de subcadenas que consulta cada heurística narrativa
+SUBCADENAS_IMPACTO = _subcadenas(IMPACTO_ERROR, IMPACTO_SECRETO, IMPACTO_DESCUBRIMIENTO)
+SUBCADENAS_CONSECUENCIA = _subcadenas(CONSECUENCIA_BENEFICIO, CONSECUENCIA_ESTRATEGIA, CONSECUENCIA_EVITAR)
+
+
+def categorias_palabras(texto):
+    """Máscara de las categorías por palabra completa de un texto (una sola pasada)"""
+    categorias = 0
+    for palabra in texto.lower().split():
+        categorias |= _categorias_palabra(palabra, 0)
+    return categorias
+
+
+def categorias_subcadenas(texto, subcadenas):
+    """Categoría por subcadena de mayor prioridad presente en un texto (0 si ninguna)
+    
+    Args:
+        texto: Texto del punto clave
+        subcadenas: Pares (clave, categoría) en orden de prioridad (SUBCADENAS_IMPACTO...)
+    """
+    # Las claves no contienen espacios, así que basta con buscarlas en el texto;
+    # como van en orden de prioridad, la primera presente decide
+    texto = texto.lower()
+    for clave, categoria in subcadenas:
+        if clave in texto:
+            return categoria
+    return 0
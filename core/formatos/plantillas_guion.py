@@ -0,0 +1,61 @@
+"""
+Módulo con la estructura de secciones de los guiones de voz.
+
+generar_guiones construye los guiones con f-strings; aquí se define el texto
+fijo con el que empieza cada sección de esos guiones (introducción, puntos
+clave y cierre), que usan dividir_guion_secciones para separar un guión en
+secciones y calidad_guiones para comprobar que un guión las contiene.
+"""
+
+
+class EstructuraGuion:
+    """Marcas de inicio de las secciones de un guión.
+
+    El primer punto clave usa punto_primero, el último (si hay más de uno)
+    punto_final y los demás punto_intermedio.
+    """
+
+    def __init__(self, intro, punto_primero, punto_intermedio, punto_final, cierre):
+        """Constructor de la clase EstructuraGuion.
+
+        Args:
+            intro: Texto con el que empieza la introducción
+            punto_primero: Texto con el que empieza el primer punto clave
+            punto_intermedio: Texto con el que empiezan los puntos intermedios
+            punto_final: Texto con el que empieza el último punto clave (si hay más de uno)
+            cierre: Texto con el que empieza el cierre
+        """
+        self.intro = intro
+        self.punto_primero = punto_primero
+        self.punto_intermedio = punto_intermedio
+        self.punto_final = punto_final
+        self.cierre = cierre
+
+    def marcas_secciones(self, num_puntos):
+        """Texto con el que empieza cada sección en orden: introducción, puntos y cierre"""
+        marcas = [self.intro]
+        for i in range(1, num_puntos + 1):
+            if i == 1:
+                marcas.append(self.punto_primero)
+            elif i == num_puntos:
+                marcas.append(self.punto_final)
+            else:
+                marcas.append(self.punto_intermedio)
+        marcas.append(self.cierre)
+        return marcas
+
+
+GUION_NARRATIVO = EstructuraGuion(
+    "¡No van a creer esta historia real sobre ",
+    "Primero, lo más impactante: ",
+    "Después ocurrió algo más: ",
+    "Y finalmente, el detalle que NADIE esperaba: ",
+    "La conclusión de esta historia nos enseña que ",
+)
+GUION_EDUCATIVO = EstructuraGuion(
+    "¡Hola! Hoy te traigo ",
+    "El primer punto clave es: ",
+    "El siguiente aspecto importante: ",
+    "Finalmente, y esto es lo que marca la diferencia: ",
+    "Para implementar lo que hemos aprendido hoy sobre ",
+)
@@ -0,0 +1,63 @@
+"""
+Módulo con el registro perezoso de formatos de IA.
+
+Cada formato (elevenlabs, video_lyrics, runway_ml...) se registra como un
+método de GeneradorFormatos y solo se calcula la primera vez que alguien lo
+lee, de modo que los formatos que no se consultan no cuestan nada.
+
+FormatosIA no es JSON: los exportadores leen cada formato por su clave
+(formatos_ia.elevenlabs.texto_completo...) al aplanar la idea en una fila.
+"""
+
+from collections.abc import Mapping
+
+from core.formatos.cache_formatos import CAMPOS_FORMATOS
+
+
+class FormatosIA(Mapping):
+    """Diccionario de solo lectura que calcula cada formato al acceder a él.
+
+    Se comporta como el diccionario que devolvía antes
+    generar_formatos_ia_especificos (get, items, comparación con dict...),
+    pero cada valor se genera bajo demanda y se guarda para los siguientes
+    accesos. Recorrerlo entero (items, dict(...)) calcula todos los formatos.
+
+    Solo guarda los campos de la idea de los que dependen los formatos
+    (CAMPOS_FORMATOS), no la idea: así la idea y sus formatos no forman un
+    ciclo de referencias y los formatos no cambian si la idea se edita después.
+    """
+
+    def __init__(self, formateador, idea, valores=None):
+        """Constructor de la clase FormatosIA.
+
+        Args:
+            formateador: Instancia de GeneradorFormatos con el registro de formatos
+            idea: Idea a partir de la que se generan los formatos
+            valores: Diccionario opcional con formatos ya calculados
+        """
+        self._formateador = formateador
+        self._campos = {campo: idea[campo] for campo in CAMPOS_FORMATOS if campo in idea}
+        self._valores = dict(valores) if valores else {}
+
+    def __getitem__(self, nombre):
+        if nombre not in self._valores:
+            self._valores[nombre] = self._formateador.generar_formato(nombre, self._campos)
+        return self._valores[nombre]
+
+    def __iter__(self):
+        return iter(self._formateador.FORMATOS_IA)
+
+    def __len__(self):
+        return len(self._formateador.FORMATOS_IA)
+
+    def __repr__(self):
+        calculados = ", ".join(self._valores) or "ninguno"
+        return f"FormatosIA({list(self)}, calculados: {calculados})"
+
+    def calculados(self):
+        """Nombres de los formatos ya generados"""
+        return list(self._valores)
+
+    def precalcular(self, nombres):
+        """Genera ahora los formatos indicados y los devuelve como diccionario"""
+        return {nombre: self[nombre] for nombre in nombres}
@@ -0,0 +1,135 @@
+"""
+Módulo para generar timelines de subtítulos (SRT) y karaoke (LRC) de los guiones.
+
+Cada sección del guión (hook, desarrollo, clímax y cierre) dura lo que marca
+su timing (dividir_guion_secciones), así que sus palabras se leen a su propio
+ritmo de palabras por segundo. Los tiempos de todas las palabras de un lote se calculan
+de una vez con NumPy.
+"""
+
+import numpy as np
+
+# Secciones de guion_completo_voz en orden de lectura
+SECCIONES_GUION = ("intro_hook", "desarrollo_principal", "momento_climax", "call_to_action")
+
+
+def _segundos_secciones(guion, conteos):
+    """Duración de cada sección; el tiempo de las secciones vacías se reparte entre las demás"""
+    segundos = [float(str(guion.get(seccion, {}).get("timing", "0")).rstrip("s") or 0) for seccion in SECCIONES_GUION]
+    con_palabras = sum(s for s, n in zip(segundos, conteos) if n)
+    sin_palabras = sum(s for s, n in zip(segundos, conteos) if not n)
+
+    if not con_palabras:
+        # Sin timing útil: repartir el total según el número de palabras
+        total = sum(segundos)
+        palabras = sum(conteos) or 1
+        return [total * n / palabras for n in conteos]
+
+    return [s + sin_palabras * s / con_palabras if n else 0.0 for s, n in zip(segundos, conteos)]
+
+
+def calcular_timelines(guiones, max_palabras_linea=8):
+    """Calcula el timeline por línea y por palabra de varios guiones.
+
+    Args:
+        guiones: Lista de guiones con el formato de guion_completo_voz
+            (sección -> {"texto", "timing"})
+        max_palabras_linea: Palabras máximas por línea de subtítulo
+
+    Returns:
+        Lista con el timeline de cada guión: lista de líneas
+        {"inicio", "fin", "texto", "palabras": [{"inicio", "fin", "texto"}]}
+    """
+    palabras = []
+    lineas = []  # (guion, primera palabra, última palabra + 1)
+    conteos_seccion = []
+    segundos_seccion = []
+    palabras_guion = []
+
+    for indice, guion in enumerate(guiones):
+        inicio_guion = len(palabras)
+        conteos = []
+        for seccion in SECCIONES_GUION:
+            inicio_seccion = len(palabras)
+            for linea in guion.get(seccion, {}).get("texto", "").splitlines():
+                tokens = linea.split()
+                for i in range(0, len(tokens), max_palabras_linea):
+                    lineas.append((indice, len(palabras), len(palabras) + len(tokens[i:i + max_palabras_linea])))
+                    palabras.extend(tokens[i:i + max_palabras_linea])
+            conteos.append(len(palabras) - inicio_seccion)
+
+        conteos_seccion.extend(conteos)
+        segundos_seccion.extend(_segundos_secciones(guion, conteos))
+        palabras_guion.append(len(palabras) - inicio_guion)
+
+    if not palabras:
+        return [[] for _ in guiones]
+
+    # Duración de cada palabra según el ritmo de su sección
+    conteos_seccion = np.asarray(conteos_seccion, dtype=np.int64)
+    ritmo = np.divide(segundos_seccion, conteos_seccion, out=np.zeros(len(conteos_seccion)), where=conteos_seccion > 0)
+    duraciones = np.repeat(ritmo, conteos_seccion)
+
+    # Tiempos acumulados, reiniciando en cada guión
+    fin = np.cumsum(duraciones)
+    palabras_guion = np.asarray(palabras_guion, dtype=np.int64)
+    primeras = np.cumsum(palabras_guion) - palabras_guion
+    fin -= np.repeat(np.concatenate(([0.0], fin))[primeras], palabras_guion)
+    inicio = fin - duraciones
+
+    inicio = np.round(inicio, 3).tolist()
+    fin = np.round(fin, 3).tolist()
+
+    timelines = [[] for _ in guiones]
+    for indice, primera, ultima in lineas:
+        timelines[indice].append({
+            "inicio": inicio[primera],
+            "fin": fin[ultima - 1],
+            "texto": " ".join(palabras[primera:ultima]),
+            "palabras": [
+                {"inicio": inicio[i], "fin": fin[i], "texto": palabras[i]} for i in range(primera, ultima)
+            ]
+        })
+
+    return timelines
+
+
+def _tiempo_srt(segundos):
+    """Formatea segundos como HH:MM:SS,mmm"""
+    milisegundos = int(round(segundos * 1000))
+    horas, milisegundos = divmod(milisegundos, 3600000)
+    minutos, milisegundos = divmod(milisegundos, 60000)
+    segundos, milisegundos = divmod(milisegundos, 1000)
+    return f"{horas:02d}:{minutos:02d}:{segundos:02d},{milisegundos:03d}"
+
+
+def _tiempo_lrc(segundos):
+    """Formatea segundos como MM:SS.cc"""
+    centesimas = int(round(segundos * 100))
+    minutos, centesimas = divmod(centesimas, 6000)
+    return f"{minutos:02d}:{centesimas // 100:02d}.{centesimas % 100:02d}"
+
+
+def formatear_srt(timeline):
+    """Genera el texto SRT (un subtítulo por línea) de un timeline"""
+    return "\n".join(
+        f"{numero}\n{_tiempo_srt(linea['inicio'])} --> {_tiempo_srt(linea['fin'])}\n{linea['texto']}\n"
+        for numero, linea in enumerate(timeline, 1)
+    )
+
+
+def formatear_lrc(timeline, titulo=""):
+    """Genera el texto LRC con marcas por palabra (formato LRC extendido) de un timeline"""
+    cabecera = []
+    if titulo:
+        cabecera.append(f"[ti:{titulo}]")
+    if timeline:
+        cabecera.append(f"[length:{_tiempo_lrc(timeline[-1]['fin'])[:5]}]")
+
+    lineas = [
+        f"[{_tiempo_lrc(linea['inicio'])}]"
+        + " ".join(f"<{_tiempo_lrc(palabra['inicio'])}>{palabra['texto']}" for palabra in linea["palabras"])
+        + f" <{_tiempo_lrc(linea['fin'])}>"
+        for linea in timeline
+    ]
+    return "\n".join(cabecera + lineas) + "\n"
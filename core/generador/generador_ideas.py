@@ -3,38 +3,109 @@ Módulo principal para la generación de ideas con IA.
 """
 
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
+from google.api_core.exceptions import ResourceExhausted, TooManyRequests
 import random
 import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
+from core.generador.idea import Idea, MetadataIdea, metadata_nicho
+from core.generador.pool_claves import PoolClavesAPI, estimar_tokens
+from core.monitorizacion.metricas import (
+    COLA, IDEAS_ACEPTADAS, IDEAS_INTENTADAS, IDEAS_RECHAZADAS, LATENCIA_LLM, PETICIONES_LLM,
+    PETICIONES_LLM_EN_CURSO, TOKENS_LLM
+)
+from core.monitorizacion.perfilador import perfilado, tramo
+
+# Modelo de Gemini y tokens máximos de cada respuesta (también se reservan en la cuota de la clave)
+MODELO_GEMINI = "models/gemini-2.0-flash"
+MAX_TOKENS_RESPUESTA = 2048
+
 class GeneradorIdeas:
     """Clase para generar ideas de videos usando IA."""
     
-    def __init__(self, api_key, configuracion_contenido):
+    def __init__(self, api_key, configuracion_contenido, cuota_api=None):
         """Inicializa el generador de ideas.
         
         Args:
-            api_key: API key de Gemini
+            api_key: API key de Gemini, lista de API keys o PoolClavesAPI ya creado
             configuracion_contenido: Objeto ConfiguracionContenido con la configuración de redes y nichos
+            cuota_api: Diccionario opcional con peticiones_por_minuto y
+                tokens_por_minuto de cada clave (ver cargar_cuota_api)
         """
-        self.api_key = api_key
+        if isinstance(api_key, PoolClavesAPI):
+            self.pool_claves = api_key
+        else:
+            claves = [api_key] if isinstance(api_key, str) else list(api_key)
+            self.pool_claves = PoolClavesAPI(claves, **(cuota_api or {}))
+        self.api_key = self.pool_claves.claves[0].clave
         self.configuracion_contenido = configuracion_contenido
         self.configurar_gemini()
         self.ideas_generadas_sesion = []
     
     def configurar_gemini(self):
-        """Configurar el modelo de Gemini con configuración optimizada"""
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash")
+        """Crear un cliente de Gemini por cada API key del pool
+        
+        genai.configure es global (un solo cliente por proceso), así que cada
+        clave tiene su propio GenerativeServiceClient con su api_key.
+        """
+        self.clientes = {
+            clave.clave: glm.GenerativeServiceClient(client_options={"api_key": clave.clave})
+            for clave in self.pool_claves.claves
+        }
         
         # Configuración para respuestas más consistentes
-        self.generation_config = genai.types.GenerationConfig(
+        self.generation_config = glm.GenerationConfig(
             temperature=0.8,
             top_p=0.9,
             top_k=50,
-            max_output_tokens=2048,
+            max_output_tokens=MAX_TOKENS_RESPUESTA,
         )
     
+    def generar_contenido(self, prompt):
+        """Envía un prompt a Gemini con la clave del pool que tenga cuota libre
+        
+        Si la clave recibe un error de cuota, pasa a enfriamiento y se
+        reintenta con otra.
+        
+        Returns:
+            Respuesta de Gemini
+        """
+        tokens_reservados = estimar_tokens(prompt) + MAX_TOKENS_RESPUESTA
+        ultimo_error = None
+        for _ in range(len(self.pool_claves.claves) + 1):
+            with tramo("gemini.espera_cuota", "gemini"):
+                clave = self.pool_claves.adquirir(tokens_reservados)
+            try:
+                with tramo("gemini.peticion", "gemini", clave=clave.nombre), \
+                        PETICIONES_LLM_EN_CURSO.en_curso(), LATENCIA_LLM.medir():
+                    response = genai.types.GenerateContentResponse.from_response(
+                        self.clientes[clave.clave].generate_content(glm.GenerateContentRequest(
+                            model=MODELO_GEMINI,
+                            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+                            generation_config=self.generation_config
+                        ))
+                    )
+                tokens_entrada, tokens_salida = estimar_tokens(prompt), estimar_tokens(response.text)
+                tokens_usados = tokens_entrada + tokens_salida
+            except (ResourceExhausted, TooManyRequests) as e:
+                PETICIONES_LLM.incrementar(resultado="cuota")
+                self.pool_claves.marcar_limitada(clave)
+                print(f"      ⚠️ Cuota agotada en la API key {clave.nombre}, probando con otra")
+                ultimo_error = e
+                continue
+            except Exception:
+                PETICIONES_LLM.incrementar(resultado="error")
+                self.pool_claves.liberar(clave, tokens_reservados=tokens_reservados, error=True)
+                raise
+            PETICIONES_LLM.incrementar(resultado="ok")
+            TOKENS_LLM.observar(tokens_entrada, tipo="entrada")
+            TOKENS_LLM.observar(tokens_salida, tipo="salida")
+            self.pool_claves.liberar(clave, tokens_usados, tokens_reservados)
+            return response
+        raise ultimo_error
+    
     def generar_idea_con_ia(self, tema, red_social, nicho=None, tipo_contenido=None):
         """Genera una idea de contenido usando IA, con enfoque educativo o narrativo según el nicho"""
         try:
@@ -104,10 +175,7 @@ class GeneradorIdeas:
                     """
 
             # Generar respuesta con IA
-            response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config
-            )
+            response = self.generar_contenido(prompt)
             
             # Procesar y estructurar la respuesta
             idea_json = self.procesar_respuesta_ia(response.text, tema, red_social, nicho)
@@ -124,27 +192,29 @@ class GeneradorIdeas:
             print(f"❌ Error generando idea: {str(e)}")
             return None
             
+    @perfilado("procesar_respuesta_ia", "idea")
     def procesar_respuesta_ia(self, texto_respuesta, tema, red_social, nicho=None):
         """Procesa y estructura la respuesta de la IA según el nicho"""
         try:
             nichos = self.configuracion_contenido.nichos
             
-            # Estructura base para la idea
-            idea_estructurada = {
-                "tema": tema,
-                "red_social": red_social,
-                "nicho": nicho,
-                "titulo": "",
-                "descripcion": "",
-                "puntos_clave": [],
-                "hashtags": [],
-                "hook_inicial": "",
-                "tipo_contenido": "educativo" if nicho and nichos[nicho].get("enfoque_educativo", True) else "narrativo",
-                "metadata": {
-                    "fecha_generacion": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "categoria": nicho if nicho else "general"
-                }
-            }
+            # Estructura base para la idea; la metadata del nicho (estilo,
+            # audiencia y palabras clave) es un bloque compartido por sus ideas
+            idea_estructurada = Idea(
+                tema=tema,
+                red_social=red_social,
+                nicho=nicho,
+                titulo="",
+                descripcion="",
+                puntos_clave=[],
+                hashtags=[],
+                hook_inicial="",
+                tipo_contenido="educativo" if nicho and nichos[nicho].get("enfoque_educativo", True) else "narrativo",
+                metadata=MetadataIdea(
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    metadata_nicho(nicho, nichos[nicho] if nicho in nichos else None)
+                )
+            )
 
             # Extraer información del texto de respuesta
             lineas = texto_respuesta.split("\n")
@@ -180,14 +250,6 @@ class GeneradorIdeas:
             if not idea_estructurada["hook_inicial"]:
                 idea_estructurada["hook_inicial"] = self._generar_hook_inicial(idea_estructurada["titulo"], tema, nicho)
 
-            # Añadir metadatos específicos según el nicho
-            if nicho in nichos:
-                idea_estructurada["metadata"].update({
-                    "estilo": nichos[nicho].get("estilo", "general"),
-                    "audiencia": nichos[nicho].get("audiencia", "general"),
-                    "palabras_clave": nichos[nicho].get("palabras_clave", [])
-                })
-
             return idea_estructurada
                 
         except Exception as e:
@@ -232,9 +294,11 @@ class GeneradorIdeas:
                 f"Casos de estudio: Empresas que han revolucionado con {tema}"
             ]
         else:
-            # Puntos genéricos pero específicos
+            # Puntos genéricos pero específicos: mejor con una palabra clave del nicho
             palabras = titulo.split() + descripcion.split() + tema.split()
-            palabras_clave = [palabra for palabra in palabras if len(palabra) > 4]
+            conjunto = self.configuracion_contenido.nichos.get(nicho, {}).get("palabras_clave_conjunto", frozenset())
+            palabras_clave = [palabra for palabra in palabras if palabra.lower().strip(".,;:¡!¿?") in conjunto]
+            palabras_clave = palabras_clave or [palabra for palabra in palabras if len(palabra) > 4]
             
             if palabras_clave:
                 palabra = random.choice(palabras_clave)
@@ -348,13 +412,23 @@ class GeneradorIdeas:
                 
         return min(score, 100)  # Asegurar que no exceda 100
     
-    def generar_lote_ideas_automatizado(self, cantidad=20, filtros=None, tendencias=None):
+    def _generar_idea_perfilada(self, numero, tema, red_social, nicho):
+        """generar_idea_con_ia registrando la idea como un tramo del perfilado"""
+        with tramo("idea", "idea", numero=numero, tema=tema, red_social=red_social, nicho=nicho):
+            return self.generar_idea_con_ia(tema, red_social, nicho)
+    
+    def generar_lote_ideas_automatizado(self, cantidad=20, filtros=None, tendencias=None, actualizar_tendencias=None,
+                                        al_aceptar_idea=None):
         """Generar lote de ideas de forma completamente automatizada
         
         Args:
             cantidad: Número de ideas a generar
             filtros: Diccionario con filtros a aplicar
             tendencias: Lista de tendencias a utilizar
+            actualizar_tendencias: Función opcional sin argumentos que devuelve la lista
+                de tendencias actualizada; se consulta en cada intento para incorporar
+                las tendencias que lleguen mientras se generan ideas
+            al_aceptar_idea: Función opcional que recibe cada idea en cuanto se aprueba
         """
         
         print(f"🤖 GENERACIÓN AUTOMATIZADA DE {cantidad} IDEAS PROFESIONALES")
@@ -389,49 +463,88 @@ class GeneradorIdeas:
         print(f"🎪 Nichos: {', '.join(filtros['nichos_incluir'])}")
         print("\n🔄 Generando ideas...")
         
-        while ideas_exitosas < cantidad and intentos < max_intentos:
-            intentos += 1
-            
-            # Selección inteligente de parámetros
-            tema = random.choice(tendencias)
-            red_social = random.choice(filtros["redes_incluir"])
-            nicho = random.choice(filtros["nichos_incluir"])
-            
-            # Enriquecer el tema según el nicho
-            tema_enriquecido = self.enriquecer_tema(tema, nicho)
-            
-            print(f"   💡 Idea {intentos}: {tema_enriquecido} → {red_social} ({nicho})")
-            
-            # Generar idea
-            idea = self.generar_idea_con_ia(tema_enriquecido, red_social, nicho)
-            
-            if idea:
-                # Calcular score
-                score = self.calcular_score_idea(idea)
-                idea["score_calidad"] = score
+        # Una petición en curso por API key: con varias claves las ideas se piden en paralelo
+        concurrencia = self.pool_claves.concurrencia
+        pendientes = {}
+        with ThreadPoolExecutor(max_workers=concurrencia, thread_name_prefix="gemini") as executor:
+            while True:
+                while (len(pendientes) < concurrencia and ideas_exitosas + len(pendientes) < cantidad
+                       and intentos < max_intentos):
+                    intentos += 1
+                    IDEAS_INTENTADAS.incrementar()
+                    
+                    # Incorporar tendencias recién recopiladas
+                    if actualizar_tendencias:
+                        tendencias = actualizar_tendencias() or tendencias
+                    
+                    # Selección inteligente de parámetros
+                    if filtros.get("recorrer_tendencias"):
+                        # Recorrer las tendencias en orden para cubrirlas todas
+                        tema = tendencias[(intentos - 1) % len(tendencias)]
+                    else:
+                        tema = random.choice(tendencias)
+                    red_social = random.choice(filtros["redes_incluir"])
+                    nicho = random.choice(filtros["nichos_incluir"])
+                    
+                    # Enriquecer el tema según el nicho
+                    tema_enriquecido = self.enriquecer_tema(tema, nicho)
+                    
+                    print(f"   💡 Idea {intentos}: {tema_enriquecido} → {red_social} ({nicho})")
+                    
+                    # Generar idea
+                    futuro = executor.submit(self._generar_idea_perfilada, intentos, tema_enriquecido, red_social, nicho)
+                    pendientes[futuro] = (intentos, tema)
                 
-                # Aplicar filtros
-                if score >= filtros["score_minimo"]:
-                    # Verificar duplicados si está habilitado
-                    if filtros["evitar_duplicados"]:
-                        titulo_actual = idea.get("titulo", "").lower()
-                        es_duplicado = any(
-                            titulo_actual in idea_existente.get("titulo", "").lower() 
-                            or idea_existente.get("titulo", "").lower() in titulo_actual
-                            for idea_existente in ideas_generadas
-                        )
-                        
-                        if es_duplicado:
-                            print(f"      ⚠️ Duplicado detectado, descartando")
-                            continue
+                COLA.fijar(len(pendientes), cola="generacion")
+                if not pendientes:
+                    break
+                
+                completados, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in completados:
+                    numero, tema = pendientes.pop(futuro)
+                    idea = futuro.result()
+                    # Con peticiones en paralelo, indicar a qué idea corresponde cada resultado
+                    prefijo = f"[{numero}] " if concurrencia > 1 else ""
                     
-                    ideas_generadas.append(idea)
-                    ideas_exitosas += 1
-                    print(f"      ✅ Aprobada (Score: {score})")
-                else:
-                    print(f"      ❌ Score bajo ({score}), descartando")
-            else:
-                print(f"      ❌ Error en generación")
+                    if idea:
+                        # Calcular score
+                        with tramo("puntuar", "idea", numero=numero):
+                            score = self.calcular_score_idea(idea)
+                        idea["score_calidad"] = score
+                        idea["tendencia_origen"] = tema
+                        
+                        # Aplicar filtros
+                        if score >= filtros["score_minimo"]:
+                            # Verificar duplicados si está habilitado
+                            if filtros["evitar_duplicados"]:
+                                titulo_actual = idea.get("titulo", "").lower()
+                                with tramo("deduplicado", "idea", numero=numero):
+                                    es_duplicado = any(
+                                        titulo_actual in idea_existente.get("titulo", "").lower() 
+                                        or idea_existente.get("titulo", "").lower() in titulo_actual
+                                        for idea_existente in ideas_generadas
+                                    )
+                                
+                                if es_duplicado:
+                                    IDEAS_RECHAZADAS.incrementar(motivo="duplicado")
+                                    print(f"      ⚠️ {prefijo}Duplicado detectado, descartando")
+                                    continue
+                            
+                            ideas_generadas.append(idea)
+                            ideas_exitosas += 1
+                            IDEAS_ACEPTADAS.incrementar(red_social=idea.get("red_social", ""), nicho=idea.get("nicho", ""))
+                            if al_aceptar_idea:
+                                with tramo("aceptar_idea", "idea", numero=numero):
+                                    al_aceptar_idea(idea)
+                            print(f"      ✅ {prefijo}Aprobada (Score: {score})")
+                        else:
+                            IDEAS_RECHAZADAS.incrementar(motivo="score_bajo")
+                            print(f"      ❌ {prefijo}Score bajo ({score}), descartando")
+                    else:
+                        IDEAS_RECHAZADAS.incrementar(motivo="error_generacion")
+                        print(f"      ❌ {prefijo}Error en generación")
+        
+        self.pool_claves.mostrar_uso()
         
         return ideas_generadas
     
@@ -445,8 +558,13 @@ class GeneradorIdeas:
         palabras_clave = nichos[nicho]["palabras_clave"]
         subtemas = nichos[nicho]["subtemas"]
         
+        # Si el tema ya contiene una palabra clave del nicho, no se antepone otra
+        conjunto = nichos[nicho].get("palabras_clave_conjunto", frozenset())
+        tema_minusculas = tema.lower()
+        ya_tiene_clave = tema_minusculas in conjunto or not conjunto.isdisjoint(tema_minusculas.split())
+        
         # Seleccionar aleatoriamente un enfoque
-        if random.random() < 0.5:
+        if not ya_tiene_clave and random.random() < 0.5:
             # Usar palabra clave
             palabra_clave = random.choice(palabras_clave)
             return f"{palabra_clave} {tema}"
@@ -0,0 +1,237 @@
+"""
+Módulo con la representación compacta de las ideas.
+
+Una idea era un diccionario anidado por idea: la metadata repetía en cada
+idea el estilo, la audiencia y la lista de palabras clave de su nicho, y el
+formato de ElevenLabs repetía los bloques fijos de configuración e
+instrucciones de voz. Idea guarda sus campos en __slots__, la metadata
+comparte un único bloque por nicho (MetadataIdea) y los bloques fijos se
+internan (compartido), de modo que miles de ideas en memoria no duplican los
+mismos valores. Los formatos siguen adjuntándose como FormatosIA, que no
+calcula nada hasta que se lee.
+
+Idea y MetadataIdea se comportan como diccionarios (idea["titulo"],
+idea.get(...), "formatos_ia" in idea, asignación de campos nuevos...), así que
+el exportador, la tabla de ideas y main.py las usan igual que antes. Las ideas
+no se serializan enteras: salen del proceso como filas planas (valores_idea),
+que leen cada campo por su clave.
+"""
+
+import threading
+import weakref
+from collections.abc import Mapping, MutableMapping
+
+# Campos con hueco propio en Idea (cualquier otra clave se guarda aparte)
+CAMPOS_IDEA = (
+    "tema", "red_social", "nicho", "titulo", "descripcion", "puntos_clave", "hashtags", "hook_inicial",
+    "tipo_contenido", "metadata", "enfoque", "estilo", "audiencia_objetivo", "duracion", "elementos_visuales",
+    "score_calidad", "tendencia_origen", "formatos_ia"
+)
+_CAMPOS_IDEA = frozenset(CAMPOS_IDEA)
+
+_compartidos = weakref.WeakValueDictionary()
+_lock_compartidos = threading.Lock()
+
+
+def _clave_compartido(valor):
+    """Clave hashable de un valor (distingue tipos: True no es 1)"""
+    if isinstance(valor, Mapping):
+        return dict, tuple((clave, _clave_compartido(elemento)) for clave, elemento in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return tuple, tuple(map(_clave_compartido, valor))
+    return type(valor), valor
+
+
+def _inmutable(valor):
+    """Convierte listas en tuplas y diccionarios en DictCompartido (a cualquier profundidad)"""
+    if isinstance(valor, Mapping):
+        return compartido(valor)
+    if isinstance(valor, (list, tuple)):
+        return tuple(map(_inmutable, valor))
+    return valor
+
+
+class DictCompartido(dict):
+    """Diccionario de solo lectura compartido entre ideas (ver compartido).
+
+    Es un dict, así que se serializa a JSON y se recorre como cualquier otro;
+    al copiarlo o enviarlo a otro proceso se vuelve a internar.
+    """
+
+    def _solo_lectura(self, *args, **kwargs):
+        raise TypeError("❌ Este bloque lo comparten varias ideas y no se puede modificar (copiarlo con dict())")
+
+    __setitem__ = __delitem__ = __ior__ = _solo_lectura
+    update = pop = popitem = clear = setdefault = _solo_lectura
+
+    def __reduce__(self):
+        return compartido, (dict(self),)
+
+
+def compartido(datos):
+    """Devuelve el DictCompartido con esos datos, el mismo objeto para datos iguales
+
+    Solo tiene sentido para bloques que se repiten en muchas ideas (los de un
+    nicho o un estilo de voz). Las listas se guardan como tuplas. Los bloques
+    que ya no usa ninguna idea se liberan.
+    """
+    clave = _clave_compartido(datos)
+    with _lock_compartidos:
+        bloque = _compartidos.get(clave)
+        if bloque is None:
+            bloque = DictCompartido((nombre, _inmutable(valor)) for nombre, valor in datos.items())
+            _compartidos[clave] = bloque
+    return bloque
+
+
+def metadata_nicho(nicho, info_nicho=None):
+    """Bloque compartido de la metadata de las ideas de un nicho
+
+    Args:
+        nicho: Nombre del nicho (None para ideas sin nicho)
+        info_nicho: Configuración del nicho (None si no está configurado)
+    """
+    datos = {"categoria": nicho if nicho else "general"}
+    if info_nicho is not None:
+        datos.update(
+            estilo=info_nicho.get("estilo", "general"),
+            audiencia=info_nicho.get("audiencia", "general"),
+            palabras_clave=tuple(info_nicho.get("palabras_clave", ()))
+        )
+    return compartido(datos)
+
+
+class MetadataIdea(MutableMapping):
+    """Metadata de una idea: su fecha más el bloque compartido de su nicho.
+
+    Los valores asignados después se guardan en la propia idea y tapan a los
+    del bloque compartido, que nunca se modifica.
+    """
+
+    __slots__ = ("fecha_generacion", "comun", "_propios")
+
+    def __init__(self, fecha_generacion, comun=None, **propios):
+        """Constructor de la clase MetadataIdea.
+
+        Args:
+            fecha_generacion: Fecha de generación de la idea
+            comun: Bloque compartido del nicho (ver metadata_nicho)
+            **propios: Valores propios de esta idea
+        """
+        self.fecha_generacion = fecha_generacion
+        self.comun = comun if comun is not None else compartido({})
+        self._propios = propios or None
+
+    def __getitem__(self, clave):
+        if clave == "fecha_generacion":
+            return self.fecha_generacion
+        if self._propios is not None and clave in self._propios:
+            return self._propios[clave]
+        return self.comun[clave]
+
+    def get(self, clave, defecto=None):
+        if clave == "fecha_generacion":
+            return self.fecha_generacion
+        if self._propios is not None and clave in self._propios:
+            return self._propios[clave]
+        return self.comun.get(clave, defecto)
+
+    def __setitem__(self, clave, valor):
+        if clave == "fecha_generacion":
+            self.fecha_generacion = valor
+            return
+        if self._propios is None:
+            self._propios = {}
+        self._propios[clave] = valor
+
+    def __delitem__(self, clave):
+        if self._propios is not None and clave in self._propios:
+            del self._propios[clave]
+        elif clave == "fecha_generacion" or clave in self.comun:
+            raise TypeError(f"❌ '{clave}' es parte fija de la metadata y no se puede borrar")
+        else:
+            raise KeyError(clave)
+
+    def __iter__(self):
+        yield "fecha_generacion"
+        propios = self._propios or {}
+        yield from (clave for clave in self.comun if clave not in propios)
+        yield from propios
+
+    def __len__(self):
+        propios = self._propios or {}
+        return 1 + len(propios) + sum(1 for clave in self.comun if clave not in propios)
+
+    def __repr__(self):
+        return f"MetadataIdea({dict(self)!r})"
+
+
+class Idea(MutableMapping):
+    """Idea de video con los campos en __slots__ y acceso de diccionario.
+
+    Los campos de CAMPOS_IDEA ocupan un hueco fijo (un campo sin asignar no
+    está en la idea, igual que una clave ausente en un diccionario); cualquier
+    otra clave se guarda en un diccionario aparte que solo se crea si hace falta.
+    """
+
+    __slots__ = CAMPOS_IDEA + ("_extra",)
+
+    def __init__(self, datos=(), **campos):
+        """Constructor de la clase Idea.
+
+        Args:
+            datos: Diccionario (o pares clave-valor) con los campos de la idea
+            **campos: Campos de la idea
+        """
+        self._extra = None
+        self.update(datos, **campos)
+
+    def __getitem__(self, clave):
+        if clave in _CAMPOS_IDEA:
+            try:
+                return getattr(self, clave)
+            except AttributeError:
+                raise KeyError(clave) from None
+        if self._extra is not None:
+            return self._extra[clave]
+        raise KeyError(clave)
+
+    def get(self, clave, defecto=None):
+        if clave in _CAMPOS_IDEA:
+            return getattr(self, clave, defecto)
+        return defecto if self._extra is None else self._extra.get(clave, defecto)
+
+    def __contains__(self, clave):
+        if clave in _CAMPOS_IDEA:
+            return hasattr(self, clave)
+        return self._extra is not None and clave in self._extra
+
+    def __setitem__(self, clave, valor):
+        if clave in _CAMPOS_IDEA:
+            setattr(self, clave, valor)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[clave] = valor
+
+    def __delitem__(self, clave):
+        if clave in _CAMPOS_IDEA:
+            try:
+                delattr(self, clave)
+            except AttributeError:
+                raise KeyError(clave) from None
+        elif self._extra is not None:
+            del self._extra[clave]
+        else:
+            raise KeyError(clave)
+
+    def __iter__(self):
+        yield from (campo for campo in CAMPOS_IDEA if hasattr(self, campo))
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Idea({dict(self)!r})"
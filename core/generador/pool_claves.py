@@ -0,0 +1,228 @@
+"""
+Módulo con el pool de API keys de Gemini.
+
+Cada clave tiene dos cubos de tokens, uno de peticiones por minuto y otro de
+tokens por minuto, que se rellenan de forma continua según su cuota. Cada
+petición usa la clave con más cuota disponible; si ninguna tiene cuota se
+espera a la primera que la recupere. Una clave que recibe un error de cuota
+(429) pasa un tiempo de enfriamiento, que se duplica si vuelve a ocurrir. Así
+el rendimiento total crece con el número de claves.
+"""
+
+import threading
+import time
+
+
+def estimar_tokens(texto):
+    """Estimación rápida de tokens de un texto (~4 caracteres por token)"""
+    return len(texto) // 4 + 1
+
+
+class CuboTokens:
+    """Cubo de tokens que se rellena a ritmo constante hasta su capacidad."""
+
+    def __init__(self, capacidad, por_minuto, ahora):
+        """Constructor de la clase CuboTokens.
+
+        Args:
+            capacidad: Tokens máximos acumulables
+            por_minuto: Tokens que se recuperan por minuto
+            ahora: Instante inicial (reloj monotónico)
+        """
+        self.capacidad = capacidad
+        self.por_segundo = por_minuto / 60.0
+        self.disponibles = float(capacidad)
+        self._actualizado = ahora
+
+    def rellenar(self, ahora):
+        """Suma los tokens recuperados desde la última actualización"""
+        self.disponibles = min(self.capacidad, self.disponibles + (ahora - self._actualizado) * self.por_segundo)
+        self._actualizado = ahora
+
+    def espera(self, cantidad):
+        """Segundos hasta que haya cantidad tokens (0 si ya los hay)"""
+        cantidad = min(cantidad, self.capacidad)
+        if self.disponibles >= cantidad:
+            return 0.0
+        return (cantidad - self.disponibles) / self.por_segundo
+
+    def consumir(self, cantidad):
+        """Descuenta tokens (el saldo puede quedar negativo si se consumió más de lo reservado)"""
+        self.disponibles -= cantidad
+
+
+class ClaveAPI:
+    """Estado y uso de una clave del pool."""
+
+    def __init__(self, clave, peticiones_por_minuto, tokens_por_minuto, ahora):
+        """Constructor de la clase ClaveAPI.
+
+        Args:
+            clave: API key
+            peticiones_por_minuto: Cuota de peticiones por minuto de la clave
+            tokens_por_minuto: Cuota de tokens por minuto de la clave
+            ahora: Instante inicial (reloj monotónico)
+        """
+        self.clave = clave
+        self.nombre = f"…{clave[-4:]}"
+        self.peticiones_disponibles = CuboTokens(peticiones_por_minuto, peticiones_por_minuto, ahora)
+        self.tokens_disponibles = CuboTokens(tokens_por_minuto, tokens_por_minuto, ahora)
+        self.enfriada_hasta = 0.0
+        self.penalizaciones = 0
+        self.en_curso = 0
+        self.peticiones = 0
+        self.tokens = 0
+        self.limitaciones = 0
+        self.errores = 0
+
+    def espera(self, tokens, ahora):
+        """Segundos hasta que la clave pueda atender una petición de tokens tokens"""
+        self.peticiones_disponibles.rellenar(ahora)
+        self.tokens_disponibles.rellenar(ahora)
+        return max(
+            self.enfriada_hasta - ahora,
+            self.peticiones_disponibles.espera(1),
+            self.tokens_disponibles.espera(tokens)
+        )
+
+    def holgura(self):
+        """Fracción de cuota libre (la menor de peticiones y tokens)"""
+        return min(
+            self.peticiones_disponibles.disponibles / self.peticiones_disponibles.capacidad,
+            self.tokens_disponibles.disponibles / self.tokens_disponibles.capacidad
+        )
+
+
+class PoolClavesAPI:
+    """Reparte las peticiones entre varias API keys respetando la cuota de cada una.
+
+    Es seguro usarlo desde varios hilos: adquirir() bloquea hasta que alguna
+    clave tiene cuota y liberar() devuelve a la clave los tokens reservados
+    que no se usaron.
+    """
+
+    def __init__(self, claves, peticiones_por_minuto=15, tokens_por_minuto=1000000,
+                 enfriamiento=60.0, enfriamiento_maximo=600.0, llamadas_por_clave=1, reloj=time.monotonic):
+        """Constructor de la clase PoolClavesAPI.
+
+        Args:
+            claves: Lista de API keys
+            peticiones_por_minuto: Cuota de peticiones por minuto de cada clave
+            tokens_por_minuto: Cuota de tokens por minuto de cada clave
+            enfriamiento: Segundos sin usar una clave tras un error de cuota
+                (se duplica con cada error seguido, hasta enfriamiento_maximo)
+            enfriamiento_maximo: Límite del enfriamiento
+            llamadas_por_clave: Peticiones simultáneas por clave (ver concurrencia)
+            reloj: Función que devuelve el instante actual en segundos
+        """
+        if not claves:
+            raise ValueError("❌ El pool de API keys necesita al menos una clave")
+        self.reloj = reloj
+        ahora = reloj()
+        self.claves = [ClaveAPI(clave, peticiones_por_minuto, tokens_por_minuto, ahora) for clave in dict.fromkeys(claves)]
+        self.enfriamiento = enfriamiento
+        self.enfriamiento_maximo = enfriamiento_maximo
+        self.concurrencia = len(self.claves) * llamadas_por_clave
+        self._condicion = threading.Condition()
+
+    def adquirir(self, tokens_estimados=0, timeout=None):
+        """Reserva una petición y tokens_estimados tokens en la clave con más cuota libre
+
+        Args:
+            tokens_estimados: Tokens que se reservan (entrada + salida máxima)
+            timeout: Segundos máximos de espera (None espera lo necesario)
+
+        Returns:
+            ClaveAPI reservada (hay que devolverla con liberar o marcar_limitada)
+
+        Raises:
+            TimeoutError: Si ninguna clave tiene cuota antes del timeout
+        """
+        limite = None if timeout is None else self.reloj() + timeout
+        with self._condicion:
+            while True:
+                ahora = self.reloj()
+                esperas = [(clave.espera(tokens_estimados, ahora), clave) for clave in self.claves]
+                libres = [clave for espera, clave in esperas if espera <= 0]
+                if libres:
+                    clave = max(libres, key=lambda clave: (clave.holgura(), -clave.en_curso))
+                    clave.peticiones_disponibles.consumir(1)
+                    clave.tokens_disponibles.consumir(tokens_estimados)
+                    clave.en_curso += 1
+                    return clave
+
+                espera = min(espera for espera, _ in esperas)
+                if limite is not None:
+                    if ahora >= limite:
+                        raise TimeoutError("Ninguna API key tiene cuota disponible")
+                    espera = min(espera, limite - ahora)
+                self._condicion.wait(espera)
+
+    def liberar(self, clave, tokens_usados=None, tokens_reservados=0, error=False):
+        """Devuelve una clave tras la petición y ajusta su cubo de tokens al uso real
+
+        Args:
+            clave: ClaveAPI devuelta por adquirir
+            tokens_usados: Tokens consumidos (None si no se conocen: se da por
+                bueno lo reservado)
+            tokens_reservados: Tokens reservados en adquirir
+            error: Si la petición falló por un motivo distinto de la cuota
+        """
+        with self._condicion:
+            clave.en_curso -= 1
+            clave.peticiones += 1
+            if error:
+                clave.errores += 1
+            else:
+                clave.penalizaciones = 0
+            if tokens_usados is not None:
+                clave.tokens_disponibles.consumir(tokens_usados - tokens_reservados)
+                clave.tokens += tokens_usados
+            else:
+                clave.tokens += tokens_reservados
+            self._condicion.notify_all()
+
+    def marcar_limitada(self, clave, segundos=None):
+        """Pone en enfriamiento una clave que recibió un error de cuota
+
+        Args:
+            clave: ClaveAPI devuelta por adquirir
+            segundos: Enfriamiento indicado por el servidor (por defecto, el
+                enfriamiento del pool duplicado por cada error seguido)
+        """
+        with self._condicion:
+            if segundos is None:
+                segundos = min(self.enfriamiento * 2 ** clave.penalizaciones, self.enfriamiento_maximo)
+            clave.en_curso -= 1
+            clave.peticiones += 1
+            clave.limitaciones += 1
+            clave.penalizaciones += 1
+            clave.enfriada_hasta = self.reloj() + segundos
+            # La cuota real está agotada: no contar con lo que quedaba en los cubos
+            clave.peticiones_disponibles.disponibles = min(clave.peticiones_disponibles.disponibles, 0)
+            self._condicion.notify_all()
+
+    def uso(self):
+        """Uso de cada clave: peticiones, tokens, errores de cuota y enfriamiento restante"""
+        ahora = self.reloj()
+        with self._condicion:
+            return [
+                {
+                    "clave": clave.nombre,
+                    "peticiones": clave.peticiones,
+                    "tokens": clave.tokens,
+                    "limitaciones": clave.limitaciones,
+                    "errores": clave.errores,
+                    "en_curso": clave.en_curso,
+                    "enfriamiento": max(0.0, clave.enfriada_hasta - ahora)
+                }
+                for clave in self.claves
+            ]
+
+    def mostrar_uso(self):
+        """Imprime el uso de cada clave"""
+        print(f"🔑 Uso de las API keys ({len(self.claves)}):")
+        for uso in self.uso():
+            enfriamiento = f" | ❄️ enfriamiento {uso['enfriamiento']:.0f}s" if uso["enfriamiento"] else ""
+            print(f"   {uso['clave']}: {uso['peticiones']} peticiones | ~{uso['tokens']} tokens "
+                  f"| {uso['limitaciones']} límites de cuota | {uso['errores']} errores{enfriamiento}")
@@ -0,0 +1,3 @@
+"""
+Módulo de monitorización: perfilado por etapas y métricas de ejecución.
+"""
@@ -0,0 +1,318 @@
+"""
+Módulo con el registro de métricas de ejecución.
+
+Contadores, indicadores e histogramas con etiquetas, seguros entre hilos, que
+se exportan en el formato de texto de Prometheus. En los modos de larga
+duración se sirven en un puerto local (GET /metrics) para que Prometheus los
+recoja; en las ejecuciones puntuales se vuelcan a un archivo al terminar
+(compatible con el textfile collector de node_exporter).
+
+Las métricas del generador, del recopilador de tendencias y del exportador se
+definen al final del módulo sobre el registro global REGISTRO.
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import perf_counter
+
+# Prefijo común de todas las métricas
+PREFIJO = "generador_ideas_"
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+# Límites de los histogramas (segundos y tokens)
+LIMITES_LATENCIA = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+LIMITES_TOKENS = (64, 128, 256, 512, 1024, 2048, 4096, 8192)
+LIMITES_EXPORTACION = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _escapar(valor):
+    """Escapa el valor de una etiqueta para el formato de texto de Prometheus"""
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _numero(valor):
+    """Formatea un valor numérico como lo espera Prometheus"""
+    if valor == float("inf"):
+        return "+Inf"
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class Metrica:
+    """Base de las métricas: nombre, ayuda, etiquetas y un valor por combinación de etiquetas."""
+
+    tipo = None
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        """Constructor de la clase Metrica.
+
+        Args:
+            nombre: Nombre de la métrica (sin el prefijo)
+            ayuda: Descripción que acompaña a la métrica
+            etiquetas: Nombres de las etiquetas que distinguen sus series
+        """
+        self.nombre = PREFIJO + nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def _clave(self, etiquetas):
+        """Valores de las etiquetas en el orden declarado"""
+        if len(etiquetas) != len(self.etiquetas):
+            raise ValueError(f"❌ {self.nombre} necesita las etiquetas {', '.join(self.etiquetas) or '(ninguna)'}")
+        try:
+            return tuple(str(etiquetas[nombre]) for nombre in self.etiquetas)
+        except KeyError as e:
+            raise ValueError(f"❌ {self.nombre} no tiene la etiqueta {e}")
+
+    def _etiquetas_texto(self, clave, extra=None):
+        """Etiquetas en formato {nombre="valor",...} (vacío si no hay)"""
+        pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(self.etiquetas, clave)]
+        if extra:
+            pares.append(extra)
+        return "{" + ",".join(pares) + "}" if pares else ""
+
+    def valor(self, **etiquetas):
+        """Valor actual de la serie con esas etiquetas (0 si no existe)"""
+        with self._lock:
+            return self._valores.get(self._clave(etiquetas), 0)
+
+    def muestras(self):
+        """Líneas de texto con el valor de cada serie"""
+        with self._lock:
+            valores = sorted(self._valores.items())
+        return [f"{self.nombre}{self._etiquetas_texto(clave)} {_numero(valor)}" for clave, valor in valores]
+
+    def exponer(self):
+        """Texto de la métrica en el formato de Prometheus"""
+        return "\n".join([f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}", *self.muestras()])
+
+
+class Contador(Metrica):
+    """Valor que solo aumenta (p. ej. ideas aceptadas)."""
+
+    tipo = "counter"
+
+    def incrementar(self, cantidad=1, **etiquetas):
+        """Suma cantidad (no negativa) a la serie con esas etiquetas"""
+        if cantidad < 0:
+            raise ValueError(f"❌ Un contador no puede disminuir ({self.nombre})")
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+
+class Indicador(Metrica):
+    """Valor que sube y baja (p. ej. peticiones en curso)."""
+
+    tipo = "gauge"
+
+    def fijar(self, valor, **etiquetas):
+        """Fija el valor de la serie con esas etiquetas"""
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = valor
+
+    def incrementar(self, cantidad=1, **etiquetas):
+        """Suma cantidad a la serie con esas etiquetas"""
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+    def decrementar(self, cantidad=1, **etiquetas):
+        """Resta cantidad a la serie con esas etiquetas"""
+        self.incrementar(-cantidad, **etiquetas)
+
+    @contextmanager
+    def en_curso(self, **etiquetas):
+        """Suma 1 mientras dura el bloque"""
+        self.incrementar(1, **etiquetas)
+        try:
+            yield
+        finally:
+            self.decrementar(1, **etiquetas)
+
+
+class Histograma(Metrica):
+    """Distribución de observaciones en intervalos acumulados (p. ej. latencias)."""
+
+    tipo = "histogram"
+
+    def __init__(self, nombre, ayuda, limites, etiquetas=()):
+        """Constructor de la clase Histograma.
+
+        Args:
+            nombre: Nombre de la métrica (sin el prefijo)
+            ayuda: Descripción que acompaña a la métrica
+            limites: Límites superiores de los intervalos, en orden creciente
+                (se añade +Inf)
+            etiquetas: Nombres de las etiquetas que distinguen sus series
+        """
+        super().__init__(nombre, ayuda, etiquetas)
+        self.limites = tuple(sorted(limites)) + (float("inf"),)
+
+    def observar(self, valor, **etiquetas):
+        """Registra una observación en la serie con esas etiquetas"""
+        clave = self._clave(etiquetas)
+        posicion = bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._valores.get(clave)
+            if serie is None:
+                serie = self._valores[clave] = [[0] * len(self.limites), 0.0, 0]
+            serie[0][posicion] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    @contextmanager
+    def medir(self, **etiquetas):
+        """Observa los segundos que dura el bloque"""
+        inicio = perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(perf_counter() - inicio, **etiquetas)
+
+    def valor(self, **etiquetas):
+        """Número de observaciones y suma de la serie con esas etiquetas"""
+        with self._lock:
+            serie = self._valores.get(self._clave(etiquetas))
+            return (serie[2], serie[1]) if serie else (0, 0.0)
+
+    def muestras(self):
+        """Líneas de texto con los intervalos acumulados, la suma y el número de cada serie"""
+        with self._lock:
+            series = sorted((clave, (list(cubos), suma, total)) for clave, (cubos, suma, total) in self._valores.items())
+        lineas = []
+        for clave, (cubos, suma, total) in series:
+            acumulado = 0
+            for limite, cantidad in zip(self.limites, cubos):
+                acumulado += cantidad
+                etiquetas = self._etiquetas_texto(clave, f'le="{_numero(limite)}"')
+                lineas.append(f"{self.nombre}_bucket{etiquetas} {acumulado}")
+            lineas.append(f"{self.nombre}_sum{self._etiquetas_texto(clave)} {_numero(suma)}")
+            lineas.append(f"{self.nombre}_count{self._etiquetas_texto(clave)} {total}")
+        return lineas
+
+
+class RegistroMetricas:
+    """Conjunto de métricas que se exponen juntas."""
+
+    def __init__(self):
+        """Constructor de la clase RegistroMetricas."""
+        self.metricas = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, metrica):
+        """Añade una métrica o devuelve la ya registrada con el mismo nombre y tipo"""
+        with self._lock:
+            existente = self.metricas.get(metrica.nombre)
+            if existente is None:
+                self.metricas[metrica.nombre] = metrica
+                return metrica
+        if type(existente) is not type(metrica) or existente.etiquetas != metrica.etiquetas:
+            raise ValueError(f"❌ La métrica {metrica.nombre} ya existe con otro tipo o etiquetas")
+        return existente
+
+    def contador(self, nombre, ayuda, etiquetas=()):
+        """Crea (o devuelve) un Contador"""
+        return self._registrar(Contador(nombre, ayuda, etiquetas))
+
+    def indicador(self, nombre, ayuda, etiquetas=()):
+        """Crea (o devuelve) un Indicador"""
+        return self._registrar(Indicador(nombre, ayuda, etiquetas))
+
+    def histograma(self, nombre, ayuda, limites, etiquetas=()):
+        """Crea (o devuelve) un Histograma"""
+        return self._registrar(Histograma(nombre, ayuda, limites, etiquetas))
+
+    def exponer(self):
+        """Todas las métricas en el formato de texto de Prometheus"""
+        with self._lock:
+            metricas = list(self.metricas.values())
+        return "\n".join(metrica.exponer() for metrica in metricas) + "\n"
+
+    def guardar(self, ruta):
+        """Vuelca las métricas a un archivo de texto (escritura atómica)
+
+        Returns:
+            Ruta del archivo escrito
+        """
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        temporal = ruta.with_name(f"{ruta.name}.{os.getpid()}.tmp")
+        temporal.write_text(self.exponer(), encoding="utf-8")
+        os.replace(temporal, ruta)
+        return ruta
+
+    def servir(self, puerto=9464, host="127.0.0.1"):
+        """Sirve las métricas en http://host:puerto/metrics desde un hilo en segundo plano
+
+        Returns:
+            Servidor HTTP (llamar a shutdown() para detenerlo)
+        """
+        registro = self
+
+        class ManejadorMetricas(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                cuerpo = registro.exponer().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", TIPO_CONTENIDO)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato, *args):
+                # Sin una línea por cada recogida de Prometheus
+                pass
+
+        servidor = ThreadingHTTPServer((host, puerto), ManejadorMetricas)
+        servidor.daemon_threads = True
+        threading.Thread(target=servidor.serve_forever, name="metricas-http", daemon=True).start()
+        return servidor
+
+
+# Registro global con las métricas de la aplicación
+REGISTRO = RegistroMetricas()
+
+# Generación de ideas
+IDEAS_INTENTADAS = REGISTRO.contador("ideas_intentadas_total", "Ideas pedidas a la IA")
+IDEAS_ACEPTADAS = REGISTRO.contador("ideas_aceptadas_total", "Ideas aprobadas", ("red_social", "nicho"))
+IDEAS_RECHAZADAS = REGISTRO.contador(
+    "ideas_rechazadas_total", "Ideas descartadas por motivo (score_bajo, duplicado, error_generacion)", ("motivo",)
+)
+COLA = REGISTRO.indicador(
+    "cola_profundidad", "Elementos en espera (generacion: ideas pedidas sin respuesta; excel: filas por escribir)",
+    ("cola",)
+)
+
+# Gemini
+PETICIONES_LLM_EN_CURSO = REGISTRO.indicador("gemini_peticiones_en_curso", "Peticiones a Gemini en curso")
+PETICIONES_LLM = REGISTRO.contador(
+    "gemini_peticiones_total", "Peticiones a Gemini por resultado (ok, cuota, error)", ("resultado",)
+)
+LATENCIA_LLM = REGISTRO.histograma("gemini_latencia_segundos", "Duración de las peticiones a Gemini", LIMITES_LATENCIA)
+TOKENS_LLM = REGISTRO.histograma(
+    "gemini_tokens", "Tokens estimados por petición (entrada y salida)", LIMITES_TOKENS, ("tipo",)
+)
+
+# Tendencias
+DESCARGAS_TENDENCIAS = REGISTRO.contador(
+    "tendencias_descargas_total", "Descargas de feeds de tendencias por fuente y resultado (ok, error_http, error)",
+    ("fuente", "resultado")
+)
+
+# Exportación
+TIEMPO_EXPORTACION = REGISTRO.histograma(
+    "exportacion_segundos", "Duración de cada exportación por formato", LIMITES_EXPORTACION, ("formato",)
+)
+IDEAS_EXPORTADAS = REGISTRO.contador("ideas_exportadas_total", "Ideas escritas por formato", ("formato",))
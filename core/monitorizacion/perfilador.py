@@ -0,0 +1,216 @@
+"""
+Módulo con el perfilador por etapas.
+
+Registra un tramo (inicio y duración) por cada etapa de la ejecución
+(recopilación de tendencias, llamadas a Gemini, procesado de respuestas,
+deduplicado, formatos, exportación...) y por cada idea, en el hilo en que
+ocurre. Los tramos se guardan como eventos de traza de Chrome (JSON), que se
+abren en Perfetto (https://ui.perfetto.dev) o en chrome://tracing.
+Opcionalmente se guarda también un perfil de cProfile del hilo principal y el
+pico de memoria (tracemalloc) de cada etapa.
+
+Mientras el perfilado no está activo, tramo() y perfilado() no registran nada.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+# Categoría de los tramos de etapa (los únicos en los que se mide la memoria)
+ETAPA = "etapa"
+
+_NULO = nullcontext()
+_perfilador = None
+
+
+class Perfilador:
+    """Registro de tramos de ejecución exportable como traza de Chrome."""
+
+    def __init__(self, cprofile=False, memoria=False):
+        """Constructor de la clase Perfilador.
+
+        Args:
+            cprofile: Si es True, perfila también el hilo principal con cProfile
+            memoria: Si es True, mide con tracemalloc el pico de memoria de cada
+                etapa (los hilos comparten el contador, así que las etapas que se
+                solapan con otras son aproximadas)
+        """
+        self.tramos = []
+        self.memoria = memoria
+        self._origen = time.perf_counter_ns()
+        self._hilos = {}
+        self._cerrojo_hilos = threading.Lock()
+        self._pilas = threading.local()
+        self._inicio_tracemalloc = False
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._inicio_tracemalloc = True
+        self._perfil = cProfile.Profile() if cprofile else None
+        if self._perfil is not None:
+            self._perfil.enable()
+
+    def _pila_memoria(self):
+        """Memoria inicial y pico de las etapas abiertas en el hilo actual"""
+        pila = getattr(self._pilas, "pila", None)
+        if pila is None:
+            pila = self._pilas.pila = []
+        return pila
+
+    @contextmanager
+    def tramo(self, nombre, categoria=ETAPA, **argumentos):
+        """Registra la duración del bloque como un tramo
+
+        Args:
+            nombre: Nombre del tramo (p. ej. "gemini.peticion")
+            categoria: Categoría del tramo (etapa, idea, gemini, tendencias...)
+            **argumentos: Datos que se guardan con el tramo
+        """
+        hilo = threading.get_ident()
+        if hilo not in self._hilos:
+            # Dos hilos nuevos a la vez no deben recibir el mismo número
+            with self._cerrojo_hilos:
+                if hilo not in self._hilos:
+                    self._hilos[hilo] = (len(self._hilos) + 1, threading.current_thread().name)
+
+        pila = None
+        if self.memoria and categoria == ETAPA:
+            # El pico hasta ahora pertenece a la etapa que contiene a esta
+            pila = self._pila_memoria()
+            actual, pico = tracemalloc.get_traced_memory()
+            if pila:
+                pila[-1][1] = max(pila[-1][1], pico)
+            tracemalloc.reset_peak()
+            pila.append([actual, actual])
+
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duracion = time.perf_counter_ns() - inicio
+            if pila is not None:
+                inicial, pico = pila.pop()
+                pico = max(pico, tracemalloc.get_traced_memory()[1])
+                if pila:
+                    pila[-1][1] = max(pila[-1][1], pico)
+                # Memoria que llegó a ocupar la etapa por encima de la que había al empezar
+                argumentos["memoria_pico_kb"] = round((pico - inicial) / 1024)
+            self.tramos.append((nombre, categoria, hilo, inicio - self._origen, duracion, argumentos))
+
+    def detener(self):
+        """Detiene cProfile y tracemalloc (si los inició el perfilador)"""
+        if self._perfil is not None:
+            self._perfil.disable()
+        if self._inicio_tracemalloc:
+            tracemalloc.stop()
+            self._inicio_tracemalloc = False
+
+    def eventos_chrome(self):
+        """Tramos en el formato de eventos de traza de Chrome (tiempos en microsegundos)"""
+        pid = os.getpid()
+        with self._cerrojo_hilos:
+            hilos = dict(self._hilos)
+        eventos = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "generador_ideas"}}]
+        for numero, nombre_hilo in hilos.values():
+            eventos.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": numero, "args": {"name": nombre_hilo}})
+        for nombre, categoria, hilo, inicio, duracion, argumentos in self.tramos:
+            eventos.append({
+                "name": nombre, "cat": categoria, "ph": "X", "pid": pid, "tid": hilos[hilo][0],
+                "ts": inicio / 1000, "dur": duracion / 1000, "args": argumentos
+            })
+        return eventos
+
+    def guardar(self, ruta):
+        """Guarda la traza de Chrome y, si está activo, el perfil de cProfile (.prof)
+
+        Args:
+            ruta: Archivo JSON de la traza
+
+        Returns:
+            Lista de archivos escritos
+        """
+        self.detener()
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({"traceEvents": self.eventos_chrome(), "displayTimeUnit": "ms"}, archivo,
+                      ensure_ascii=False, default=str)
+        archivos = [ruta]
+
+        if self._perfil is not None:
+            ruta_perfil = ruta.with_suffix(".prof")
+            self._perfil.dump_stats(str(ruta_perfil))
+            archivos.append(ruta_perfil)
+        return archivos
+
+    def resumen(self):
+        """Tiempo total, llamadas, máximo y pico de memoria de cada tramo, de mayor a menor tiempo"""
+        totales = defaultdict(lambda: {"llamadas": 0, "total_ms": 0.0, "max_ms": 0.0, "memoria_pico_kb": None})
+        for nombre, categoria, _, _, duracion, argumentos in self.tramos:
+            total = totales[nombre]
+            total["categoria"] = categoria
+            total["llamadas"] += 1
+            total["total_ms"] += duracion / 1e6
+            total["max_ms"] = max(total["max_ms"], duracion / 1e6)
+            if "memoria_pico_kb" in argumentos:
+                total["memoria_pico_kb"] = max(total["memoria_pico_kb"] or 0, argumentos["memoria_pico_kb"])
+        return sorted(({"nombre": nombre, **total} for nombre, total in totales.items()),
+                      key=lambda total: total["total_ms"], reverse=True)
+
+    def mostrar_resumen(self, limite=15):
+        """Imprime los tramos que más tiempo ocupan"""
+        print(f"\n⏱️ PERFIL POR ETAPAS (tiempo acumulado; los tramos en paralelo se suman)")
+        for total in self.resumen()[:limite]:
+            memoria = f" | 🧠 pico {total['memoria_pico_kb']:,} KB" if total["memoria_pico_kb"] is not None else ""
+            print(f"   {total['nombre']:32} {total['total_ms']:10.1f} ms | {total['llamadas']:>5} llamadas "
+                  f"| máx {total['max_ms']:8.1f} ms{memoria}")
+
+
+def activar_perfilado(cprofile=False, memoria=False):
+    """Empieza a registrar tramos (ver Perfilador)
+
+    Returns:
+        El Perfilador activo
+    """
+    global _perfilador
+    _perfilador = Perfilador(cprofile=cprofile, memoria=memoria)
+    return _perfilador
+
+
+def desactivar_perfilado():
+    """Deja de registrar tramos
+
+    Returns:
+        El Perfilador que estaba activo (None si no había ninguno)
+    """
+    global _perfilador
+    perfilador, _perfilador = _perfilador, None
+    if perfilador is not None:
+        perfilador.detener()
+    return perfilador
+
+
+def tramo(nombre, categoria=ETAPA, **argumentos):
+    """Context manager que registra un tramo en el perfilador activo (no hace nada si no hay)"""
+    if _perfilador is None:
+        return _NULO
+    return _perfilador.tramo(nombre, categoria, **argumentos)
+
+
+def perfilado(nombre, categoria=ETAPA):
+    """Decorador que registra cada llamada a la función como un tramo"""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if _perfilador is None:
+                return funcion(*args, **kwargs)
+            with _perfilador.tramo(nombre, categoria):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,180 @@
+"""
+Módulo para extraer frases clave de titulares y resúmenes de noticias.
+
+Puntúa n-gramas con TF-IDF vectorizado (NumPy) frente a un corpus de fondo
+que se va renovando con cada lote, de forma que suben las frases que aparecen
+en muchos titulares ahora pero que no eran habituales en lotes anteriores.
+"""
+
+import json
+import re
+from collections import Counter, deque
+from pathlib import Path
+
+import numpy as np
+
+# Palabras vacías (inglés y español) y ruido habitual de titulares
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers herself him himself his how i if in into is it
+its itself just me more most my myself no nor not now of off on once only or other our ours
+out over own same she should so some such than that the their theirs them then there these
+they this those through to too under until up very was we were what when where which while
+who whom why will with would you your yours new says say said year years day days week
+first last get gets got make makes made may might must one two three us uk via amid top
+watch video live latest update updates news report reports told could would how what
+el la los las un una unos unas de del al y o u e ni que en por para con sin sobre entre
+como más menos muy ya se su sus lo le les es son fue ser ha han hay este esta estos estas
+ese esa eso esos esas otro otra otros otras pero si no sí tras ante desde hasta durante
+según cuando donde quien quién qué cómo cuál año años día días nuevo nueva nuevos nuevas
+""".split())
+
+PATRON_TOKEN = re.compile(r"[^\W\d_][\w'’-]*", re.UNICODE)
+PATRON_SEGMENTO = re.compile(r"[.!?;:|()\[\]\"“”–—]+")
+
+
+class ExtractorFrasesClave:
+    """Clase para extraer las frases clave más relevantes de un lote de textos."""
+
+    def __init__(self, rango_ngramas=(2, 3), max_lotes_fondo=20, min_documentos=2, ruta_corpus=None):
+        """Constructor de la clase ExtractorFrasesClave.
+
+        Args:
+            rango_ngramas: Tupla (mínimo, máximo) de palabras por frase
+            max_lotes_fondo: Lotes anteriores que forman el corpus de fondo
+            min_documentos: Documentos mínimos en los que debe aparecer una frase
+            ruta_corpus: Archivo JSON opcional donde persistir el corpus de fondo
+        """
+        self.rango_ngramas = rango_ngramas
+        self.min_documentos = min_documentos
+        self.ruta_corpus = Path(ruta_corpus) if ruta_corpus else None
+
+        # Corpus de fondo: frecuencias documentales por lote y su agregado
+        self._lotes_fondo = deque(maxlen=max_lotes_fondo)
+        self._df_fondo = Counter()
+        self._documentos_fondo = 0
+
+        self._cargar_corpus()
+
+    def _tokenizar(self, texto):
+        """Divide un texto en frases y cada frase en palabras en minúsculas"""
+        return [PATRON_TOKEN.findall(segmento) for segmento in PATRON_SEGMENTO.split(texto.lower())]
+
+    def _ngramas(self, tokens):
+        """Genera los n-gramas válidos (sin palabras vacías en los extremos)"""
+        minimo, maximo = self.rango_ngramas
+        for n in range(minimo, maximo + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = tokens[i:i + n]
+                if gram[0] in STOPWORDS or gram[-1] in STOPWORDS:
+                    continue
+                if len(gram[0]) < 3 or len(gram[-1]) < 3 or len(set(gram)) < n:
+                    continue
+                yield " ".join(gram)
+
+    def extraer(self, documentos, top=15, actualizar_fondo=True):
+        """Extrae las frases clave con mayor puntuación TF-IDF.
+
+        Args:
+            documentos: Lista de textos (titulares, resúmenes...)
+            top: Número máximo de frases devueltas
+            actualizar_fondo: Si es True, el lote se añade al corpus de fondo
+
+        Returns:
+            Lista de frases ordenadas de mayor a menor relevancia
+        """
+        # Indexar el lote: vocabulario y pares (documento, término)
+        vocabulario = {}
+        ids_documento = []
+        ids_termino = []
+        for indice, documento in enumerate(documentos):
+            for tokens in self._tokenizar(documento):
+                for gram in self._ngramas(tokens):
+                    ids_documento.append(indice)
+                    ids_termino.append(vocabulario.setdefault(gram, len(vocabulario)))
+
+        if not vocabulario:
+            return []
+
+        terminos = list(vocabulario)
+        num_terminos = len(terminos)
+        docs = np.asarray(ids_documento, dtype=np.int64)
+        ids = np.asarray(ids_termino, dtype=np.int64)
+
+        # Frecuencias del lote (equivalente a sumar una matriz dispersa documento x término)
+        tf = np.bincount(ids, minlength=num_terminos)
+        pares_unicos = np.unique(docs * num_terminos + ids)
+        df = np.bincount(pares_unicos % num_terminos, minlength=num_terminos)
+
+        # IDF frente al corpus de fondo
+        df_fondo = np.fromiter((self._df_fondo.get(t, 0) for t in terminos), dtype=np.float64, count=num_terminos)
+        idf = np.log((1.0 + self._documentos_fondo) / (1.0 + df_fondo)) + 1.0
+
+        # Las frases más largas son temas más concretos
+        longitudes = np.fromiter((t.count(" ") + 1 for t in terminos), dtype=np.float64, count=num_terminos)
+        scores = df * (1.0 + np.log(tf / df)) * idf * np.sqrt(longitudes)
+
+        minimo = self.min_documentos if (df >= self.min_documentos).any() else 1
+        scores[df < minimo] = 0.0
+
+        # Seleccionar las mejores frases evitando solapamientos
+        frases = []
+        for indice in np.argsort(-scores, kind="stable"):
+            if scores[indice] <= 0 or len(frases) >= top:
+                break
+            frase = terminos[indice]
+            envuelta = f" {frase} "
+            if any(envuelta in f" {elegida} " or f" {elegida} " in envuelta for elegida in frases):
+                continue
+            frases.append(frase)
+
+        if actualizar_fondo:
+            self._actualizar_fondo(len(documentos), terminos, df)
+
+        return frases
+
+    def _actualizar_fondo(self, num_documentos, terminos, df):
+        """Añade un lote al corpus de fondo descartando el más antiguo"""
+        # Solo se guardan frases repetidas para mantener el corpus compacto
+        repetidas = np.flatnonzero(df >= 2)
+        lote = {"documentos": num_documentos, "df": {terminos[i]: int(df[i]) for i in repetidas}}
+
+        if len(self._lotes_fondo) == self._lotes_fondo.maxlen:
+            antiguo = self._lotes_fondo[0]
+            self._documentos_fondo -= antiguo["documentos"]
+            self._df_fondo.subtract(antiguo["df"])
+            self._df_fondo += Counter()  # Eliminar entradas a cero
+
+        self._lotes_fondo.append(lote)
+        self._documentos_fondo += num_documentos
+        self._df_fondo.update(lote["df"])
+
+        self._guardar_corpus()
+
+    def _cargar_corpus(self):
+        """Carga el corpus de fondo persistido, si existe"""
+        if not self.ruta_corpus or not self.ruta_corpus.exists():
+            return
+
+        try:
+            datos = json.loads(self.ruta_corpus.read_text(encoding="utf-8"))
+            for lote in datos.get("lotes", [])[-self._lotes_fondo.maxlen:]:
+                self._lotes_fondo.append(lote)
+                self._documentos_fondo += lote["documentos"]
+                self._df_fondo.update(lote["df"])
+        except Exception as e:
+            print(f"      ⚠️ No se pudo cargar el corpus de noticias: {e}")
+
+    def _guardar_corpus(self):
+        """Persiste el corpus de fondo si se configuró una ruta"""
+        if not self.ruta_corpus:
+            return
+
+        try:
+            self.ruta_corpus.parent.mkdir(parents=True, exist_ok=True)
+            self.ruta_corpus.write_text(
+                json.dumps({"lotes": list(self._lotes_fondo)}, ensure_ascii=False), encoding="utf-8"
+            )
+        except Exception as e:
+            print(f"      ⚠️ No se pudo guardar el corpus de noticias: {e}")
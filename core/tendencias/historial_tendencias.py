@@ -0,0 +1,155 @@
+"""
+Módulo para llevar el historial de tendencias entre ejecuciones.
+
+Compara cada snapshot de tendencias con los anteriores para marcar cada
+tendencia como nueva, en alza, estable u obsoleta, y recuerda qué tendencias
+ya se usaron para generar ideas. Una tendencia nueva queda pendiente hasta que
+se genera alguna idea con ella, de modo que si la generación falla o no llega
+a usarla sigue en el delta de las ejecuciones siguientes.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+ESTADO_NUEVA = "nueva"
+ESTADO_EN_ALZA = "en_alza"
+ESTADO_ESTABLE = "estable"
+ESTADO_OBSOLETA = "obsoleta"
+
+
+class HistorialTendencias:
+    """Clase para comparar snapshots de tendencias y detectar cambios."""
+
+    def __init__(self, ruta_historial, max_snapshots=30, umbral_obsoleta=5, mejora_en_alza=5):
+        """Constructor de la clase HistorialTendencias.
+
+        Args:
+            ruta_historial: Archivo JSON donde se guarda el historial
+            max_snapshots: Snapshots anteriores que se conservan para comparar
+            umbral_obsoleta: Apariciones en snapshots anteriores a partir de las
+                cuales una tendencia sin mejora se considera obsoleta
+            mejora_en_alza: Posiciones que debe subir una tendencia respecto a su
+                última aparición para considerarse en alza
+        """
+        self.ruta_historial = Path(ruta_historial)
+        self.max_snapshots = max_snapshots
+        self.umbral_obsoleta = umbral_obsoleta
+        self.mejora_en_alza = mejora_en_alza
+
+        self.snapshots = []
+        self.tendencias = {}
+        self._cargar()
+
+    def _cargar(self):
+        """Carga el historial desde disco, si existe"""
+        if not self.ruta_historial.exists():
+            return
+
+        try:
+            datos = json.loads(self.ruta_historial.read_text(encoding="utf-8"))
+            self.snapshots = datos.get("snapshots", [])[-self.max_snapshots:]
+            self.tendencias = datos.get("tendencias", {})
+        except Exception as e:
+            print(f"⚠️ No se pudo cargar el historial de tendencias: {e}")
+
+    def guardar(self):
+        """Guarda el historial en disco"""
+        self.ruta_historial.parent.mkdir(parents=True, exist_ok=True)
+        self.ruta_historial.write_text(
+            json.dumps({"snapshots": self.snapshots, "tendencias": self.tendencias}, ensure_ascii=False, indent=2),
+            encoding="utf-8"
+        )
+
+    def clasificar(self, tendencias):
+        """Clasifica las tendencias de un snapshot frente a los anteriores sin registrarlo.
+
+        Args:
+            tendencias: Lista de tendencias ordenada por relevancia
+
+        Returns:
+            Diccionario tendencia -> estado (nueva, en_alza, estable u obsoleta)
+        """
+        anterior = self.snapshots[-1]["tendencias"] if self.snapshots else []
+        posiciones_anteriores = {tendencia: i for i, tendencia in enumerate(anterior)}
+
+        apariciones = {}
+        ultima_posicion = {}
+        for snapshot in self.snapshots:
+            for i, tendencia in enumerate(snapshot["tendencias"]):
+                apariciones[tendencia] = apariciones.get(tendencia, 0) + 1
+                ultima_posicion[tendencia] = i
+
+        estados = {}
+        for posicion, tendencia in enumerate(tendencias):
+            if tendencia not in apariciones:
+                estados[tendencia] = ESTADO_NUEVA
+            elif tendencia not in posiciones_anteriores:
+                # Reaparece tras haber desaparecido del snapshot anterior
+                estados[tendencia] = ESTADO_EN_ALZA
+            elif ultima_posicion[tendencia] - posicion >= self.mejora_en_alza:
+                estados[tendencia] = ESTADO_EN_ALZA
+            elif apariciones[tendencia] >= self.umbral_obsoleta:
+                estados[tendencia] = ESTADO_OBSOLETA
+            else:
+                estados[tendencia] = ESTADO_ESTABLE
+
+        return estados
+
+    def registrar_snapshot(self, tendencias):
+        """Clasifica un snapshot, lo añade al historial y lo guarda.
+
+        Returns:
+            Diccionario tendencia -> estado
+        """
+        estados = self.clasificar(tendencias)
+        fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        for tendencia in tendencias:
+            info = self.tendencias.setdefault(tendencia, {
+                "primera_vez": fecha,
+                "apariciones": 0,
+                "ideas_generadas": 0
+            })
+            info["ultima_vez"] = fecha
+            info["apariciones"] += 1
+            info["estado"] = estados[tendencia]
+            if estados[tendencia] == ESTADO_NUEVA and info["ideas_generadas"] == 0:
+                info["pendiente"] = True
+
+        self.snapshots.append({"fecha": fecha, "tendencias": list(tendencias)})
+        self.snapshots = self.snapshots[-self.max_snapshots:]
+        self.guardar()
+
+        return estados
+
+    def marcar_generadas(self, tendencias):
+        """Registra que se generaron ideas para las tendencias indicadas"""
+        fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for tendencia in tendencias:
+            info = self.tendencias.setdefault(tendencia, {
+                "primera_vez": fecha,
+                "apariciones": 0,
+                "ideas_generadas": 0
+            })
+            info["ideas_generadas"] += 1
+            info["ultima_generacion"] = fecha
+            info.pop("pendiente", None)
+        self.guardar()
+
+    def pendiente(self, tendencia):
+        """Indica si la tendencia apareció como nueva y aún no se generó ninguna idea con ella"""
+        return self.tendencias.get(tendencia, {}).get("pendiente", False)
+
+    def filtrar_delta(self, estados, estados_incluir=(ESTADO_NUEVA,)):
+        """Devuelve, en orden, las tendencias cuyo estado está en estados_incluir
+
+        Si se piden las nuevas, incluye también las que llegaron como nuevas en
+        ejecuciones anteriores y siguen sin ideas (salvo que ya sean obsoletas).
+        """
+        incluir_pendientes = ESTADO_NUEVA in estados_incluir
+        return [
+            tendencia for tendencia, estado in estados.items()
+            if estado in estados_incluir
+            or (incluir_pendientes and estado != ESTADO_OBSOLETA and self.pendiente(tendencia))
+        ]
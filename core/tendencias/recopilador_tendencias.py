@@ -2,56 +2,245 @@
 Módulo para la obtención de tendencias de diferentes fuentes.
 """
 
-import requests
+import math
 import re
 from bs4 import BeautifulSoup
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from core.tendencias.transporte import TransporteHTTP
+from core.tendencias.extractor_frases import ExtractorFrasesClave
+from core.monitorizacion.metricas import DESCARGAS_TENDENCIAS
+from core.monitorizacion.perfilador import perfilado, tramo
+
+# Regiones de Google Trends (códigos geo)
+REGIONES_POR_DEFECTO = ["US", "ES", "MX"]
+REGIONES_LATAM = [
+    "MX", "AR", "CO", "CL", "PE", "VE", "EC", "GT", "CU", "BO",
+    "DO", "HN", "PY", "SV", "NI", "CR", "PA", "UY", "PR", "BR"
+]
+REGIONES_EUROPA = [
+    "ES", "PT", "FR", "IT", "DE", "GB", "IE", "NL", "BE", "AT",
+    "CH", "SE", "NO", "DK", "FI", "PL", "CZ", "GR", "RO", "HU"
+]
+
+# Grupos de regiones que se pueden pedir por nombre (ver resolver_regiones)
+GRUPOS_REGIONES = {
+    "defecto": REGIONES_POR_DEFECTO,
+    "latam": REGIONES_LATAM,
+    "europa": REGIONES_EUROPA
+}
+
+# Timeout (segundos) de cada petición a un feed
+TIMEOUT_PETICION = 10
+MAX_FEEDS_PARALELO = 8
+
+URL_GOOGLE_TRENDS = "https://trends.google.com/trends/trendingsearches/daily/rss?geo={geo}"
+
+# Feeds RSS de noticias
+FEEDS_NOTICIAS = [
+    "https://feeds.bbci.co.uk/news/technology/rss.xml",
+    "https://feeds.bbci.co.uk/news/world/rss.xml",
+    "https://feeds.bbci.co.uk/news/business/rss.xml",
+    "https://feeds.bbci.co.uk/news/science_and_environment/rss.xml",
+    "https://feeds.bbci.co.uk/news/entertainment_and_arts/rss.xml",
+    "https://rss.cnn.com/rss/edition.rss",
+    "https://rss.cnn.com/rss/edition_technology.rss",
+    "https://rss.cnn.com/rss/money_news_international.rss",
+    "https://www.theguardian.com/technology/rss",
+    "https://www.theguardian.com/world/rss",
+    "https://feeds.elpais.com/mrss-s/pages/ep/site/elpais.com/portada",
+    "https://feeds.elpais.com/mrss-s/pages/ep/site/elpais.com/section/tecnologia/portada"
+]
+
+
+def resolver_regiones(especificacion):
+    """Convierte una lista de regiones separadas por comas en códigos geo
+    
+    Acepta nombres de grupo (defecto, latam, europa) y códigos geo de dos
+    letras mezclados, p. ej. "latam,europa" o "US,ES,BR". Las regiones
+    repetidas se consultan una sola vez.
+    
+    Args:
+        especificacion: Texto con las regiones separadas por comas
+        
+    Returns:
+        Lista de códigos geo en el orden indicado
+    """
+    regiones = []
+    for parte in especificacion.split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        if parte.lower() in GRUPOS_REGIONES:
+            codigos = GRUPOS_REGIONES[parte.lower()]
+        elif len(parte) == 2 and parte.isalpha():
+            codigos = [parte.upper()]
+        else:
+            raise ValueError(
+                f"Región no válida: '{parte}' (usa códigos geo de dos letras o {', '.join(GRUPOS_REGIONES)})"
+            )
+        regiones.extend(codigo for codigo in codigos if codigo not in regiones)
+    
+    if not regiones:
+        raise ValueError("No se indicó ninguna región")
+    return regiones
 
 class RecopiladorTendencias:
     """Clase para recopilar tendencias de diversas fuentes."""
     
-    def __init__(self):
-        """Constructor de la clase RecopiladorTendencias."""
+    # Tendencias base siempre disponibles
+    TENDENCIAS_BASE = [
+        "artificial intelligence", "productivity tips", "morning routine",
+        "healthy recipes", "workout routine", "study tips", "life hacks",
+        "tech review", "fashion trends", "travel tips", "money saving",
+        "career advice", "relationship tips", "mental health", "self care"
+    ]
+    
+    def __init__(self, transporte=None, regiones=None, pesos_regiones=None,
+                 max_regiones_paralelo=8, tendencias_por_region=5, limite_google_trends=20,
+                 feeds_noticias=None, ruta_corpus_noticias=None):
+        """Constructor de la clase RecopiladorTendencias.
+        
+        Args:
+            transporte: Objeto con método get(url, headers, timeout) usado para
+                las peticiones HTTP (por defecto peticiones reales). Permite usar
+                TransporteGrabador o TransporteReproduccion.
+            regiones: Códigos geo de Google Trends a consultar (por defecto US, ES, MX)
+            pesos_regiones: Diccionario geo -> peso para priorizar regiones (por defecto 1.0)
+            max_regiones_paralelo: Máximo de regiones consultadas a la vez
+            tendencias_por_region: Tendencias leídas de cada región
+            limite_google_trends: Máximo de tendencias de Google Trends devueltas
+            feeds_noticias: URLs de feeds RSS de noticias (por defecto FEEDS_NOTICIAS)
+            ruta_corpus_noticias: Archivo JSON donde persistir el corpus de fondo
+                de noticias entre ejecuciones (opcional)
+        """
         self.tendencias_cache = {}
+        self.transporte = transporte or TransporteHTTP()
+        
+        # Configuración de Google Trends
+        self.regiones = list(regiones or REGIONES_POR_DEFECTO)
+        self.pesos_regiones = pesos_regiones or {}
+        self.max_regiones_paralelo = max_regiones_paralelo
+        self.tendencias_por_region = tendencias_por_region
+        self.limite_google_trends = limite_google_trends
+        
+        # Configuración de noticias
+        self.feeds_noticias = list(feeds_noticias or FEEDS_NOTICIAS)
+        self.extractor_frases = ExtractorFrasesClave(ruta_corpus=ruta_corpus_noticias)
+        
+        # Estado de la recopilación en segundo plano
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = []
+        self._resultados_fuentes = {}
+        self._tendencias_parciales = self._limpiar_tendencias(self.TENDENCIAS_BASE)
     
-    def obtener_tendencias_google_trends(self):
-        """Scraping de Google Trends para obtener tendencias reales"""
+    def _fuentes(self):
+        """Fuentes de tendencias en el orden en que se combinan sus resultados"""
+        return [
+            ("google_trends", self.obtener_tendencias_google_trends),
+            ("youtube", self.obtener_tendencias_youtube),
+            ("tiktok", self.obtener_tendencias_tiktok),
+            ("news", self.obtener_tendencias_news)
+        ]
+    
+    def _limpiar_tendencias(self, todas_tendencias):
+        """Normaliza, filtra por longitud y deduplica conservando el orden"""
+        tendencias_limpias = []
+        vistas = set()
+        for tendencia in todas_tendencias:
+            if isinstance(tendencia, str) and 3 <= len(tendencia) <= 50:
+                tendencia_limpia = re.sub(r'[^\w\s]', '', tendencia.lower()).strip()
+                if tendencia_limpia and tendencia_limpia not in vistas:
+                    vistas.add(tendencia_limpia)
+                    tendencias_limpias.append(tendencia_limpia)
+        
+        return tendencias_limpias[:50]  # Top 50 tendencias
+    
+    @perfilado("tendencias.region", "tendencias")
+    def _obtener_tendencias_region(self, geo):
+        """Obtiene las tendencias diarias de una región en orden de ranking"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        
+        tendencias = []
+        response = self.transporte.get(URL_GOOGLE_TRENDS.format(geo=geo), headers=headers, timeout=TIMEOUT_PETICION)
+        DESCARGAS_TENDENCIAS.incrementar(
+            fuente="google_trends", resultado="ok" if response.status_code == 200 else "error_http"
+        )
+        if response.status_code == 200:
+            soup = BeautifulSoup(response.content, 'xml')
+            for item in soup.find_all('item'):
+                title = item.find('title')
+                if title:
+                    texto = title.text.strip()
+                    if 3 < len(texto) < 50:
+                        tendencias.append(texto)
+                if len(tendencias) >= self.tendencias_por_region:
+                    break
+        
+        return tendencias
+    
+    def obtener_tendencias_google_trends(self, regiones=None, pesos_regiones=None):
+        """Scraping de Google Trends para obtener tendencias reales
+        
+        Las regiones se consultan en paralelo (como máximo max_regiones_paralelo
+        a la vez) y se combinan por puntuación: cada región aporta su peso
+        multiplicado por la posición relativa de la tendencia en su ranking, de
+        modo que las tendencias presentes en varias regiones suben. El detalle
+        (score, frecuencia y regiones) queda en tendencias_cache["google_trends"].
+        
+        Args:
+            regiones: Códigos geo a consultar en esta llamada (por defecto self.regiones)
+            pesos_regiones: Pesos por región para esta llamada (por defecto self.pesos_regiones)
+        """
         print("   📈 Obteniendo tendencias de Google Trends...")
+        regiones = list(regiones or self.regiones)
+        pesos_regiones = pesos_regiones if pesos_regiones is not None else self.pesos_regiones
         tendencias = []
         
         try:
-            # URLs de diferentes categorías de Google Trends
-            urls_trends = [
-                "https://trends.google.com/trends/trendingsearches/daily/rss?geo=US",
-                "https://trends.google.com/trends/trendingsearches/daily/rss?geo=ES",
-                "https://trends.google.com/trends/trendingsearches/daily/rss?geo=MX"
-            ]
+            resultados = {}
+            max_workers = max(1, min(self.max_regiones_paralelo, len(regiones)))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="google_trends") as executor:
+                futures = {geo: executor.submit(self._obtener_tendencias_region, geo) for geo in regiones}
+                for geo, future in futures.items():
+                    try:
+                        resultados[geo] = future.result()
+                    except:
+                        DESCARGAS_TENDENCIAS.incrementar(fuente="google_trends", resultado="error")
+                        continue
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            # Combinar regiones con ponderación y frecuencia
+            combinadas = {}
+            for geo in regiones:
+                ranking = resultados.get(geo, [])
+                peso = pesos_regiones.get(geo, 1.0)
+                for posicion, texto in enumerate(ranking):
+                    clave = texto.lower()
+                    entrada = combinadas.setdefault(clave, {
+                        "tendencia": texto,
+                        "score": 0.0,
+                        "frecuencia": 0,
+                        "regiones": []
+                    })
+                    entrada["score"] += peso * (len(ranking) - posicion) / len(ranking)
+                    entrada["frecuencia"] += 1
+                    entrada["regiones"].append(geo)
             
-            for url in urls_trends:
-                try:
-                    response = requests.get(url, headers=headers, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'xml')
-                        items = soup.find_all('item')
-                        for item in items[:5]:  # Top 5 de cada región
-                            title = item.find('title')
-                            if title:
-                                tendencias.append(title.text.strip())
-                except:
-                    continue
-                    
-            # Limpiar y deduplicar
-            tendencias = list(set([t for t in tendencias if len(t) > 3 and len(t) < 50]))
+            ordenadas = sorted(
+                combinadas.values(),
+                key=lambda entrada: (-entrada["score"], -entrada["frecuencia"], entrada["tendencia"])
+            )
+            self.tendencias_cache["google_trends"] = ordenadas
+            tendencias = [entrada["tendencia"] for entrada in ordenadas]
             
         except Exception as e:
             print(f"      ⚠️ Error obteniendo Google Trends: {e}")
         
-        return tendencias[:20]  # Top 20
+        return tendencias[:self.limite_google_trends]
     
     def obtener_tendencias_youtube(self):
         """Obtener tendencias de YouTube"""
@@ -100,82 +289,149 @@ class RecopiladorTendencias:
         
         return tendencias
     
-    def obtener_tendencias_news(self):
-        """Obtener noticias y eventos actuales"""
+    @perfilado("tendencias.feed", "tendencias")
+    def _obtener_textos_feed(self, url):
+        """Obtiene titulares y resúmenes (sin HTML) de todos los items de un feed"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        
+        textos = []
+        response = self.transporte.get(url, headers=headers, timeout=TIMEOUT_PETICION)
+        DESCARGAS_TENDENCIAS.incrementar(fuente="news", resultado="ok" if response.status_code == 200 else "error_http")
+        if response.status_code == 200:
+            soup = BeautifulSoup(response.content, 'xml')
+            for item in soup.find_all('item'):
+                partes = [
+                    etiqueta.text for etiqueta in (item.find('title'), item.find('description'))
+                    if etiqueta and etiqueta.text
+                ]
+                if partes:
+                    textos.append(re.sub(r'<[^>]+>', ' ', ". ".join(partes)))
+        
+        return textos
+    
+    def obtener_tendencias_news(self, top=15):
+        """Obtener noticias y eventos actuales
+        
+        Lee todos los titulares y resúmenes de los feeds configurados en
+        paralelo y devuelve las frases clave (2-3 palabras) con mayor
+        puntuación TF-IDF frente al corpus de lotes anteriores.
+        """
         print("   📰 Obteniendo noticias actuales...")
         tendencias = []
         
         try:
-            # Fuentes de noticias
-            urls_news = [
-                "https://feeds.bbci.co.uk/news/technology/rss.xml",
-                "https://rss.cnn.com/rss/edition.rss"
-            ]
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
+            documentos = []
+            max_workers = max(1, min(MAX_FEEDS_PARALELO, len(self.feeds_noticias)))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="news") as executor:
+                futures = [executor.submit(self._obtener_textos_feed, url) for url in self.feeds_noticias]
+                for future in futures:
+                    try:
+                        documentos.extend(future.result())
+                    except:
+                        DESCARGAS_TENDENCIAS.incrementar(fuente="news", resultado="error")
+                        continue
             
-            for url in urls_news:
-                try:
-                    response = requests.get(url, headers=headers, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'xml')
-                        items = soup.find_all('item')
-                        for item in items[:3]:
-                            title = item.find('title')
-                            if title:
-                                # Extraer palabras clave del título
-                                palabras = title.text.split()
-                                for palabra in palabras:
-                                    if len(palabra) > 4 and palabra.isalpha():
-                                        tendencias.append(palabra.lower())
-                except:
-                    continue
-                    
+            if documentos:
+                with tramo("tendencias.frases_clave", "tendencias", documentos=len(documentos)):
+                    tendencias = self.extractor_frases.extraer(documentos, top=top)
+                
         except Exception as e:
             print(f"      ⚠️ Error obteniendo noticias: {e}")
         
-        return list(set(tendencias))[:15]
+        return tendencias
     
-    def obtener_todas_las_tendencias(self):
-        """Obtener tendencias de múltiples fuentes simultáneamente"""
-        print("🔍 Recopilando tendencias de múltiples fuentes...")
-        
-        # Tendencias base siempre disponibles
-        tendencias_base = [
-            "artificial intelligence", "productivity tips", "morning routine",
-            "healthy recipes", "workout routine", "study tips", "life hacks",
-            "tech review", "fashion trends", "travel tips", "money saving",
-            "career advice", "relationship tips", "mental health", "self care"
-        ]
+    def iniciar_recopilacion_segundo_plano(self):
+        """Lanza la recopilación de todas las fuentes sin bloquear.
         
-        todas_tendencias = tendencias_base.copy()
+        Los resultados se van incorporando a medida que llegan y pueden
+        consultarse en cualquier momento con obtener_tendencias_disponibles().
+        Llamar varias veces no relanza una recopilación ya en curso.
+        """
+        with self._lock:
+            if self._executor is not None:
+                return
+            print("🔍 Recopilando tendencias de múltiples fuentes en segundo plano...")
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tendencias")
+            for nombre, fuente in self._fuentes():
+                self._futures.append(self._executor.submit(self._ejecutar_fuente, nombre, fuente))
+    
+    def _ejecutar_fuente(self, nombre, fuente):
+        """Ejecuta una fuente e incorpora su resultado a las tendencias parciales"""
+        try:
+            with tramo(f"tendencias.{nombre}"):
+                resultado = fuente() or []
+        except Exception:
+            resultado = []
         
-        # Ejecutar scraping en paralelo
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [
-                executor.submit(self.obtener_tendencias_google_trends),
-                executor.submit(self.obtener_tendencias_youtube),
-                executor.submit(self.obtener_tendencias_tiktok),
-                executor.submit(self.obtener_tendencias_news)
-            ]
+        # Registrar antes de terminar para que el future completado implique
+        # que sus tendencias ya están disponibles
+        with self._lock:
+            self._resultados_fuentes[nombre] = resultado
             
-            for future in futures:
-                try:
-                    result = future.result(timeout=15)
-                    if result:
-                        todas_tendencias.extend(result)
-                except:
-                    continue
-        
-        # Limpiar y procesar tendencias
-        tendencias_limpias = []
-        for tendencia in todas_tendencias:
-            if isinstance(tendencia, str) and 3 <= len(tendencia) <= 50:
-                tendencia_limpia = re.sub(r'[^\w\s]', '', tendencia.lower()).strip()
-                if tendencia_limpia and tendencia_limpia not in tendencias_limpias:
-                    tendencias_limpias.append(tendencia_limpia)
+            # Combinar respetando siempre el mismo orden de fuentes
+            todas_tendencias = list(self.TENDENCIAS_BASE)
+            for nombre_fuente, _ in self._fuentes():
+                todas_tendencias.extend(self._resultados_fuentes.get(nombre_fuente, []))
+            self._tendencias_parciales = self._limpiar_tendencias(todas_tendencias)
+            
+            # La última fuente libera los hilos del pool (sin esperar a que salgan)
+            if len(self._resultados_fuentes) == len(self._futures):
+                self._executor.shutdown(wait=False)
+    
+    def cerrar(self):
+        """Cancela las fuentes que no hayan empezado y libera el pool de recopilación"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def __del__(self):
+        try:
+            self.cerrar()
+        except Exception:
+            pass
+    
+    def recopilacion_completa(self):
+        """Indica si todas las fuentes lanzadas en segundo plano han terminado"""
+        with self._lock:
+            return self._executor is not None and all(f.done() for f in self._futures)
+    
+    def obtener_tendencias_disponibles(self):
+        """Devuelve las tendencias recopiladas hasta el momento sin bloquear.
+        
+        Incluye siempre las tendencias base; el resto de fuentes aparece en
+        cuanto termina su recopilación.
+        """
+        with self._lock:
+            return list(self._tendencias_parciales)
+    
+    def timeout_recopilacion(self):
+        """Segundos que puede tardar la recopilación completa
+        
+        Las regiones y los feeds se consultan por tandas de max_regiones_paralelo
+        y MAX_FEEDS_PARALELO, y cada tanda puede tardar hasta TIMEOUT_PETICION.
+        """
+        tandas_regiones = math.ceil(len(self.regiones) / max(1, self.max_regiones_paralelo))
+        tandas_feeds = math.ceil(len(self.feeds_noticias) / MAX_FEEDS_PARALELO)
+        return max(15, max(tandas_regiones, tandas_feeds) * TIMEOUT_PETICION + 5)
+    
+    def obtener_todas_las_tendencias(self, timeout=None):
+        """Obtener tendencias de múltiples fuentes simultáneamente
+        
+        Si la recopilación en segundo plano ya está en marcha, espera a que
+        termine (como máximo `timeout` segundos, por defecto el que requieren
+        las regiones y feeds configurados) en lugar de repetirla.
+        """
+        if timeout is None:
+            timeout = self.timeout_recopilacion()
+        self.iniciar_recopilacion_segundo_plano()
         
+        with self._lock:
+            futures = list(self._futures)
+        with tramo("tendencias.espera", "tendencias"):
+            wait(futures, timeout=timeout)
+        
+        tendencias_limpias = self.obtener_tendencias_disponibles()
         print(f"   ✅ Recopiladas {len(tendencias_limpias)} tendencias únicas")
-        return tendencias_limpias[:50]  # Top 50 tendencias
+        return tendencias_limpias
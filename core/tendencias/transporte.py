@@ -0,0 +1,151 @@
+"""
+Módulo de transportes HTTP para la recopilación de tendencias.
+
+Permite grabar las respuestas reales de los feeds (cuerpo, cabeceras y
+latencia) y reproducirlas después desde disco, de forma que el scraping se
+pueda medir y depurar sin conexión y de forma determinista.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+
+class RespuestaGrabada:
+    """Respuesta HTTP mínima compatible con lo que usa RecopiladorTendencias."""
+
+    def __init__(self, url, status_code, headers, content, elapsed=0.0):
+        """Constructor de la clase RespuestaGrabada.
+
+        Args:
+            url: URL solicitada
+            status_code: Código de estado HTTP
+            headers: Diccionario de cabeceras de la respuesta
+            content: Cuerpo de la respuesta en bytes
+            elapsed: Segundos que tardó la respuesta original
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.elapsed = elapsed
+
+    @property
+    def text(self):
+        """Cuerpo de la respuesta decodificado como texto"""
+        return self.content.decode("utf-8", errors="replace")
+
+
+def _nombre_fixture(url):
+    """Nombre de archivo estable para una URL"""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+class TransporteHTTP:
+    """Transporte por defecto: peticiones reales con requests."""
+
+    def get(self, url, headers=None, timeout=10):
+        """Realiza una petición GET real"""
+        import requests
+        return requests.get(url, headers=headers, timeout=timeout)
+
+
+class TransporteGrabador:
+    """Transporte que delega en otro y graba cada respuesta en disco."""
+
+    def __init__(self, directorio, transporte=None):
+        """Constructor de la clase TransporteGrabador.
+
+        Args:
+            directorio: Carpeta donde se guardan las respuestas grabadas
+            transporte: Transporte real a usar (por defecto TransporteHTTP)
+        """
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.transporte = transporte or TransporteHTTP()
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=10):
+        """Realiza la petición real y guarda cuerpo, cabeceras y latencia"""
+        inicio = time.perf_counter()
+        response = self.transporte.get(url, headers=headers, timeout=timeout)
+        elapsed = time.perf_counter() - inicio
+
+        nombre = _nombre_fixture(url)
+        metadatos = {
+            "url": url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "elapsed": round(elapsed, 4),
+            "fecha_grabacion": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+        with self._lock:
+            (self.directorio / f"{nombre}.body").write_bytes(response.content)
+            (self.directorio / f"{nombre}.json").write_text(
+                json.dumps(metadatos, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+
+        return response
+
+
+class TransporteReproduccion:
+    """Transporte que sirve desde disco las respuestas grabadas."""
+
+    def __init__(self, directorio, latencia=None, escala_latencia=1.0, estricto=False):
+        """Constructor de la clase TransporteReproduccion.
+
+        Args:
+            directorio: Carpeta con las respuestas grabadas por TransporteGrabador
+            latencia: Segundos fijos de latencia sintética; None usa la grabada
+            escala_latencia: Factor aplicado a la latencia (0 la desactiva)
+            estricto: Si es True, una URL sin grabar lanza LookupError en lugar
+                de devolver un 404
+        """
+        self.directorio = Path(directorio)
+        self.latencia = latencia
+        self.escala_latencia = escala_latencia
+        self.estricto = estricto
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _cargar(self, url):
+        """Carga (una sola vez) la respuesta grabada de una URL"""
+        with self._lock:
+            if url in self._cache:
+                return self._cache[url]
+
+            nombre = _nombre_fixture(url)
+            ruta_meta = self.directorio / f"{nombre}.json"
+            if not ruta_meta.exists():
+                self._cache[url] = None
+                return None
+
+            metadatos = json.loads(ruta_meta.read_text(encoding="utf-8"))
+            metadatos["content"] = (self.directorio / f"{nombre}.body").read_bytes()
+            self._cache[url] = metadatos
+            return metadatos
+
+    def get(self, url, headers=None, timeout=10):
+        """Devuelve la respuesta grabada respetando la latencia y el timeout"""
+        grabada = self._cargar(url)
+        if grabada is None:
+            if self.estricto:
+                raise LookupError(f"No hay respuesta grabada para {url}")
+            return RespuestaGrabada(url, 404, {}, b"")
+
+        latencia = grabada["elapsed"] if self.latencia is None else self.latencia
+        latencia *= self.escala_latencia
+
+        # Simular el comportamiento de requests cuando se supera el timeout
+        if timeout is not None and latencia > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Timeout reproduciendo {url} ({latencia:.2f}s > {timeout}s)")
+        if latencia > 0:
+            time.sleep(latencia)
+
+        return RespuestaGrabada(
+            url, grabada["status_code"], grabada["headers"], grabada["content"], latencia
+        )
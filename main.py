@@ -6,33 +6,77 @@ Generador Profesional de Ideas de Videos
 Sistema Avanzado de Generación Automatizada de Ideas de Videos
 """
 
-from core.config.config import cargar_api_key, obtener_ruta_salida
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+from core.config.config import cargar_api_keys, cargar_cuota_api, obtener_ruta_salida
 from core.config.configuracion_contenido import ConfiguracionContenido
-from core.tendencias.recopilador_tendencias import RecopiladorTendencias
+from core.tendencias.recopilador_tendencias import RecopiladorTendencias, resolver_regiones
+from core.tendencias.historial_tendencias import HistorialTendencias, ESTADO_NUEVA
 from core.generador.generador_ideas import GeneradorIdeas
 from core.formatos.generador_formatos import GeneradorFormatos
 from core.exportador.exportador import ExportadorIdeas
+from core.exportador.exportacion_incremental import ExportacionIncremental
+from core.exportador.tabla_ideas import HOJAS_EXCEL, TablaIdeas
+from core.monitorizacion.metricas import REGISTRO
+from core.monitorizacion.perfilador import activar_perfilado, desactivar_perfilado, perfilado, tramo
 
 
 class GeneradorIdeasVideosAvanzado:
     """Clase principal que integra todos los módulos del generador de ideas."""
     
-    def __init__(self):
-        """Inicializa el generador de ideas de videos."""
+    def __init__(self, regiones=None, pesos_regiones=None, formatos_exportacion=("excel",),
+                 exportacion_incremental=True, cache_formatos=None):
+        """Inicializa el generador de ideas de videos.
+        
+        Args:
+            regiones: Códigos geo de Google Trends a consultar en esta ejecución
+            pesos_regiones: Diccionario geo -> peso para combinar las regiones
+            formatos_exportacion: Formatos de salida (excel, csv, jsonl, parquet)
+            exportacion_incremental: Si es True, las ideas se escriben en disco
+                según se aceptan (Excel y JSONL/CSV) en lugar de al final
+            cache_formatos: Carpeta de la caché de formatos en disco, para no
+                regenerar entre ejecuciones los de ideas con el mismo contenido
+                (None la desactiva)
+        """
         print("🚀 Inicializando Generador de Ideas Profesional...")
         
         # Cargar configuración y dependencias
-        self.api_key = cargar_api_key()
+        # Pool de API keys: las peticiones a Gemini se reparten según la cuota de cada una
+        self.api_keys = cargar_api_keys()
+        self.api_key = self.api_keys[0]
         self.configuracion = ConfiguracionContenido()
-        self.recopilador = RecopiladorTendencias()
-        self.generador = GeneradorIdeas(self.api_key, self.configuracion)
+        self.recopilador = RecopiladorTendencias(
+            regiones=regiones,
+            pesos_regiones=pesos_regiones,
+            ruta_corpus_noticias=obtener_ruta_salida() / "corpus_noticias.json"
+        )
+        self.generador = GeneradorIdeas(self.api_keys, self.configuracion, cargar_cuota_api())
         self.formateador = GeneradorFormatos()
+        if cache_formatos is not None:
+            self.formateador.activar_cache(cache_formatos)
         self.exportador = ExportadorIdeas(obtener_ruta_salida())
+        self.formatos_exportacion = tuple(formatos_exportacion)
+        self.exportacion_incremental = exportacion_incremental
+        self._exportacion = None
+        self.historial = HistorialTendencias(obtener_ruta_salida() / "historial_tendencias.json")
         
-        # Acceso rápido a configuraciones
-        self.redes_sociales = self.configuracion.obtener_redes_sociales()
-        self.nichos = self.configuracion.obtener_nichos()
+        # Empezar a recopilar tendencias mientras el usuario elige opciones
+        self.recopilador.iniciar_recopilacion_segundo_plano()
+    
+    # Acceso rápido a configuraciones (siempre la vigente, aunque se haya recargado el archivo)
+    @property
+    def redes_sociales(self):
+        """Configuración de redes sociales"""
+        return self.configuracion.obtener_redes_sociales()
+    
+    @property
+    def nichos(self):
+        """Configuración de nichos"""
+        return self.configuracion.obtener_nichos()
           
+    @perfilado("generacion")
     def generar_lote_ideas_automatizado(self, cantidad=20, filtros=None):
         """Genera un lote de ideas automatizado.
         
@@ -43,49 +87,249 @@ class GeneradorIdeasVideosAvanzado:
         Returns:
             Lista de ideas generadas
         """
-        # Obtener tendencias actuales
+        # Empezar con las tendencias ya disponibles; las fuentes de red que
+        # sigan en curso se incorporan durante la generación
+        tendencias = self.recopilador.obtener_tendencias_disponibles()
+        
+        # Generar ideas con las tendencias obtenidas; cada idea aprobada se
+        # formatea (y, si está activo, se exporta) según se acepta
+        with self._iniciar_aceptacion() as receptor:
+            ideas = self.generador.generar_lote_ideas_automatizado(
+                cantidad, filtros, tendencias,
+                actualizar_tendencias=self.recopilador.obtener_tendencias_disponibles,
+                al_aceptar_idea=receptor.agregar
+            )
+        
+        self._registrar_tendencias_usadas(ideas)
+        return ideas
+    
+    @perfilado("generacion_delta")
+    def generar_lote_ideas_delta(self, cantidad=20, filtros=None, estados_incluir=(ESTADO_NUEVA,)):
+        """Genera ideas solo para las tendencias surgidas desde la última ejecución delta.
+        
+        Espera a la recopilación completa, compara el snapshot con el historial
+        y recorre únicamente las tendencias con estado en estados_incluir (más las
+        nuevas de ejecuciones anteriores que aún no tienen ideas), de modo que el
+        número de llamadas a la IA es proporcional a lo que ha cambiado.
+        
+        Args:
+            cantidad: Número máximo de ideas a generar
+            filtros: Diccionario con filtros para las ideas
+            estados_incluir: Estados de tendencia a usar (nueva, en_alza...)
+            
+        Returns:
+            Lista de ideas generadas (vacía si no hay tendencias nuevas)
+        """
         tendencias = self.recopilador.obtener_todas_las_tendencias()
+        estados = self.historial.registrar_snapshot(tendencias)
+        delta = self.historial.filtrar_delta(estados, estados_incluir)
+        
+        print(f"🆕 Tendencias nuevas o pendientes desde la última ejecución: {len(delta)}/{len(tendencias)}")
+        if not delta:
+            print("   ✅ Sin cambios en las tendencias, no se generan ideas")
+            return []
         
-        # Generar ideas con las tendencias obtenidas
-        ideas = self.generador.generar_lote_ideas_automatizado(cantidad, filtros, tendencias)
+        filtros = dict(filtros) if filtros else {
+            "score_minimo": 50,
+            "redes_incluir": list(self.redes_sociales.keys()),
+            "nichos_incluir": list(self.nichos.keys()),
+            "evitar_duplicados": True
+        }
+        filtros["recorrer_tendencias"] = True
         
-        # Generar formatos específicos para cada idea
-        for idea in ideas:
-            idea["formatos_ia"] = self.formateador.generar_formatos_ia_especificos(idea)
+        with self._iniciar_aceptacion() as receptor:
+            ideas = self.generador.generar_lote_ideas_automatizado(
+                min(cantidad, len(delta)), filtros, delta,
+                al_aceptar_idea=receptor.agregar
+            )
         
+        self._registrar_tendencias_usadas(ideas)
         return ideas
     
-    def exportar_ideas(self, ideas, nombre_archivo=None):
-        """Exporta las ideas generadas a un archivo Excel.
+    def _iniciar_aceptacion(self):
+        """Devuelve el receptor de las ideas aceptadas durante la generación.
+        
+        Con la exportación incremental activa, cada idea se formatea y se escribe
+        al momento en el Excel y en los archivos JSONL/CSV elegidos (JSONL si no
+        se eligió ninguno), de modo que lo generado sobrevive a una interrupción.
+        Cada idea se formatea al aceptarla, en serie: el pool de LoteFormatos
+        solo compensa a partir de MIN_IDEAS_POOL ideas, muchas más de las que
+        genera una ejecución. Si no, los formatos se generan en un LoteFormatos
+        y se exporta todo al final.
+        """
+        if not self.exportacion_incremental:
+            return self.formateador.iniciar_lote(formatos=self.exportador.FORMATOS_REQUERIDOS)
+        
+        auxiliares = tuple(formato for formato in self.formatos_exportacion if formato in ("jsonl", "csv"))
+        self._exportacion = ExportacionIncremental(
+            self.exportador,
+            self.formateador,
+            auxiliares=auxiliares or ("jsonl",),
+            excel="excel" in self.formatos_exportacion
+        )
+        return self._exportacion
+    
+    def cerrar(self):
+        """Libera el pool de recopilación de tendencias y cierra la caché de formatos en disco, si está activa"""
+        self.recopilador.cerrar()
+        if self.formateador.cache is not None:
+            self.formateador.cache.cerrar()
+    
+    def _registrar_tendencias_usadas(self, ideas):
+        """Registra en el historial las tendencias para las que se generaron ideas"""
+        self.historial.marcar_generadas(
+            [idea["tendencia_origen"] for idea in ideas if idea.get("tendencia_origen")]
+        )
+    
+    @perfilado("exportacion")
+    def exportar_ideas(self, ideas, nombre_archivo=None, subtitulos=True, formatos=None):
+        """Exporta las ideas generadas a un archivo Excel y a los formatos tabulares elegidos.
         
         Args:
             ideas: Lista de ideas a exportar
             nombre_archivo: Nombre del archivo de salida
+            subtitulos: Si es True, exporta también los subtítulos SRT/LRC de cada guión
+            formatos: Formatos de salida (por defecto, los indicados al crear el generador)
             
         Returns:
-            Ruta del archivo Excel generado
+            Diccionario formato -> ruta de los archivos exportados (incluidos los
+            que ya escribió la exportación incremental)
         """
-        return self.exportador.exportar_a_excel_avanzado(ideas, nombre_archivo)
+        formatos = self.formatos_exportacion if formatos is None else tuple(formatos)
+        
+        # Lo que ya escribió la exportación incremental no se repite: sus
+        # archivos son la exportación de este lote
+        exportados = {}
+        if self._exportacion is not None and nombre_archivo is None:
+            exportacion, self._exportacion = self._exportacion, None
+            exportados = exportacion.finalizar()
+            if exportados:
+                nombre_archivo = exportacion.nombre_base + ".xlsx"
+                if exportacion.ideas_exportadas != len(ideas):
+                    print(f"⚠️ La exportación incremental tiene {exportacion.ideas_exportadas} de {len(ideas)} "
+                          f"ideas; se mantienen sus archivos sin volver a exportar")
+        
+        if not nombre_archivo:
+            nombre_archivo = f"ideas_videos_pro_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        nombre_base = Path(nombre_archivo).stem
+        
+        archivos = dict(exportados)
+        pendientes = [formato for formato in formatos if formato not in exportados]
+        
+        # Las ideas se aplanan una sola vez para el Excel y los formatos tabulares
+        tabla = TablaIdeas(ideas) if pendientes else None
+        if "excel" in pendientes:
+            archivos["excel"] = self.exportador.exportar_a_excel_avanzado(tabla, nombre_archivo)
+        
+        tabulares = [formato for formato in pendientes if formato != "excel"]
+        if tabulares:
+            archivos.update(self.exportador.exportar_formatos(tabla, tabulares, nombre_base))
+        
+        if subtitulos and ideas:
+            timelines = self.formateador.generar_timelines_lote(ideas)
+            self.exportador.exportar_subtitulos(ideas, timelines, nombre_base + "_subtitulos")
+        
+        # Primero los formatos en el orden pedido y después los auxiliares de la exportación incremental
+        orden = list(formatos) + [formato for formato in archivos if formato not in formatos]
+        return {formato: archivos[formato] for formato in orden if formato in archivos}
+
+
+def mostrar_archivos_exportados(archivos):
+    """Muestra una línea por cada archivo exportado"""
+    if not archivos:
+        print("   ⚠️ No se exportó ningún archivo")
+    for formato, ruta in archivos.items():
+        if formato == "excel":
+            print(f"   📁 Archivo Excel: {ruta}")
+            print(f"   📋 {len(HOJAS_EXCEL)} hojas: {', '.join(HOJAS_EXCEL)}")
+        else:
+            print(f"   📄 {formato.upper()}: {ruta}")
 
 
 def main():
     """Función principal mejorada"""
+    parser = argparse.ArgumentParser(description="Generador Profesional de Ideas de Videos")
+    parser.add_argument("--delta", action="store_true",
+                        help="Generar solo para tendencias nuevas desde la última ejecución (sin menú)")
+    parser.add_argument("--cantidad", type=int, default=20,
+                        help="Máximo de ideas a generar en modo delta")
+    parser.add_argument("--regiones", metavar="REGIONES",
+                        help="Regiones de Google Trends separadas por comas: grupos (defecto, latam, europa) "
+                             "o códigos geo, p. ej. latam,europa o US,ES,BR")
+    parser.add_argument("--formatos", default="excel",
+                        help="Formatos de salida separados por comas: excel, csv, jsonl, parquet")
+    parser.add_argument("--no-incremental", action="store_true",
+                        help="Exportar todas las ideas al final en lugar de según se aceptan")
+    parser.add_argument("--cache-formatos", nargs="?", const="", metavar="CARPETA",
+                        help="Reutilizar entre ejecuciones los formatos de ideas con el mismo contenido "
+                             "(caché SQLite; por defecto en ideas_generadas/cache_formatos)")
+    parser.add_argument("--profile", nargs="?", const="", metavar="RUTA",
+                        help="Guardar una traza por etapas e ideas (JSON de Chrome, se abre en ui.perfetto.dev); "
+                             "por defecto en la carpeta de salida")
+    parser.add_argument("--profile-cprofile", action="store_true",
+                        help="Con --profile, guardar también un perfil de cProfile (.prof junto a la traza)")
+    parser.add_argument("--profile-memoria", action="store_true",
+                        help="Con --profile, medir el pico de memoria de cada etapa con tracemalloc")
+    parser.add_argument("--metricas", nargs="?", const="", metavar="RUTA",
+                        help="Guardar al terminar las métricas en formato de texto de Prometheus "
+                             "(por defecto ideas_generadas/metricas.prom)")
+    parser.add_argument("--metricas-puerto", type=int, metavar="PUERTO",
+                        help="Servir las métricas en http://127.0.0.1:PUERTO/metrics mientras dura la ejecución")
+    args = parser.parse_args()
+    formatos = [formato.strip().lower() for formato in args.formatos.split(",") if formato.strip()]
+    regiones = None
+    if args.regiones:
+        try:
+            regiones = resolver_regiones(args.regiones)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    if args.profile is not None:
+        activar_perfilado(cprofile=args.profile_cprofile, memoria=args.profile_memoria)
+    
+    servidor_metricas = None
+    if args.metricas_puerto:
+        try:
+            servidor_metricas = REGISTRO.servir(args.metricas_puerto)
+            print(f"📈 Métricas en http://127.0.0.1:{args.metricas_puerto}/metrics")
+        except OSError as e:
+            print(f"⚠️ No se pudo abrir el puerto de métricas {args.metricas_puerto}: {e}")
+    
     print("🎬 GENERADOR PROFESIONAL DE IDEAS DE VIDEOS")
     print("=" * 70)
     print("🤖 Sistema de IA Avanzado para Creación de Contenido Viral")
     print("🆓 Powered by Gemini 2.0 Flash + Web Scraping + Análisis Inteligente")
     print("=" * 70)
     
+    cache_formatos = None
+    if args.cache_formatos is not None:
+        cache_formatos = args.cache_formatos or obtener_ruta_salida() / "cache_formatos"
+    
+    generador = None
     try:
-        generador = GeneradorIdeasVideosAvanzado()
+        with tramo("inicializacion"):
+            generador = GeneradorIdeasVideosAvanzado(
+                regiones=regiones, formatos_exportacion=formatos, exportacion_incremental=not args.no_incremental,
+                cache_formatos=cache_formatos
+            )
+        
+        if args.delta:
+            print("\n🆕 MODO DELTA ACTIVADO")
+            ideas = generador.generar_lote_ideas_delta(args.cantidad)
+            if ideas:
+                archivos = generador.exportar_ideas(ideas)
+                print(f"\n🎉 {len(ideas)} ideas nuevas exportadas")
+                mostrar_archivos_exportados(archivos)
+            return
         
         print("\n🚀 OPCIONES DISPONIBLES:")
         print("1. 🔥 Generación Rápida (10 ideas optimizadas)")
         print("2. 📊 Generación Profesional (20-50 ideas con análisis)")
         print("3. 🎯 Generación Personalizada (configuración avanzada)")
         print("4. 🏢 Modo Empresa (100+ ideas para múltiples nichos)")
+        print("5. 🆕 Modo Delta (solo tendencias nuevas desde la última ejecución)")
         
-        opcion = input("\n👉 Selecciona modo (1-4): ").strip()
+        opcion = input("\n👉 Selecciona modo (1-5): ").strip()
         
         if opcion == "1":
             print("\n🔥 MODO RÁPIDO ACTIVADO")
@@ -171,13 +415,23 @@ def main():
                 "evitar_duplicados": True
             })
             
+        elif opcion == "5":
+            print("\n🆕 MODO DELTA ACTIVADO")
+            cantidad = input("¿Máximo de ideas a generar? (default 20): ").strip()
+            try:
+                cantidad = max(1, int(cantidad))
+            except:
+                cantidad = 20
+            
+            ideas = generador.generar_lote_ideas_delta(cantidad)
+            
         else:
             print("Opción no válida, usando modo rápido...")
             ideas = generador.generar_lote_ideas_automatizado(10)
         
         # Exportar resultados
         if ideas:
-            archivo_excel = generador.exportar_ideas(ideas)
+            archivos = generador.exportar_ideas(ideas)
             
             # Estadísticas finales
             print(f"\n🎉 PROCESO COMPLETADO EXITOSAMENTE")
@@ -196,8 +450,7 @@ def main():
                 print(f"   {i}. {idea.get('titulo', '')[:50]}... (Score: {idea.get('score_calidad', 0)})")
             
             print(f"\n💼 ENTREGABLES:")
-            print(f"   📁 Archivo Excel: {archivo_excel}")
-            print(f"   📋 3 hojas: Ideas, Guiones, Hashtags y Keywords")
+            mostrar_archivos_exportados(archivos)
             print(f"   🎤 {len(ideas)} ideas completas con guiones")
             
         else:
@@ -213,6 +466,30 @@ def main():
     except Exception as e:
         print(f"❌ Error crítico: {e}")
         print("Contacta soporte técnico si el problema persiste.")
+    
+    finally:
+        if generador is not None:
+            generador.cerrar()
+        if servidor_metricas is not None:
+            servidor_metricas.shutdown()
+        if args.metricas is not None:
+            try:
+                ruta = REGISTRO.guardar(args.metricas or obtener_ruta_salida() / "metricas.prom")
+                print(f"📈 Métricas guardadas en {ruta}")
+            except OSError as e:
+                print(f"⚠️ No se pudieron guardar las métricas: {e}")
+        
+        perfilador = desactivar_perfilado()
+        if perfilador is not None:
+            ruta = args.profile or obtener_ruta_salida() / f"perfil_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            try:
+                archivos = perfilador.guardar(ruta)
+                perfilador.mostrar_resumen()
+                print(f"   📁 Traza: {archivos[0]} (ábrela en https://ui.perfetto.dev)")
+                if len(archivos) > 1:
+                    print(f"   📁 cProfile: {archivos[1]} (python -m pstats {archivos[1]})")
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar el perfil: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,3 @@
+"""
+Pruebas del generador de ideas (python -m pytest).
+"""
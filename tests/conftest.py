@@ -0,0 +1,49 @@
+"""
+Utilidades compartidas por las pruebas.
+"""
+
+import random
+
+import pytest
+
+NICHOS = ["Tecnología", "Crecimiento Personal", "Marketing", "Finanzas", "Inteligencia Artificial", "Historias Reddit"]
+PALABRAS = [
+    "evitar", "error", "secreto", "estrategia", "rápido", "único", "tiempo", "dinero", "calidad",
+    "aprender", "éxito", "problema", "nunca", "siempre", "optimizar", "comenzar", "fácil", "beneficio"
+]
+
+
+def generar_ideas_sinteticas(cantidad, semilla=42):
+    """Genera ideas con la misma forma que las de GeneradorIdeas, sin API"""
+    aleatorio = random.Random(semilla)
+    ideas = []
+    for i in range(cantidad):
+        nicho = aleatorio.choice(NICHOS)
+        puntos = [
+            " ".join(aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(3, 9)))
+            for _ in range(aleatorio.randint(0, 6))
+        ]
+        idea = {
+            "titulo": f"Idea {i}: " + " ".join(aleatorio.choice(PALABRAS) for _ in range(6)),
+            "descripcion": " ".join(aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(0, 60))),
+            "puntos_clave": puntos,
+            "tipo_contenido": "narrativo" if nicho == "Historias Reddit" else aleatorio.choice(["educativo", "narrativo"]),
+            "nicho": nicho,
+            "tema": f"tema {i}"
+        }
+        if aleatorio.random() < 0.9:
+            idea["hook_inicial"] = "¿Sabías que " + " ".join(aleatorio.choice(PALABRAS) for _ in range(8)) + "?"
+        ideas.append(idea)
+    return ideas
+
+
+@pytest.fixture
+def ideas_sinteticas():
+    """Función que genera ideas sintéticas: ideas_sinteticas(cantidad, semilla=42)"""
+    return generar_ideas_sinteticas
+
+
+@pytest.fixture(autouse=True)
+def carpeta_de_trabajo(tmp_path, monkeypatch):
+    """Cada prueba se ejecuta en una carpeta temporal: ideas_generadas no se crea en el repositorio"""
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,35 @@
+"""
+Pruebas de la caché de formatos.
+"""
+
+from core.formatos.generador_formatos import GeneradorFormatos
+from core.formatos.registro_formatos import FormatosIA
+
+
+def test_ideas_con_el_mismo_contenido_no_comparten_formatos(ideas_sinteticas):
+    formateador = GeneradorFormatos()
+    formateador.activar_cache()
+    idea = ideas_sinteticas(1)[0]
+
+    primero = FormatosIA(formateador, idea)["video_lyrics"]
+    primero[0]["texto"] = "modificado"
+    segundo = FormatosIA(formateador, dict(idea))["video_lyrics"]
+
+    assert segundo is not primero
+    assert segundo == formateador.generar_video_lyrics(idea)
+    assert formateador.cache.estadisticas()["aciertos"] == 1
+
+
+def test_cache_en_disco_entre_ejecuciones(tmp_path, ideas_sinteticas):
+    idea = ideas_sinteticas(1)[0]
+
+    anterior = GeneradorFormatos()
+    anterior.activar_cache(tmp_path)
+    esperado = anterior.generar_formato("video_lyrics", idea)
+    anterior.cache.cerrar()
+
+    formateador = GeneradorFormatos()
+    formateador.activar_cache(tmp_path)
+    assert formateador.generar_formato("video_lyrics", idea) == esperado
+    assert formateador.cache.estadisticas()["aciertos"] == 1
+    formateador.cache.cerrar()
@@ -0,0 +1,39 @@
+"""
+Pruebas del informe de calidad de los guiones.
+"""
+
+import numpy as np
+
+from core.exportador.calidad_guiones import CalidadGuiones
+from core.formatos.subtitulos import SECCIONES_GUION
+
+
+def medicion(redes, palabras):
+    """Medición como la de medir_archivo, con guiones completos y distintos"""
+    cantidad = len(redes)
+    return {
+        "archivo": ["ideas.jsonl"] * cantidad,
+        "id": list(range(1, cantidad + 1)),
+        "titulo": [f"Idea {i}" for i in range(cantidad)],
+        "nicho": ["Tecnología"] * cantidad,
+        "red_social": list(redes),
+        "duracion": [""] * cantidad,
+        "palabras": np.asarray(palabras, dtype=np.int32),
+        "presentes": np.ones((cantidad, len(SECCIONES_GUION)), dtype=bool),
+        "huella": [f"huella{i}" for i in range(cantidad)]
+    }
+
+
+def test_duracion_frente_a_las_de_la_red(tmp_path):
+    calidad = CalidadGuiones(tmp_path)
+    informe = calidad.informe([medicion(
+        ["TikTok", "TikTok", "YouTube", "Red desconocida"],
+        [150, 250, 250, 150]
+    )])
+
+    # 150 palabras son 60 s, una duración de TikTok
+    assert informe["segundos_objetivo"].tolist()[:3] == [60, 60, 100]
+    assert informe["desviacion"].tolist()[:3] == [0, 0.667, 0]
+    assert informe["duracion_en_red"].tolist() == [True, False, True, False]
+    assert np.isnan(informe["segundos_objetivo"].iloc[3])
+    assert informe["problemas"].tolist() == [0, 1, 0, 1]
@@ -0,0 +1,29 @@
+"""
+Pruebas de la exportación incremental.
+"""
+
+from core.exportador.exportacion_incremental import ExportacionIncremental
+from core.exportador.exportador import ExportadorIdeas
+from core.formatos.generador_formatos import GeneradorFormatos
+
+
+def test_sin_ideas_no_deja_archivos(tmp_path):
+    exportador = ExportadorIdeas(tmp_path)
+    with ExportacionIncremental(exportador, GeneradorFormatos(), auxiliares=("jsonl", "csv"), excel=True) as exportacion:
+        pass
+
+    assert exportacion.archivos == {}
+    assert not list(tmp_path.glob(f"{exportacion.nombre_base}*"))
+    assert exportador.catalogo.entradas(solo_existentes=False) == []
+
+
+def test_archivos_creados_con_la_primera_idea(tmp_path, ideas_sinteticas):
+    exportador = ExportadorIdeas(tmp_path)
+    with ExportacionIncremental(exportador, GeneradorFormatos(), auxiliares=("jsonl",), excel=False) as exportacion:
+        assert not list(tmp_path.glob(f"{exportacion.nombre_base}*"))
+        for idea in ideas_sinteticas(3):
+            exportacion.agregar(idea)
+
+    ruta = tmp_path / f"{exportacion.nombre_base}.jsonl"
+    assert exportacion.archivos == {"jsonl": str(ruta)}
+    assert len(ruta.read_text(encoding="utf-8").splitlines()) == 3
@@ -0,0 +1,86 @@
+"""
+Pruebas del historial de tendencias y del modo delta.
+"""
+
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+from core.tendencias.historial_tendencias import HistorialTendencias
+from main import GeneradorIdeasVideosAvanzado
+
+
+class RecopiladorFijo:
+    """Recopilador que devuelve siempre las mismas tendencias"""
+
+    def __init__(self, tendencias):
+        self.tendencias = tendencias
+
+    def obtener_todas_las_tendencias(self):
+        return list(self.tendencias)
+
+
+class GeneradorFallido:
+    """Generador de ideas en el que todas las peticiones fallan"""
+
+    def __init__(self):
+        self.tendencias_recibidas = []
+
+    def generar_lote_ideas_automatizado(self, cantidad, filtros, tendencias, al_aceptar_idea=None):
+        self.tendencias_recibidas.append(list(tendencias))
+        return []
+
+
+def crear_generador_delta(ruta_historial, tendencias):
+    """GeneradorIdeasVideosAvanzado sin API ni red, con el historial en ruta_historial"""
+    generador = GeneradorIdeasVideosAvanzado.__new__(GeneradorIdeasVideosAvanzado)
+    generador.recopilador = RecopiladorFijo(tendencias)
+    generador.historial = HistorialTendencias(ruta_historial)
+    generador.generador = GeneradorFallido()
+    generador._iniciar_aceptacion = lambda: nullcontext(SimpleNamespace(agregar=lambda idea: None))
+    return generador
+
+
+def test_generacion_fallida_conserva_tendencia_en_el_delta(tmp_path):
+    ruta = tmp_path / "historial.json"
+    filtros = {"score_minimo": 50, "redes_incluir": ["TikTok"], "nichos_incluir": ["Tecnología"],
+               "evitar_duplicados": True}
+
+    primera = crear_generador_delta(ruta, ["ai agents", "budget tips"])
+    assert primera.generar_lote_ideas_delta(5, filtros) == []
+    assert primera.generador.tendencias_recibidas == [["ai agents", "budget tips"]]
+
+    # En la siguiente ejecución ya no son nuevas, pero siguen sin ideas
+    segunda = crear_generador_delta(ruta, ["ai agents", "budget tips", "solar roofs"])
+    segunda.generar_lote_ideas_delta(5, filtros)
+    assert segunda.generador.tendencias_recibidas == [["ai agents", "budget tips", "solar roofs"]]
+
+
+def test_tendencia_fuera_de_la_cantidad_sigue_pendiente(tmp_path):
+    historial = HistorialTendencias(tmp_path / "historial.json")
+    delta = historial.filtrar_delta(historial.registrar_snapshot(["a", "b", "c"]))
+    assert delta == ["a", "b", "c"]
+
+    # Solo se llegó a generar con la primera
+    historial.marcar_generadas(["a"])
+
+    historial = HistorialTendencias(tmp_path / "historial.json")
+    delta = historial.filtrar_delta(historial.registrar_snapshot(["a", "b", "c", "d"]))
+    assert delta == ["b", "c", "d"]
+
+
+def test_tendencia_con_ideas_no_vuelve_al_delta(tmp_path):
+    historial = HistorialTendencias(tmp_path / "historial.json")
+    historial.registrar_snapshot(["a", "b"])
+    historial.marcar_generadas(["a", "b"])
+
+    assert historial.filtrar_delta(historial.registrar_snapshot(["a", "b"])) == []
+
+
+def test_tendencia_pendiente_obsoleta_sale_del_delta(tmp_path):
+    historial = HistorialTendencias(tmp_path / "historial.json", umbral_obsoleta=2)
+    historial.registrar_snapshot(["a"])
+    historial.registrar_snapshot(["a"])
+
+    estados = historial.registrar_snapshot(["a"])
+    assert estados["a"] == "obsoleta"
+    assert historial.filtrar_delta(estados) == []
@@ -0,0 +1,89 @@
+"""
+Pruebas del índice de búsqueda sobre las exportaciones.
+"""
+
+from pathlib import Path
+
+from core.exportador.exportador import ExportadorIdeas
+from core.exportador.indice_busqueda import IndiceBusqueda
+from core.formatos.generador_formatos import GeneradorFormatos
+
+
+def exportar_excel_y_jsonl(carpeta, ideas, nombre_base="lote"):
+    """Exporta las mismas ideas a Excel y JSONL (dos formatos de una misma exportación)"""
+    formateador = GeneradorFormatos()
+    for idea in ideas:
+        idea["red_social"] = "TikTok"
+        idea["formatos_ia"] = formateador.generar_formatos_ia_especificos(idea)
+    exportador = ExportadorIdeas(carpeta)
+    excel = exportador.exportar_a_excel_avanzado(ideas, f"{nombre_base}.xlsx")
+    jsonl = exportador.exportar_formatos(ideas, ("jsonl",), nombre_base)["jsonl"]
+    return excel, jsonl
+
+
+def archivos_encontrados(indice):
+    return {resultado["archivo"] for resultado in indice.buscar("idea", limite=100)}
+
+
+def test_formatos_de_una_exportacion_se_indexan_una_vez(tmp_path, ideas_sinteticas):
+    exportar_excel_y_jsonl(tmp_path, ideas_sinteticas(5))
+
+    indice = IndiceBusqueda(tmp_path)
+    assert indice.actualizar() == 1
+    assert indice.estadisticas() == {"ideas": 5, "archivos": 2}
+    assert len(indice.buscar("idea", limite=100)) == 5
+
+    # Sin cambios no se vuelve a leer nada
+    assert indice.actualizar() == 0
+    indice.cerrar()
+
+
+def test_borrar_el_archivo_leido_relee_el_otro_formato(tmp_path, ideas_sinteticas):
+    exportar_excel_y_jsonl(tmp_path, ideas_sinteticas(5))
+
+    indice = IndiceBusqueda(tmp_path)
+    indice.actualizar()
+    (leido,) = archivos_encontrados(indice)
+    restante = "lote.jsonl" if leido == "lote.xlsx" else "lote.xlsx"
+
+    (tmp_path / leido).unlink()
+    assert indice.actualizar() == 1
+    assert indice.estadisticas() == {"ideas": 5, "archivos": 1}
+    assert archivos_encontrados(indice) == {restante}
+    indice.cerrar()
+
+
+def test_borrar_los_dos_formatos_vacia_el_indice(tmp_path, ideas_sinteticas):
+    archivos = exportar_excel_y_jsonl(tmp_path, ideas_sinteticas(5))
+
+    indice = IndiceBusqueda(tmp_path)
+    indice.actualizar()
+    for ruta in archivos:
+        Path(ruta).unlink()
+
+    assert indice.actualizar() == 0
+    assert indice.estadisticas() == {"ideas": 0, "archivos": 0}
+    assert indice.buscar("idea") == []
+    indice.cerrar()
+
+
+def test_filtros_de_nicho_red_y_fecha(tmp_path):
+    indice = IndiceBusqueda(tmp_path)
+    indice.indexar_filas(
+        "enero.jsonl", [(1, "Ahorro en casa", "", "", "", "guion", "Finanzas", "TikTok")], "2025-01-10T10:00:00"
+    )
+    indice.indexar_filas(
+        "marzo.jsonl", [(1, "Ahorro con IA", "", "", "", "guion", "Tecnología", "YouTube")], "2025-03-05T09:00:00"
+    )
+
+    def titulos(**filtros):
+        return sorted(resultado["titulo"] for resultado in indice.buscar("ahorro", **filtros))
+
+    assert titulos() == ["Ahorro con IA", "Ahorro en casa"]
+    assert titulos(nicho="finanzas") == ["Ahorro en casa"]
+    assert titulos(red_social="YouTube") == ["Ahorro con IA"]
+    assert titulos(desde="2025-02-01") == ["Ahorro con IA"]
+    # Una fecha sin hora incluye todo ese día
+    assert titulos(hasta="2025-01-10") == ["Ahorro en casa"]
+    assert titulos(nicho="Finanzas", red_social="YouTube") == []
+    indice.cerrar()
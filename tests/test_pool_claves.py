@@ -0,0 +1,119 @@
+"""
+Pruebas del pool de API keys con un reloj simulado.
+"""
+
+import threading
+
+import pytest
+
+from core.generador.pool_claves import CuboTokens, PoolClavesAPI
+
+
+class RelojSimulado:
+    """Reloj que solo avanza cuando la prueba lo indica"""
+
+    def __init__(self, inicio=1000.0):
+        self.ahora = inicio
+
+    def __call__(self):
+        return self.ahora
+
+    def avanzar(self, segundos):
+        self.ahora += segundos
+
+
+def test_cubo_se_rellena_a_ritmo_constante_hasta_su_capacidad():
+    cubo = CuboTokens(60, 60, ahora=0.0)
+    cubo.consumir(60)
+
+    cubo.rellenar(30.0)
+    assert cubo.disponibles == pytest.approx(30)
+    assert cubo.espera(40) == pytest.approx(10)
+
+    cubo.rellenar(1000.0)
+    assert cubo.disponibles == 60
+    # Una petición mayor que la capacidad no espera para siempre
+    assert cubo.espera(500) == 0
+
+
+def test_adquirir_espera_a_la_cuota_de_peticiones():
+    reloj = RelojSimulado()
+    pool = PoolClavesAPI(["clave-1"], peticiones_por_minuto=2, reloj=reloj)
+
+    for _ in range(2):
+        pool.liberar(pool.adquirir())
+    with pytest.raises(TimeoutError):
+        pool.adquirir(timeout=0)
+
+    # Dos peticiones por minuto: una cada 30 segundos
+    reloj.avanzar(29)
+    with pytest.raises(TimeoutError):
+        pool.adquirir(timeout=0)
+    reloj.avanzar(1)
+    assert pool.adquirir(timeout=0).clave == "clave-1"
+
+
+def test_adquirir_espera_a_la_cuota_de_tokens_y_liberar_devuelve_lo_no_usado():
+    reloj = RelojSimulado()
+    pool = PoolClavesAPI(["clave-1"], peticiones_por_minuto=100, tokens_por_minuto=1000, reloj=reloj)
+
+    clave = pool.adquirir(800)
+    with pytest.raises(TimeoutError):
+        pool.adquirir(500, timeout=0)
+
+    # Solo se usaron 300 de los 800 reservados: vuelven 500
+    pool.liberar(clave, tokens_usados=300, tokens_reservados=800)
+    pool.liberar(pool.adquirir(500, timeout=0), tokens_usados=500, tokens_reservados=500)
+    with pytest.raises(TimeoutError):
+        pool.adquirir(500, timeout=0)
+
+    # 1000 tokens por minuto: faltan 300, que llegan en 18 segundos
+    reloj.avanzar(18)
+    assert pool.adquirir(500, timeout=0) is clave
+    assert pool.uso()[0]["tokens"] == 800
+
+
+def test_marcar_limitada_enfria_la_clave_y_duplica_la_penalizacion():
+    reloj = RelojSimulado()
+    pool = PoolClavesAPI(["clave-1"], peticiones_por_minuto=60, enfriamiento=60, enfriamiento_maximo=200,
+                         reloj=reloj)
+
+    enfriamientos = []
+    for _ in range(3):
+        pool.marcar_limitada(pool.adquirir(timeout=0))
+        enfriamientos.append(pool.uso()[0]["enfriamiento"])
+        with pytest.raises(TimeoutError):
+            pool.adquirir(timeout=0)
+        reloj.avanzar(enfriamientos[-1])
+    assert enfriamientos == [60, 120, 200]
+
+    # Una petición correcta borra la penalización
+    pool.liberar(pool.adquirir(timeout=0))
+    pool.marcar_limitada(pool.adquirir(timeout=0))
+    assert pool.uso()[0]["enfriamiento"] == 60
+    assert pool.uso()[0]["limitaciones"] == 4
+
+
+def test_dos_hilos_compiten_por_una_clave():
+    reloj = RelojSimulado()
+    pool = PoolClavesAPI(["clave-1"], peticiones_por_minuto=100, tokens_por_minuto=1000, reloj=reloj)
+    primera = pool.adquirir(1000)
+
+    obtenida = threading.Event()
+
+    def segundo_hilo():
+        clave = pool.adquirir(600)
+        obtenida.set()
+        pool.liberar(clave, tokens_usados=600, tokens_reservados=600)
+
+    hilo = threading.Thread(target=segundo_hilo)
+    hilo.start()
+    # Los tokens del minuto están reservados por la primera petición
+    assert not obtenida.wait(0.2)
+
+    # Al terminar devuelve los 800 tokens que no usó y el segundo hilo continúa
+    pool.liberar(primera, tokens_usados=200, tokens_reservados=1000)
+    hilo.join(timeout=5)
+    assert obtenida.is_set()
+    assert pool.uso()[0]["peticiones"] == 2
+    assert pool.uso()[0]["en_curso"] == 0
@@ -0,0 +1,45 @@
+"""
+Pruebas del timing de los guiones y de los timelines de subtítulos.
+"""
+
+from core.formatos.generador_formatos import GeneradorFormatos
+from core.formatos.subtitulos import SECCIONES_GUION
+
+REDES = ("TikTok", "YouTube", "Instagram", "YouTube Shorts", "Red desconocida")
+
+
+def test_segundos_por_palabra_en_rango_razonable(ideas_sinteticas):
+    formateador = GeneradorFormatos()
+    ideas = ideas_sinteticas(200)
+    for indice, idea in enumerate(ideas):
+        idea["red_social"] = REDES[indice % len(REDES)]
+
+    for idea, timeline in zip(ideas, formateador.generar_timelines_lote(ideas)):
+        palabras = sum(len(linea["palabras"]) for linea in timeline)
+        segundos_por_palabra = timeline[-1]["fin"] / palabras
+        assert 1 / GeneradorFormatos.RITMO_MAXIMO - 0.01 <= segundos_por_palabra <= 1 / GeneradorFormatos.RITMO_MINIMO + 0.01
+
+
+def test_duracion_ajustada_a_la_red_y_repartida_por_palabras(ideas_sinteticas):
+    formateador = GeneradorFormatos()
+    idea = ideas_sinteticas(1)[0]
+    idea["red_social"] = "TikTok"
+
+    guion = formateador.dividir_guion_secciones(idea, formateador.generar_guiones(idea)[0])
+    palabras = {seccion: len(guion[seccion]["texto"].split()) for seccion in SECCIONES_GUION}
+    segundos = {seccion: float(guion[seccion]["timing"].rstrip("s")) for seccion in SECCIONES_GUION}
+
+    total = sum(segundos.values())
+    assert abs(total - formateador.segundos_objetivo("TikTok", sum(palabras.values()))) < 0.5
+    for seccion in SECCIONES_GUION:
+        assert abs(segundos[seccion] - total * palabras[seccion] / sum(palabras.values())) < 0.1
+
+
+def test_segundos_objetivo_elige_la_duracion_mas_cercana():
+    formateador = GeneradorFormatos()
+    # 150 palabras a 2,5 por segundo son 60 s, una duración de TikTok
+    assert formateador.segundos_objetivo("TikTok", 150) == 60
+    # 140 palabras (56 s) se ajustan a 60 s, dentro del ritmo permitido
+    assert formateador.segundos_objetivo("TikTok", 140) == 60
+    # En un rango de YouTube ("1-3min") se mantiene la lectura
+    assert formateador.segundos_objetivo("YouTube", 250) == 100
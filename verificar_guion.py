@@ -3,67 +3,188 @@
 
 """
 Script para verificar el contenido de los guiones generados.
+
+Lee el catálogo de exportaciones (catalogo_exportaciones.jsonl) para listar y
+previsualizar las exportaciones sin abrir los Excel; solo abre el archivo, en
+modo de solo lectura y leyendo las filas necesarias, para ver guiones completos.
+
+Con --calidad revisa en paralelo los guiones de todas las exportaciones (o de
+las indicadas con --archivo) y muestra un informe ordenable.
+
+Uso:
+    python verificar_guion.py --calidad --ordenar desviacion --solo-problemas
+    python verificar_guion.py --calidad --archivo ideas.xlsx --salida informe_calidad.csv
 """
 
-import pandas as pd
-import glob
+import argparse
 import os
+import time
 from pathlib import Path
 
-def mostrar_ultimo_guion():
-    """Muestra el contenido del guión del último archivo Excel generado."""
-    # Encontrar el archivo Excel más reciente
-    directorio = Path("ideas_generadas")
-    archivos = list(directorio.glob("*.xlsx"))
-    archivos.sort(key=os.path.getmtime, reverse=True)
-    
-    if not archivos:
-        print("❌ No se encontraron archivos Excel generados.")
+import pandas as pd
+
+from core.exportador.calidad_guiones import COLUMNAS_INFORME, CalidadGuiones
+from core.exportador.catalogo_exportaciones import CatalogoExportaciones
+
+
+def _mostrar_guion(numero, titulo, nicho, red, contenido, completo=False):
+    """Imprime un guión con su cabecera"""
+    print(f"\n{'=' * 80}")
+    print(f"📝 GUIÓN #{numero}: {titulo or 'Sin título'}")
+    print(f"🎯 Nicho: {nicho or 'Sin nicho'} | 📱 Red: {red or 'Sin red'}")
+    print(f"{'=' * 80}")
+
+    if isinstance(contenido, str) and contenido:
+        print(contenido if completo or len(contenido) <= 500 else contenido[:500] + "...")
+    else:
+        print("❌ El guión está vacío")
+
+    print("\n" + "-" * 40)
+
+
+def listar_exportaciones(catalogo):
+    """Lista las exportaciones del catálogo, de la más reciente a la más antigua."""
+    entradas = catalogo.entradas()
+    if not entradas:
+        print("❌ El catálogo de exportaciones está vacío.")
         return
-    
-    ultimo_archivo = archivos[0]
-    print(f"\n📊 Analizando archivo: {ultimo_archivo.name}\n")
-    
-    # Leer el archivo Excel
+
+    print(f"\n📚 {len(entradas)} exportaciones en {catalogo.ruta}\n")
+    for entrada in entradas:
+        nichos = ", ".join(list(entrada.get("nichos", {}))[:3])
+        print(f"   {entrada.get('fecha', '')} | {entrada.get('formato', ''):7} | {entrada.get('filas', 0):>6} ideas "
+              f"| {entrada['archivo']} | {nichos}")
+
+
+def mostrar_ultimo_guion(archivo=None, cantidad=3, completo=False, directorio=Path("ideas_generadas")):
+    """Muestra los guiones de la última exportación a Excel (o de la indicada).
+
+    Args:
+        archivo: Nombre del archivo dentro del catálogo (por defecto, el más reciente)
+        cantidad: Número de guiones a mostrar
+        completo: Si es True, lee los guiones completos del Excel
+        directorio: Carpeta de salida de las exportaciones
+    """
+    catalogo = CatalogoExportaciones(directorio)
+
+    if archivo:
+        entrada = next((e for e in catalogo.entradas() if e["archivo"] == archivo), None)
+    else:
+        entrada = catalogo.ultima("excel")
+
+    if entrada is not None:
+        print(f"\n📊 Analizando archivo: {entrada['archivo']} ({entrada.get('fecha', '')})\n")
+        print(f"✅ {entrada.get('filas', 0)} ideas | 🎯 Nichos: {', '.join(entrada.get('nichos', {}))}")
+
+        vista_previa = entrada.get("vista_previa", [])
+        if not completo and cantidad <= len(vista_previa):
+            # Todo lo necesario está en el catálogo: no se abre el Excel
+            for guion in vista_previa[:cantidad]:
+                _mostrar_guion(guion["id"], guion["titulo"], guion["nicho"], guion["red_social"], guion["guion"])
+            return
+
+        if entrada.get("formato") != "excel":
+            print("❌ Solo se pueden leer guiones completos de exportaciones a Excel")
+            return
+        ruta = catalogo.ruta_archivo(entrada)
+    else:
+        # Exportaciones anteriores al catálogo: abrir el Excel más reciente
+        archivos = sorted(Path(directorio).glob("*.xlsx"), key=os.path.getmtime, reverse=True)
+        if archivo:
+            archivos = [ruta for ruta in archivos if ruta.name == archivo]
+        if not archivos:
+            print("❌ No se encontraron archivos Excel generados.")
+            return
+        ruta = archivos[0]
+        print(f"\n📊 Analizando archivo: {ruta.name} (fuera del catálogo)\n")
+
     try:
-        # Intentar cargar la hoja de ideas
-        try:
-            df_ideas = pd.read_excel(ultimo_archivo, sheet_name="Ideas")
-            print(f"✅ Hoja 'Ideas' encontrada: {len(df_ideas)} ideas")
-        except:
-            print("❌ No se pudo cargar la hoja 'Ideas'")
-            
-        # Cargar la hoja de guiones
-        df_guiones = pd.read_excel(ultimo_archivo, sheet_name="Guiones")
-        print(f"✅ Hoja 'Guiones' encontrada: {len(df_guiones)} guiones\n")
-        
-        # Mostrar los primeros 3 guiones
-        for i, fila in df_guiones.head(3).iterrows():
-            print(f"\n{'=' * 80}")
-            print(f"📝 GUIÓN #{i+1}: {fila.get('Título', 'Sin título')}")
-            print(f"🎯 Nicho: {fila.get('Nicho', 'Sin nicho')} | 📱 Red: {fila.get('Red Social', 'Sin red')}")
-            print(f"{'=' * 80}")
-            
-            # Encontrar la columna que tiene el guión (puede variar el nombre)
-            guion_col = None
-            for col in df_guiones.columns:
-                if 'guion' in col.lower() or 'guión' in col.lower():
-                    guion_col = col
-                    break
-                    
-            if guion_col:
-                contenido = fila[guion_col]
-                if isinstance(contenido, str):
-                    print(contenido[:500] + "..." if len(contenido) > 500 else contenido)
-                else:
-                    print("❌ El contenido no es texto")
-            else:
-                print("❌ No se encontró la columna del guión")
-                
-            print("\n" + "-" * 40)
-    
+        # Solo se leen las primeras filas de las hojas necesarias
+        ideas = catalogo.leer_hoja(ruta, "Ideas", limite=cantidad)
+        guiones = catalogo.leer_hoja(ruta, "Guiones", limite=cantidad)
+        for idea, guion in zip(ideas, guiones):
+            _mostrar_guion(
+                guion.get("ID"), guion.get("TÍTULO"), idea.get("NICHO"), idea.get("RED SOCIAL"),
+                guion.get("GUIÓN COMPLETO"), completo
+            )
     except Exception as e:
         print(f"❌ Error al leer el archivo: {e}")
 
+
+def revisar_calidad(archivos=None, formato=None, ordenar="problemas", ascendente=False, solo_problemas=False,
+                    salida=None, limite=20, procesos=None, directorio=Path("ideas_generadas")):
+    """Revisa los guiones de las exportaciones y muestra (o guarda) el informe de calidad.
+
+    Args:
+        archivos: Exportaciones a revisar (por defecto, todas las del catálogo)
+        formato: Si se indica, solo las exportaciones de ese formato
+        ordenar: Columna del informe por la que ordenar
+        ascendente: Orden ascendente en lugar de descendente
+        solo_problemas: Mostrar solo los guiones con algún problema
+        salida: Archivo .csv o .xlsx donde guardar el informe completo
+        limite: Número de filas a mostrar
+        procesos: Número de procesos de lectura
+        directorio: Carpeta de salida de las exportaciones
+    """
+    calidad = CalidadGuiones(directorio)
+    entradas = calidad.seleccionar(archivos, formato)
+    if not entradas:
+        print("❌ No hay exportaciones en el catálogo que revisar.")
+        return
+
+    inicio = time.perf_counter()
+    informe = calidad.informe(calidad.medir(entradas, procesos))
+    segundos = time.perf_counter() - inicio
+
+    con_problemas = informe["problemas"] > 0
+    print(f"\n🔍 {len(informe)} guiones de {len(entradas)} exportaciones revisados en {segundos:.2f}s")
+    print(f"   ⚠️ Con problemas: {int(con_problemas.sum())} | ⏱️ Fuera de las duraciones de su red: "
+          f"{int((~informe['duracion_en_red']).sum())} | 🧩 Sin alguna sección: "
+          f"{int((informe['secciones_faltantes'] != '').sum())} | ♻️ Duplicados: "
+          f"{int((informe['duplicado_de'] != '').sum())}\n")
+
+    informe = informe.sort_values(ordenar, ascending=ascendente, kind="stable")
+    if salida:
+        if str(salida).endswith(".xlsx"):
+            informe.to_excel(salida, index=False, sheet_name="Calidad")
+        else:
+            informe.to_csv(salida, index=False, encoding="utf-8")
+        print(f"💾 Informe completo guardado en {salida}")
+
+    if solo_problemas:
+        informe = informe[informe["problemas"] > 0]
+
+    with pd.option_context("display.max_columns", None, "display.width", 200, "display.max_colwidth", 40):
+        print(informe.head(limite).to_string(index=False))
+
+
+def main():
+    """Función principal del verificador de guiones"""
+    parser = argparse.ArgumentParser(description="Verificar los guiones de las exportaciones")
+    parser.add_argument("--listar", action="store_true", help="Listar las exportaciones del catálogo")
+    parser.add_argument("--archivo", help="Exportación a revisar (nombre dentro de la carpeta de salida)")
+    parser.add_argument("--cantidad", type=int, help="Número de guiones a mostrar (3; con --calidad, 20)")
+    parser.add_argument("--completo", action="store_true", help="Mostrar los guiones completos (abre el Excel)")
+    parser.add_argument("--calidad", action="store_true", help="Revisar la calidad de los guiones de las exportaciones")
+    parser.add_argument("--formato", help="Con --calidad, revisar solo las exportaciones de este formato")
+    parser.add_argument("--ordenar", default="problemas", choices=COLUMNAS_INFORME,
+                        help="Con --calidad, columna por la que ordenar el informe")
+    parser.add_argument("--ascendente", action="store_true", help="Con --calidad, ordenar de menor a mayor")
+    parser.add_argument("--solo-problemas", action="store_true", help="Con --calidad, mostrar solo guiones con problemas")
+    parser.add_argument("--salida", help="Con --calidad, guardar el informe completo (.csv o .xlsx)")
+    parser.add_argument("--procesos", type=int, help="Con --calidad, número de procesos de lectura")
+    args = parser.parse_args()
+
+    if args.calidad:
+        revisar_calidad(
+            [args.archivo] if args.archivo else None, args.formato, args.ordenar, args.ascendente,
+            args.solo_problemas, args.salida, args.cantidad or 20, args.procesos
+        )
+    elif args.listar:
+        listar_exportaciones(CatalogoExportaciones(Path("ideas_generadas")))
+    else:
+        mostrar_ultimo_guion(args.archivo, args.cantidad or 3, args.completo)
+
+
 if __name__ == "__main__":
-    mostrar_ultimo_guion()
+    main()